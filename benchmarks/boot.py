@@ -0,0 +1,112 @@
+"""
+Measures how long booting a context takes as its track count grows, against
+the previous allocation, which rebuilt every track's mixer SynthDefs, and
+against allocating node IDs and buses one at a time rather than from an
+allocation plan's reservation.
+
+A stand-in server, which records what it's sent and acknowledges every
+request, replaces scsynth, so only the client side of booting is measured.
+
+Run with ``python benchmarks/boot.py``.
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import time
+from unittest import mock
+
+from supriya.providers import RealtimeProvider
+from supriya.realtime.servers import AsyncServer
+
+from tloen.domain import Application, bases, synthdefs
+
+
+class RecordingProtocol:
+    def __init__(self):
+        self.messages = []
+        self.pending_requests = []
+
+    def register(self, pattern, procedure, failure_pattern=None, once=False):
+        if once:
+            self.pending_requests.append(procedure.__self__)
+
+    def unregister(self, identifier):
+        pass
+
+    def send(self, message):
+        self.messages.append(message)
+        while self.pending_requests:
+            self.pending_requests.pop()._response_future.set_result(None)
+
+
+def build_provider(track_count):
+    server = AsyncServer()
+    server._client_id = 0
+    server._is_running = True
+    server._options = dataclasses.replace(
+        server._options,
+        audio_bus_channel_count=1024 + 4 * track_count,
+        maximum_node_count=1024 + 32 * track_count,
+    )
+    server._osc_protocol = RecordingProtocol()
+    server._setup_allocators()
+    return RealtimeProvider(server)
+
+
+async def boot(track_count):
+    application = await Application.new(1, track_count, 1)
+    provider = build_provider(track_count)
+    start_time = time.perf_counter()
+    async with provider.at():
+        application.primary_context._set(provider=provider)
+    elapsed = time.perf_counter() - start_time
+    messages = provider.server.osc_protocol.messages
+    return elapsed, len(messages), sum(len(x.to_datagram()) for x in messages)
+
+
+def clear_caches():
+    for builder in [
+        synthdefs.build_patch_synthdef,
+        synthdefs.build_peak_rms_synthdef,
+    ]:
+        builder.cache_clear()
+
+
+@contextlib.contextmanager
+def unplanned():
+    yield None
+
+
+def main(track_counts=(1, 32, 256)):
+    from tloen.domain import chains, devices, sends, tracks
+
+    for track_count in track_counts:
+        with contextlib.ExitStack() as exit_stack:
+            for module in [chains, devices, sends, tracks]:
+                for name in ["build_patch_synthdef", "build_peak_rms_synthdef"]:
+                    if hasattr(module, name):
+                        exit_stack.enter_context(
+                            mock.patch.object(
+                                module, name, getattr(module, name).__wrapped__
+                            )
+                        )
+            rebuilt = asyncio.run(boot(track_count))
+        clear_caches()
+        with mock.patch.object(
+            bases.AllocationPlan, "reserve", lambda root, provider: unplanned()
+        ):
+            memoized = asyncio.run(boot(track_count))
+        clear_caches()
+        planned = asyncio.run(boot(track_count))
+        print(
+            f"{track_count:>3} tracks: "
+            f"{rebuilt[0] * 1e3:8.2f} msec rebuilt, "
+            f"{memoized[0] * 1e3:8.2f} msec memoized, "
+            f"{planned[0] * 1e3:8.2f} msec planned, "
+            f"{planned[1]} datagrams, {planned[2]} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmarks inserting notes one at a time into a large clip, against a full
+per-insert regrouping of the clip's notes by pitch.
+
+Run with ``python benchmarks/clip_add_notes.py``.
+"""
+
+import random
+import timeit
+
+from tloen.domain import Clip, Note, TreeNoteStore
+
+
+class FullScanNoteStore(TreeNoteStore):
+    """
+    Reproduces the cost of regrouping every stored note by pitch on each add.
+    """
+
+    def add(self, notes):
+        old_notes_by_pitch = {}
+        for note in self._interval_tree:
+            old_notes_by_pitch.setdefault(note.pitch, []).append(note)
+        TreeNoteStore.add(self, notes)
+
+
+def build_notes(count, pitches=64, seed=0):
+    random_ = random.Random(seed)
+    steps = count // pitches * 2
+    notes = []
+    for pitch in range(pitches):
+        for step in random_.sample(range(steps), count // pitches):
+            start_offset = step / 16
+            notes.append(Note(start_offset, start_offset + 1 / 32, pitch=32 + pitch))
+    return notes
+
+
+def build_clip(count, store_class):
+    clip = Clip(notes=build_notes(count))
+    if store_class is not type(clip.note_store):
+        store = store_class()
+        store.add(clip.notes)
+        clip._note_store = store
+    return clip
+
+
+def insert_one_at_a_time(clip, notes):
+    for note in notes:
+        clip._add_notes([note])
+
+
+def main(count=50000, inserts=200, repeat=3):
+    new_notes = build_notes(inserts, pitches=inserts // 4, seed=1)
+    check = build_clip(count, TreeNoteStore)
+    insert_one_at_a_time(check, new_notes)
+    expected = build_clip(count, TreeNoteStore)
+    expected._add_notes(new_notes)
+    assert check.notes == expected.notes
+    print(f"{count} notes, {len(new_notes)} single-note inserts per run")
+    for label, store_class in [
+        ("full scan", FullScanNoteStore),
+        ("pitch index", TreeNoteStore),
+    ]:
+        seconds = []
+        for _ in range(repeat):
+            clip = build_clip(count, store_class)
+            seconds.append(
+                timeit.timeit(lambda: insert_one_at_a_time(clip, new_notes), number=1)
+            )
+        print(f"{label:>12}: {min(seconds) / len(new_notes) * 1e6:10.2f} usec/insert")
+
+
+if __name__ == "__main__":
+    main()
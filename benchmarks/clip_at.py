@@ -0,0 +1,82 @@
+"""
+Benchmarks ``Clip.at()`` against a per-call interval tree walk.
+
+Run with ``python benchmarks/clip_at.py``.
+"""
+
+import timeit
+
+from tloen.domain import Clip, Note, NoteMoment
+
+
+def build_clip(pitches=16, steps=64):
+    notes = []
+    for pitch in range(pitches):
+        for step in range(steps):
+            if (step + pitch) % 3:
+                continue
+            start_offset = step / 16
+            notes.append(Note(start_offset, start_offset + 1 / 32, pitch=36 + pitch))
+    return Clip(duration=steps / 16, notes=notes)
+
+
+def tree_walk_at(clip, offset, start_delta=0.0):
+    local_offset = loop_local_offset = offset - start_delta
+    count = 0
+    if clip.is_looping and local_offset >= 0.0:
+        count, loop_local_offset = divmod(local_offset, clip.clip_stop)
+    moment = clip.note_store._interval_tree.get_moment_at(loop_local_offset)
+    start_notes = moment.start_intervals
+    stop_notes = moment.stop_intervals
+    overlap_notes = moment.overlap_intervals
+    if count and not loop_local_offset:
+        moment_two = clip.note_store._interval_tree.get_moment_at(clip.duration)
+        stop_notes.extend(moment_two.overlap_intervals)
+        stop_notes.extend(moment_two.stop_intervals)
+    next_offset = clip.note_store._interval_tree.get_offset_after(loop_local_offset)
+    if next_offset is None and clip.is_looping:
+        next_offset = clip.duration
+    if next_offset is not None:
+        if clip.is_looping:
+            next_offset = min([next_offset, clip.duration])
+        next_offset += start_delta + (count * clip.duration)
+    return NoteMoment(
+        offset=offset,
+        local_offset=loop_local_offset,
+        next_offset=next_offset,
+        start_notes=start_notes or None,
+        stop_notes=stop_notes or None,
+        overlap_notes=overlap_notes or None,
+    )
+
+
+def tick_through(at, clip, loops):
+    offset = 0.0
+    stop_offset = clip.duration * loops
+    ticks = 0
+    while offset < stop_offset:
+        offset = at(clip, offset).next_offset
+        ticks += 1
+    return ticks
+
+
+def main(loops=8, repeat=5):
+    clip = build_clip()
+    clip.event_table  # compile once, as the first playback tick would
+    ticks = tick_through(Clip.at, clip, loops)
+    offset = 0.0
+    for _ in range(ticks):
+        assert Clip.at(clip, offset) == tree_walk_at(clip, offset)
+        offset = Clip.at(clip, offset).next_offset
+    print(f"{len(clip.notes)} notes, {ticks} ticks per run")
+    for label, at in [("tree walk", tree_walk_at), ("event table", Clip.at)]:
+        seconds = min(
+            timeit.repeat(
+                lambda: tick_through(at, clip, loops), number=1, repeat=repeat
+            )
+        )
+        print(f"{label:>12}: {seconds / ticks * 1e6:8.2f} usec/tick")
+
+
+if __name__ == "__main__":
+    main()
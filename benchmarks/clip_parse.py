@@ -0,0 +1,121 @@
+"""
+Benchmarks parsing the parser's doctest examples, scaled to 10k notes, against
+a per-call lexer and parser.
+
+Run with ``python benchmarks/clip_parse.py``.
+"""
+
+import timeit
+from collections import deque
+
+from tloen.domain import Clip, Note
+from tloen.domain.parser import (
+    ClipLexer,
+    ClipParser,
+    Container,
+    Leaf,
+    parse,
+    parse_rows,
+)
+
+EXAMPLES = [
+    "c1",
+    "c4 d e f",
+    "c'8 d' e' f' g' a' b' c''",
+    "c4. d8 e4 ~8 f",
+    "{ { <c fs>4 r8 q } ~8 q4 } ~8",
+    "2/3 { c d e } 4/5 { ~8 g8 a b c' }",
+]
+
+
+def to_leaves(container, multiplier=1):
+    leaves = []
+    multiplier *= container.multiplier
+    for component in container.components:
+        if isinstance(component, Leaf):
+            leaves.append(
+                Leaf(
+                    duration=component.duration * multiplier, pitches=component.pitches
+                )
+            )
+        elif isinstance(component, Container):
+            leaves.extend(to_leaves(component, multiplier=multiplier))
+        else:
+            leaves.append(multiplier * component)
+    return leaves
+
+
+def to_notes(leaf, initial_offset=0):
+    final_offset = initial_offset + leaf.duration
+    notes = [
+        Note(
+            start_offset=float(initial_offset),
+            stop_offset=float(final_offset),
+            pitch=pitch,
+        )
+        for pitch in leaf.pitches
+    ]
+    return notes, final_offset
+
+
+def per_call_parse(text):
+    components = ClipParser().parse(ClipLexer().tokenize(text))
+    leaves = deque()
+    for component in components:
+        if isinstance(component, Container):
+            leaves.extend(to_leaves(component))
+        else:
+            leaves.append(component)
+    initial_offset = 0
+    current_leaf = None
+    notes = []
+    while leaves:
+        next_leaf = leaves.popleft()
+        if current_leaf is None:
+            current_leaf = next_leaf
+            continue
+        if isinstance(next_leaf, Leaf):
+            new_notes, initial_offset = to_notes(current_leaf, initial_offset)
+            notes.extend(new_notes)
+            current_leaf = next_leaf
+        else:
+            current_leaf = Leaf(
+                pitches=current_leaf.pitches, duration=current_leaf.duration + next_leaf
+            )
+    new_notes, _ = to_notes(current_leaf, initial_offset)
+    notes.extend(new_notes)
+    return Clip(notes=notes)
+
+
+def uncached_parse(text, storage=Clip.Storage.TREE):
+    parse_rows.cache_clear()
+    return parse(text, storage=storage)
+
+
+def main(note_count=10000, text_count=10, repeat=3):
+    text = " ".join(EXAMPLES)
+    notes_per_text = len(parse(text).notes)
+    text = " ".join([text] * (note_count // notes_per_text))
+    fragments = [text] * text_count
+    assert uncached_parse(text).notes == per_call_parse(text).notes
+    print(f"{len(parse(text).notes)} notes per text, {text_count} texts per run")
+    cases = [
+        ("per call", lambda: [per_call_parse(_) for _ in fragments]),
+        ("uncached", lambda: [uncached_parse(_) for _ in fragments]),
+        ("cached", lambda: [parse(_) for _ in fragments]),
+        (
+            "cached array",
+            lambda: [parse(_, storage=Clip.Storage.ARRAY) for _ in fragments],
+        ),
+    ]
+    for label, function in cases:
+        try:
+            seconds = min(timeit.repeat(function, number=1, repeat=repeat))
+        except RuntimeError as error:  # no NumPy for array storage
+            print(f"{label:>12}: skipped ({error})")
+            continue
+        print(f"{label:>12}: {seconds / len(fragments) * 1e3:10.2f} msec/text")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmarks streaming a large Standard MIDI File into clips.
+
+Run with ``python benchmarks/midi_file.py``.
+"""
+
+import asyncio
+import pathlib
+import random
+import tempfile
+import timeit
+
+from tloen.domain import Clip
+from tloen.midi import MidiFileTrack, read_midi_file, write_midi_file
+
+
+def build_rows(count, pitches=64, seed=0):
+    random_ = random.Random(seed)
+    steps = count // pitches * 2
+    rows = []
+    for pitch in range(pitches):
+        for step in random_.sample(range(steps), count // pitches):
+            start_offset = step / 16
+            rows.append((start_offset, start_offset + 1 / 32, 32.0 + pitch, 100.0))
+    return rows
+
+
+def read_only(path):
+    for _ in read_midi_file(path):
+        pass
+
+
+def import_clip(path, storage):
+    asyncio.run(Clip(storage=storage).import_midi(path))
+
+
+def main(count=50000, repeat=3):
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / "benchmark.mid"
+        rows = build_rows(count)
+        write_midi_file(path, [MidiFileTrack(rows=rows)])
+        events = len(rows) * 2
+        print(f"{events} events, {path.stat().st_size} bytes")
+        clip = Clip()
+        asyncio.run(clip.import_midi(path))
+        assert len(clip.notes) == len(rows)
+        cases = [("read", lambda: read_only(path))]
+        for storage in Clip.Storage:
+            cases.append(
+                (
+                    f"import {storage.name.lower()}",
+                    lambda storage=storage: import_clip(path, storage),
+                )
+            )
+        for label, function in cases:
+            try:
+                seconds = min(timeit.repeat(function, number=1, repeat=repeat))
+            except RuntimeError as error:  # no NumPy for array storage
+                print(f"{label:>14}: skipped ({error})")
+                continue
+            print(f"{label:>14}: {events / seconds:12.0f} events/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measures how long computing the state of every allocatable object takes, as
+allocation does, as tracks nest deeper, against the previous ancestor lookups and
+graph orders, which walked the whole parentage on every access.
+
+Run with ``python benchmarks/parentage.py``.
+"""
+
+import asyncio
+import time
+from unittest import mock
+
+from uqbar.containers import UniqueTreeTuple
+
+from tloen.domain import Application, DeviceObject
+from tloen.domain.bases import Allocatable, ApplicationObject
+
+
+def walk_parentage(self, key, predicate, *, inclusive=True):
+    for parent in self.parentage[0 if inclusive else 1 :]:
+        if predicate(parent):
+            return parent
+    return None
+
+
+async def build(depth):
+    application = await Application.new(1, 1, 1)
+    track = application.primary_context.tracks[0]
+    for _ in range(depth):
+        await track.add_device(DeviceObject)
+        track = await track.add_track()
+    return application
+
+
+def run(application, iterations):
+    objects = list(application.primary_context.depth_first(prototype=Allocatable))
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        for object_ in objects:
+            object_._get_state()
+    return len(objects), (time.perf_counter() - start_time) / iterations
+
+
+def main(depths=(1, 8, 32, 128), iterations=10):
+    for depth in depths:
+        application = asyncio.run(build(depth))
+        count, cached = run(application, iterations)
+        with mock.patch.object(
+            ApplicationObject, "_get_ancestor", walk_parentage
+        ), mock.patch.object(
+            ApplicationObject, "graph_order", UniqueTreeTuple.graph_order
+        ):
+            _, walked = run(application, iterations)
+        print(
+            f"depth {depth:>3}, {count:5d} objects: "
+            f"{walked * 1e3:8.2f} msec walking parentage, "
+            f"{cached * 1e3:8.2f} msec cached"
+        )
+
+
+if __name__ == "__main__":
+    main()
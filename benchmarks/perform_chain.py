@@ -0,0 +1,84 @@
+"""
+Measures MIDI message throughput through a track's chain of ten devices,
+against the previous perform loop, which passed each message between
+performers in its own one-element list.
+
+Run with ``python benchmarks/perform_chain.py``.
+"""
+
+import asyncio
+import time
+from collections import deque
+from unittest import mock
+
+from tloen.domain import Application, DeviceObject
+from tloen.domain.bases import Performable
+from tloen.midi import NoteOffMessage, NoteOnMessage
+
+
+def per_message_perform_output(self, moment, midi_messages):
+    next_performer = self._next_performer()
+    for message in midi_messages:
+        self._update_captures(moment, message, "O")
+        if isinstance(message, NoteOnMessage):
+            if message.pitch in self._output_pitches:
+                continue
+            else:
+                self._output_pitches.add(message.pitch)
+        elif isinstance(message, NoteOffMessage):
+            if message.pitch not in self._output_pitches:
+                continue
+            else:
+                self._output_pitches.remove(message.pitch)
+        yield next_performer, [message]
+
+
+def per_message_perform_loop(cls, moment, performer, midi_messages):
+    stack = deque()
+    stack.append((performer, midi_messages))
+    out_messages = []
+    while stack:
+        in_performer, in_messages = stack.popleft()
+        for out_performer, out_messages in in_performer(moment, in_messages):
+            if out_messages and out_performer is not None:
+                stack.append((out_performer, out_messages))
+    return out_messages
+
+
+async def build(device_count):
+    application = await Application.new(1, 1, 1)
+    track = application.primary_context.tracks[0]
+    for _ in range(device_count):
+        await track.add_device(DeviceObject)
+    return track
+
+
+def run(track, batch_size, iterations):
+    note_ons = [NoteOnMessage(pitch=pitch) for pitch in range(batch_size)]
+    note_offs = [NoteOffMessage(pitch=pitch) for pitch in range(batch_size)]
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        track._perform_loop(None, track._perform_input, note_ons)
+        track._perform_loop(None, track._perform_input, note_offs)
+    return 2 * batch_size * iterations / (time.perf_counter() - start_time)
+
+
+def main(device_count=10, batch_sizes=(1, 8, 64), iterations=2000):
+    track = asyncio.run(build(device_count))
+    for batch_size in batch_sizes:
+        batched = run(track, batch_size, iterations)
+        with mock.patch.object(
+            Performable, "_perform_output", per_message_perform_output
+        ), mock.patch.object(
+            Performable, "_perform_loop", classmethod(per_message_perform_loop)
+        ):
+            per_message = run(track, batch_size, iterations)
+        print(
+            f"{device_count} devices, batches of {batch_size:>2}: "
+            f"{per_message:10.0f} messages/s per message, "
+            f"{batched:10.0f} messages/s batched"
+        )
+
+
+if __name__ == "__main__":
+    main()
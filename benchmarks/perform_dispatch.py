@@ -0,0 +1,87 @@
+"""
+Counts the bundles sent while many tracks play clips in lockstep, with and
+without the transport holding one provider moment open per dispatched moment.
+
+Each track plays an instrument, so every note starts or frees a synth. The
+stand-in server from ``boot.py`` replaces scsynth, and only the bundles it's
+actually sent are counted.
+
+Run with ``python benchmarks/perform_dispatch.py``.
+"""
+
+import asyncio
+import time
+from unittest import mock
+
+from boot import build_provider
+from supriya.assets.synthdefs import default
+from supriya.clocks import ClockContext
+
+from tloen.domain import (
+    Application,
+    ApplicationObject,
+    Instrument,
+    Note,
+    transports,
+)
+
+
+async def build(track_count):
+    application = await Application.new(1, track_count, 1)
+    for track in application.primary_context.tracks:
+        await track.add_device(Instrument, synthdef=default)
+        await track.slots[0].add_clip(
+            notes=[Note(i / 16, (i + 1) / 16, pitch=60 + i % 12) for i in range(16)]
+        )
+    provider = build_provider(track_count)
+    async with provider.at():
+        application.primary_context._set(provider=provider)
+    transport = application.transport
+    for track in application.primary_context.tracks:
+        track._pending_slot_index = 0
+        await transport.cue(
+            track._clip_launch_callback, event_type=transport.EventType.CLIP_LAUNCH
+        )
+    return application
+
+
+async def play(transport, stop_offset):
+    moment_count = 0
+    while transport._queues and min(transport._queues) < stop_offset:
+        offset = min(transport._queues)
+        moment = transport.offset_to_moment(offset)
+        await transport._dispatch_callback(ClockContext(moment, moment, None), offset)
+        moment_count += 1
+    return moment_count
+
+
+async def run(track_count, measures, coalesce):
+    application = await build(track_count)
+    messages = application.primary_context.provider.server.osc_protocol.messages
+    messages.clear()
+    # ApplicationObject.lock() is a no-op, so each track flushes on its own
+    lock_class = transports.Allocatable if coalesce else ApplicationObject
+    with mock.patch.object(transports, "Allocatable", lock_class):
+        start_time = time.perf_counter()
+        moment_count = await play(application.transport, measures)
+        elapsed = time.perf_counter() - start_time
+    seconds = application.transport.offset_to_moment(measures).seconds
+    return len(messages), moment_count, seconds, elapsed
+
+
+def main(track_counts=(1, 8, 32), measures=4):
+    for track_count in track_counts:
+        for label, coalesce in [("per track", False), ("per moment", True)]:
+            bundle_count, moment_count, seconds, elapsed = asyncio.run(
+                run(track_count, measures, coalesce)
+            )
+            print(
+                f"{track_count:>3} tracks, {label:>10}: "
+                f"{bundle_count:5d} bundles over {moment_count} moments, "
+                f"{bundle_count / seconds:7.1f} bundles/s, "
+                f"{elapsed / moment_count * 1e3:6.2f} msec/moment"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Measures how many nodes a mutation reconciles, and how long it takes, as the
+tree grows, against the previous reconciliation, which revisited every child
+of every reconciled node.
+
+A mock provider stands in for the server, as only the walk over the tree is
+measured.
+
+Run with ``python benchmarks/reconcile.py``.
+"""
+
+import asyncio
+import time
+from unittest import mock
+
+from supriya.synthdefs import SynthDefFactory
+
+from tloen.domain import Application, AudioEffect
+from tloen.domain.bases import Allocatable
+from tloen.domain.sends import Patch
+
+synthdef_factory = (
+    SynthDefFactory().with_channel_count(2).with_input().with_output(replacing=True)
+)
+
+
+def revisit_every_child(self, difference):
+    for child in self:
+        child._reconcile()
+
+
+async def build(track_count):
+    application = await Application.new(1, 1, 1)
+    context = application.primary_context
+    group = context.tracks[0]
+    for _ in range(track_count):
+        track = await group.add_track()
+        await track.set_channel_count(2)
+        for _ in range(2):
+            await track.add_device(AudioEffect, synthdef=synthdef_factory)
+    await context.add_track()
+    with mock.patch.object(Allocatable, "lock", ApplicationObjectLock):
+        context._set(provider=mock.MagicMock())
+    return application
+
+
+class ApplicationObjectLock:
+    # the mock provider can't open moments, and nothing here needs one
+    def __init__(self, objects, seconds=None):
+        pass
+
+    async def __aenter__(self):
+        pass
+
+    async def __aexit__(self, *args):
+        pass
+
+
+async def mutate(application):
+    context = application.primary_context
+    group = context.tracks[0]
+    results = []
+    for mutation in [
+        lambda: group.move(context, 1),
+        lambda: application.set_channel_count(4),
+    ]:
+        counts = []
+        reconcile = Allocatable._reconcile
+        patch_reconcile = Patch._reconcile
+
+        def counting_reconcile(self, *args, **kwargs):
+            counts.append(self)
+            return reconcile(self, *args, **kwargs)
+
+        def counting_patch_reconcile(self, *args, **kwargs):
+            counts.append(self)
+            return patch_reconcile(self, *args, **kwargs)
+
+        with mock.patch.object(
+            Allocatable, "_reconcile", counting_reconcile
+        ), mock.patch.object(
+            Patch, "_reconcile", counting_patch_reconcile
+        ), mock.patch.object(
+            Allocatable, "lock", ApplicationObjectLock
+        ):
+            start_time = time.perf_counter()
+            await mutation()
+            results.append((len(counts), time.perf_counter() - start_time))
+    return results
+
+
+async def run(track_count, incremental):
+    application = await build(track_count)
+    if incremental:
+        return await mutate(application)
+    with mock.patch.object(Allocatable, "_reconcile_children", revisit_every_child):
+        return await mutate(application)
+
+
+def main(track_counts=(8, 64, 256)):
+    labels = ["move group track", "set channel count"]
+    for track_count in track_counts:
+        for mode, incremental in [("every child", False), ("incremental", True)]:
+            results = asyncio.run(run(track_count, incremental))
+            print(
+                f"{track_count:>3} tracks, {mode:>11}: "
+                + ", ".join(
+                    f"{label} {count:5d} nodes {elapsed * 1e3:7.2f} msec"
+                    for label, (count, elapsed) in zip(labels, results)
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -30,11 +30,13 @@ install_requires = [
 ]
 
 extras_require = {
+    "numpy": ["numpy"],
     "test": [
         "black == 19.10b0",  # Trailing comma behavior in 20.x needs work
         "flake8 >= 3.9.0",
         "isort >= 5.8.0",
         "mypy >= 0.800",
+        "numpy",
         "pytest >= 6.2.0",
         "pytest-asyncio >= 0.14.0",
         "pytest-cov >= 2.11.0",
@@ -0,0 +1,65 @@
+import dataclasses
+
+import pytest
+from supriya.providers import Provider, RealtimeProvider
+from supriya.realtime import Server
+
+from tloen.domain import Allocatable, Application, Limiter, RackDevice
+from tloen.domain.bases import AllocationPlan
+
+
+@pytest.mark.asyncio
+async def test_1():
+    """
+    A plan counts exactly the node IDs and bus channels allocating takes.
+    """
+    application = await Application.new(1, 2, 1)
+    context = application.primary_context
+    track = context.tracks[0]
+    await track.add_device(Limiter)
+    rack_device = await track.add_device(RackDevice)
+    await rack_device.add_chain()
+    await track.add_send(context.tracks[1])
+    plan = AllocationPlan.from_tree(context)
+    provider = Provider.nonrealtime()
+    with provider.at():
+        context._set(provider=provider)
+    allocatables = [context, *context.depth_first(prototype=Allocatable)]
+    assert plan.node_count == sum(len(x.node_proxies) for x in allocatables)
+    assert plan.audio_channel_count == sum(
+        len(bus_group)
+        for x in allocatables
+        for bus_group in x.audio_bus_proxies.values()
+    )
+    assert plan.control_channel_count == sum(
+        len(x.control_bus_proxies) for x in allocatables
+    )
+
+
+def test_2():
+    """
+    Reserved blocks hand out contiguous IDs, fall back to the allocators once
+    spent, and free one at a time after the reservation is released.
+    """
+    server = Server()
+    server._client_id = 0
+    server._options = dataclasses.replace(server._options, audio_bus_channel_count=64)
+    server._setup_allocators()
+    provider = RealtimeProvider(server)
+    plan = AllocationPlan()
+    plan.node_count, plan.audio_channel_count = 2, 6
+    allocator = server.audio_bus_allocator
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(AllocationPlan, "from_tree", lambda root: plan)
+        with AllocationPlan.reserve(None, provider):
+            node_ids = [server.node_id_allocator.allocate_node_id() for _ in range(3)]
+            bus_ids = [server.audio_bus_allocator.allocate(2) for _ in range(2)]
+            fallback_bus_id = server.audio_bus_allocator.allocate(4)
+        assert server.audio_bus_allocator is allocator
+    assert node_ids == [1000, 1001, 1002]
+    assert bus_ids == [16, 18]
+    assert fallback_bus_id == 22
+    # the two unused reserved channels went back to the allocator
+    assert allocator.allocate(2) == 20
+    allocator.free(16)
+    assert allocator.allocate(2) == 16
@@ -0,0 +1,56 @@
+import pytest
+
+from tloen.domain import Application, DeviceObject
+
+
+@pytest.mark.asyncio
+async def test_1():
+    """
+    Ancestor lookups follow objects as they're moved and reconfigured.
+    """
+    application = await Application.new(2, 2, 1)
+    context_one, context_two = application.contexts
+    track_one, track_two = context_one.tracks
+    subtrack = await track_one.add_track()
+    device = await subtrack.add_device(DeviceObject)
+    assert device.track_object is subtrack
+    assert device.context is context_one
+    assert device.effective_channel_count == 2
+    assert subtrack.default_send_target is track_one
+    assert track_one.default_send_target is context_one.master_track
+    await track_one.set_channel_count(4)
+    assert device.effective_channel_count == 4
+    await device.move(track_two, 0)
+    assert device.track_object is track_two
+    assert device.effective_channel_count == 2
+    await subtrack.move(context_two, 0)
+    assert subtrack.context is context_two
+    assert subtrack.default_send_target is context_two.master_track
+    await subtrack.set_channel_count(1)
+    await device.move(subtrack, 0)
+    assert device.context is context_two
+    assert device.effective_channel_count == 1
+    await application.set_channel_count(8)
+    await subtrack.set_channel_count(None)
+    assert device.effective_channel_count == 8
+
+
+@pytest.mark.asyncio
+async def test_2():
+    """
+    Graph orders follow objects as their containers change.
+    """
+    application = await Application.new(1, 2, 1)
+    context = application.primary_context
+    track_one, track_two = context.tracks
+    device = await track_two.add_device(DeviceObject)
+    graph_order = device.graph_order
+    assert graph_order[: len(track_two.graph_order)] == track_two.graph_order
+    track_three = await context.add_track()
+    assert device.graph_order == graph_order
+    await track_three.move(context, 0)
+    assert device.graph_order[: len(track_two.graph_order)] == track_two.graph_order
+    assert track_two.graph_order[-1] == 2
+    await context.remove_tracks(track_one)
+    assert track_two.graph_order[-1] == 1
+    assert track_three.graph_order < track_two.graph_order < device.graph_order
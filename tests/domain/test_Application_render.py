@@ -1,7 +1,7 @@
 import pytest
 from uqbar.strings import normalize
 
-from tloen.domain import Application
+from tloen.domain import Application, Instrument, Note
 
 
 @pytest.mark.asyncio
@@ -63,3 +63,30 @@ async def test_1():
             NODE TREE 0 group
         """
     )
+
+
+@pytest.mark.asyncio
+async def test_2():
+    """
+    Rendering a scene plays its clips offline into the session.
+    """
+    application = await Application.new(1, 2, 1)
+    track = application.contexts[0].tracks[0]
+    await track.add_device(Instrument)
+    await track.slots[0].add_clip(
+        notes=[Note(0, 0.25, pitch=60), Note(0.5, 0.75, pitch=64)]
+    )
+    session = await application.render(scene=application.scenes[0])
+    assert application.status == Application.Status.OFFLINE
+    assert not application.transport.is_running
+    assert not application.transport._events
+    assert track._active_slot_index is None
+    assert not track.slots[0].clip.is_playing
+    # note-ons and note-offs at 120 bpm, then teardown at the clip's end
+    assert session.offsets == [float("-inf"), 0.0, 0.5, 1.0, 1.5, 2.0, float("inf")]
+    assert [
+        offset
+        for offset in session.offsets[1:-1]
+        for node in session.states[offset].start_nodes
+        if getattr(node, "synthdef", None) == track.devices[0].synthdef
+    ] == [0.0, 1.0]
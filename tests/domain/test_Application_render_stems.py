@@ -0,0 +1,164 @@
+import concurrent.futures
+import multiprocessing
+import os
+
+import pytest
+import yaml
+from supriya.nonrealtime import Session
+
+from tloen.domain import Application, DeviceObject, Note, applications
+
+
+def render(self, output_file_path=None, **kwargs):
+    # stands in for scsynth, recording which process rendered the file
+    output_file_path.write_text(str(os.getpid()))
+    return 0, output_file_path
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    # scsynth isn't needed to check what each stem renders, and synthdefs
+    # can't be built on more than one thread at once
+    sessions = {}
+
+    def render_in_thread(self, output_file_path=None, **kwargs):
+        sessions[output_file_path] = self
+        return render(self, output_file_path)
+
+    monkeypatch.setattr(
+        applications.concurrent.futures,
+        "ProcessPoolExecutor",
+        lambda max_workers: concurrent.futures.ThreadPoolExecutor(1),
+    )
+    monkeypatch.setattr(Session, "render", render_in_thread)
+    return sessions
+
+
+@pytest.mark.asyncio
+async def test_1(sessions, tmp_path):
+    """
+    Each context renders to its own file, and the stems mix down.
+    """
+    application = Application()
+    for _ in range(2):
+        context = await application.add_context()
+        await context.add_track()
+    file_paths = await application.render_stems(
+        tmp_path / "stems", mix_file_path=tmp_path / "mix.aiff"
+    )
+    assert application.status == Application.Status.OFFLINE
+    assert list(file_paths) == [context.uuid for context in application.contexts]
+    for uuid, file_path in file_paths.items():
+        assert file_path.parent == tmp_path / "stems"
+        assert file_path.name.startswith(f"{uuid}-")
+    assert all(file_path.exists() for file_path in file_paths.values())
+    mix_session = sessions.pop(tmp_path / "mix.aiff")
+    assert [
+        synth.synthdef.name for synth in mix_session.nodes if hasattr(synth, "synthdef")
+    ] == ["mixer/stem/2", "mixer/stem/2"]
+
+
+@pytest.mark.asyncio
+async def test_2(sessions, tmp_path):
+    """
+    A track stem renders alone, with the other tracks muted.
+    """
+    application = await Application.new(2, 2, 1)
+    track = application.contexts[1].tracks[0]
+    file_paths = await application.render_stems(tmp_path, stems=[track])
+    assert list(file_paths) == [track.uuid]
+    session_string = sessions[file_paths[track.uuid]].to_strings(include_controls=True)
+    # one context's two tracks, master and cue track, with the other track muted
+    assert session_string.count("mixer/patch[gain,hard,replace]") == 4
+    assert session_string.count("active: 0.0") == 1
+    with pytest.raises(ValueError):
+        await application.render_stems(tmp_path, stems=[application])
+
+
+@pytest.mark.asyncio
+async def test_3(sessions, tmp_path):
+    """
+    Unchanged stems are reused from the render cache.
+    """
+    application = await Application.new(1, 2, 1)
+    track_one, track_two = application.primary_context.tracks
+    await track_one.slots[0].add_clip(notes=[Note(0, 0.25, pitch=60)])
+    stems = [track_one, track_two]
+    mix_file_path = tmp_path / "mix.aiff"
+    file_paths = await application.render_stems(
+        tmp_path, stems=stems, mix_file_path=mix_file_path
+    )
+    assert len(sessions) == 3
+    sessions.clear()
+    assert (
+        await application.render_stems(
+            tmp_path, stems=stems, mix_file_path=mix_file_path
+        )
+        == file_paths
+    )
+    assert list(sessions) == [mix_file_path]
+    sessions.clear()
+    await track_two.slots[0].add_clip(notes=[Note(0, 0.5, pitch=64)])
+    new_file_paths = await application.render_stems(
+        tmp_path, stems=stems, mix_file_path=mix_file_path
+    )
+    assert new_file_paths[track_one.uuid] == file_paths[track_one.uuid]
+    assert list(sessions) == [new_file_paths[track_two.uuid], mix_file_path]
+    assert not file_paths[track_two.uuid].exists()
+    # a parameter change dirties only its own track
+    sessions.clear()
+    await track_one.parameters["gain"].set_(-6.0)
+    await application.render_stems(tmp_path, stems=stems)
+    assert len(sessions) == 1
+
+
+@pytest.mark.asyncio
+async def test_4(sessions, tmp_path):
+    """
+    A stem inside a group track re-renders when the group's own parameters or
+    devices change, but not when a sibling subtrack does.
+    """
+    application = await Application.new(1, 1, 1)
+    group = application.primary_context.tracks[0]
+    track_one = await group.add_track()
+    track_two = await group.add_track()
+    file_paths = await application.render_stems(tmp_path, stems=[track_one])
+    sessions.clear()
+    await group.parameters["gain"].set_(-6.0)
+    new_file_paths = await application.render_stems(tmp_path, stems=[track_one])
+    assert new_file_paths != file_paths
+    assert list(sessions) == [new_file_paths[track_one.uuid]]
+    sessions.clear()
+    device = await group.add_device(DeviceObject)
+    file_paths = await application.render_stems(tmp_path, stems=[track_one])
+    assert list(sessions) == [file_paths[track_one.uuid]]
+    sessions.clear()
+    await device.parameters["active"].set_(False)
+    new_file_paths = await application.render_stems(tmp_path, stems=[track_one])
+    assert list(sessions) == [new_file_paths[track_one.uuid]]
+    sessions.clear()
+    await track_two.parameters["gain"].set_(-6.0)
+    assert await application.render_stems(tmp_path, stems=[track_one]) == (
+        new_file_paths
+    )
+    assert not sessions
+
+
+@pytest.mark.asyncio
+async def test_5(monkeypatch, tmp_path):
+    """
+    Stems and the mix render in worker processes.
+    """
+    if multiprocessing.get_start_method() != "fork":
+        pytest.skip("workers only inherit the render stand-in when forked")
+    monkeypatch.setattr(Session, "render", render)
+    application = await Application.new(2, 1, 1)
+    mix_file_path = tmp_path / "mix.aiff"
+    file_paths = await application.render_stems(
+        tmp_path, mix_file_path=mix_file_path, max_workers=2
+    )
+    for file_path in [*file_paths.values(), mix_file_path]:
+        assert int(file_path.read_text()) != os.getpid()
+    assert yaml.safe_load((tmp_path / "stems.yml").read_text()) == {
+        file_path.name: 10.0 for file_path in file_paths.values()
+    }
@@ -18,3 +18,55 @@ async def test_1():
         Note(20, 25),
         Note(25, 35),
     ]
+
+
+@pytest.mark.asyncio
+async def test_2():
+    pytest.importorskip("numpy")
+    clip = Clip(storage=Clip.Storage.ARRAY)
+    assert clip.notes == []
+    await clip.add_notes([Note(0, 2), Note(0, 5), Note(5, 10), Note(20, 35)])
+    assert clip.notes == [Note(0, 5), Note(5, 10), Note(20, 35)]
+    await clip.add_notes([Note(25, 35)])
+    assert clip.notes == [Note(0, 5), Note(5, 10), Note(20, 25), Note(25, 35)]
+    await clip.add_notes([Note(0, 1, velocity=127)])
+    assert clip.notes == [
+        Note(0, 1, velocity=127),
+        Note(5, 10),
+        Note(20, 25),
+        Note(25, 35),
+    ]
+    await clip.remove_notes([Note(5, 10), Note(25, 35)])
+    assert clip.notes == [Note(0, 1, velocity=127), Note(20, 25)]
+    with pytest.raises(ValueError):
+        await clip.remove_notes([Note(5, 10)])
+
+
+@pytest.mark.asyncio
+async def test_3():
+    clip = Clip()
+    await clip.add_notes([Note(0, 10), Note(10, 20, pitch=62), Note(20, 30)])
+    # one note spanning several new notes is truncated once
+    await clip.add_notes([Note(2, 4), Note(6, 8), Note(25, 35)])
+    assert clip.notes == [
+        Note(0, 2),
+        Note(2, 4),
+        Note(6, 8),
+        Note(10, 20, pitch=62),
+        Note(20, 25),
+        Note(25, 35),
+    ]
+    await clip.remove_notes([Note(2, 4), Note(20, 25)])
+    await clip.add_notes([Note(1, 3), Note(22, 23)])
+    assert clip.notes == [
+        Note(0, 1),
+        Note(1, 3),
+        Note(6, 8),
+        Note(10, 20, pitch=62),
+        Note(22, 23),
+        Note(25, 35),
+    ]
+    assert clip.note_store._notes_by_pitch == {
+        0: [Note(0, 1), Note(1, 3), Note(6, 8), Note(22, 23), Note(25, 35)],
+        62: [Note(10, 20, pitch=62)],
+    }
@@ -1,3 +1,5 @@
+import pytest
+
 from tloen.domain import Clip, Note, NoteMoment
 
 offsets = [-0.5, 0, 0.125, 0.25, 0.5, 0.75, 1, 1.25, 2.25]
@@ -300,3 +302,93 @@ def test_4():
             stop_notes=[Note(0.5, 0.75, pitch=64)],
         ),
     ]
+
+
+@pytest.mark.asyncio
+async def test_5():
+    """
+    Editing a clip invalidates its compiled event table.
+    """
+    clip = Clip(notes=[Note(0, 0.5, pitch=60)])
+    assert clip.at(0.25) == NoteMoment(
+        offset=0.25,
+        local_offset=0.25,
+        next_offset=0.5,
+        overlap_notes=[Note(0, 0.5, pitch=60)],
+    )
+    event_table = clip.event_table
+    assert clip.event_table is event_table
+    await clip.add_notes([Note(0.25, 0.75, pitch=62)])
+    assert clip.event_table is not event_table
+    assert clip.at(0.25) == NoteMoment(
+        offset=0.25,
+        local_offset=0.25,
+        next_offset=0.5,
+        start_notes=[Note(0.25, 0.75, pitch=62)],
+        overlap_notes=[Note(0, 0.5, pitch=60)],
+    )
+    await clip.remove_notes([Note(0, 0.5, pitch=60)])
+    assert clip.at(0.25) == NoteMoment(
+        offset=0.25,
+        local_offset=0.25,
+        next_offset=0.75,
+        start_notes=[Note(0.25, 0.75, pitch=62)],
+    )
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "c4 d e f",
+        "c4. d8 e4 ~8 f",
+        "{ { <c fs>4 r8 q } ~8 q4 } ~8",
+        "2/3 { c d e } 4/5 { ~8 g8 a b c' }",
+        r"\repeat unfold 4 { c16 ~32 <e g>32 } r4 \repeat unfold 3 { ~16 d16 }",
+    ],
+)
+def test_6(pattern):
+    """
+    Pattern clips evaluate lazily, matching clips of their expanded notes.
+    """
+    lazy_clip = Clip(pattern=pattern)
+    clip = Clip(duration=lazy_clip.duration, notes=lazy_clip.notes)
+    # one pass, as the eager clip matches offsets folded back into later
+    # loops exactly, while patterns tolerate their float noise
+    offset = 0.0
+    while offset is not None and offset < clip.duration:
+        expected = clip.at(offset)
+        assert lazy_clip.at(offset) == expected
+        assert lazy_clip.at(offset + 1 / 64) == clip.at(offset + 1 / 64)
+        offset = expected.next_offset
+
+
+@pytest.mark.asyncio
+async def test_7():
+    """
+    Editing a pattern clip expands its pattern into notes first.
+    """
+    clip = Clip(pattern=r"\repeat unfold 2 { c4 d }")
+    assert clip.duration == 1.0
+    assert clip.pattern is not None
+    assert not clip._note_store.notes
+    await clip.add_notes([Note(0.25, 0.5, pitch=48)])
+    assert clip.pattern is None
+    assert clip.notes == [
+        Note(0.0, 0.25, pitch=60),
+        Note(0.25, 0.5, pitch=48),
+        Note(0.25, 0.5, pitch=62),
+        Note(0.5, 0.75, pitch=60),
+        Note(0.75, 1.0, pitch=62),
+    ]
+
+
+def test_8():
+    """
+    Pattern lookups match note boundaries within float noise.
+    """
+    clip = Clip(pattern="2/3 { c8 d e }")
+    offset = 0.25 / 3 + 1e-12  # a triplet eighth, give or take float noise
+    moment = clip.at(offset)
+    assert moment.start_notes == [Note(1 / 12, 1 / 6, pitch=62)]
+    assert moment.stop_notes == [Note(0, 1 / 12, pitch=60)]
+    assert not moment.overlap_notes
@@ -0,0 +1,16 @@
+import pytest
+
+from tloen.domain import Clip, Note
+
+
+@pytest.mark.asyncio
+async def test_1():
+    clip = Clip(duration=1, notes=[Note(0, 0.25, pitch=60), Note(0.5, 1, pitch=62)])
+    await clip.double()
+    assert clip.duration == 2
+    assert clip.notes == [
+        Note(0, 0.25, pitch=60),
+        Note(0.5, 1, pitch=62),
+        Note(1, 1.25, pitch=60),
+        Note(1.5, 2, pitch=62),
+    ]
@@ -4,7 +4,8 @@ import logging
 import pytest
 from supriya.clocks import AsyncTempoClock, Moment
 
-from tloen.domain import Application, Instrument, Note
+from tloen.domain import Application, Clip, Instrument, Note
+from tloen.domain.notes import NoteSelector
 from tloen.midi import NoteOffMessage, NoteOnMessage
 
 logger = logging.getLogger("tloen.test")
@@ -133,3 +134,76 @@ async def test_2(mocker, application):
                 message=NoteOffMessage(pitch=60, velocity=100.0),
             ),
         ]
+
+
+@pytest.mark.asyncio
+async def test_3(mocker):
+    """
+    Edits inside a transaction are merged and notified once.
+    """
+    clip = Clip(notes=[Note(0, 1, pitch=60), Note(1, 2, pitch=62)])
+    notify = mocker.spy(clip, "_notify")
+    async with clip.edit():
+        await clip.remove_notes([Note(0, 1, pitch=60)])
+        await clip.add_notes([Note(0, 2, pitch=64), Note(3, 4, pitch=65)])
+        await clip.remove_notes([Note(3, 4, pitch=65)])
+        await clip.add_notes([Note(1, 3, pitch=62)])
+        assert notify.call_count == 0
+        assert clip.notes == [Note(0, 1, pitch=60), Note(1, 2, pitch=62)]
+    assert notify.call_count == 1
+    assert clip.notes == [Note(0, 2, pitch=64), Note(1, 3, pitch=62)]
+
+
+@pytest.mark.asyncio
+async def test_4(mocker):
+    """
+    Edits inside a failed transaction are discarded.
+    """
+    clip = Clip(notes=[Note(0, 1, pitch=60)])
+    notify = mocker.spy(clip, "_notify")
+    with pytest.raises(RuntimeError):
+        async with clip.edit():
+            await clip.add_notes([Note(1, 2, pitch=62)])
+            raise RuntimeError
+    assert notify.call_count == 0
+    assert clip.notes == [Note(0, 1, pitch=60)]
+
+
+@pytest.mark.asyncio
+async def test_5(mocker):
+    """
+    NoteSelector edits run as a single transaction.
+    """
+    clip = Clip(notes=[Note(0, 1, pitch=60), Note(1, 2, pitch=62)])
+    notify = mocker.spy(clip, "_notify")
+    await NoteSelector(clip).transpose(12)
+    assert notify.call_count == 1
+    assert clip.notes == [Note(0, 1, pitch=72), Note(1, 2, pitch=74)]
+
+
+@pytest.mark.asyncio
+async def test_6(mocker):
+    """
+    Adding and then removing an existing note inside a transaction removes it,
+    as it would outside one.
+    """
+    clip = Clip(notes=[Note(0, 1, pitch=60), Note(1, 2, pitch=62)])
+    async with clip.edit():
+        await clip.add_notes([Note(0, 1, pitch=60), Note(2, 3, pitch=64)])
+        await clip.remove_notes([Note(0, 1, pitch=60), Note(2, 3, pitch=64)])
+    assert clip.notes == [Note(1, 2, pitch=62)]
+
+
+@pytest.mark.asyncio
+async def test_7(mocker):
+    """
+    A transaction removing a missing note fails without changing the clip.
+    """
+    clip = Clip(notes=[Note(0, 1, pitch=60), Note(1, 2, pitch=62)])
+    notify = mocker.spy(clip, "_notify")
+    with pytest.raises(ValueError):
+        async with clip.edit():
+            await clip.remove_notes([Note(0, 1, pitch=60), Note(5, 6, pitch=60)])
+            await clip.add_notes([Note(3, 4, pitch=65)])
+    assert notify.call_count == 0
+    assert clip.notes == [Note(0, 1, pitch=60), Note(1, 2, pitch=62)]
@@ -0,0 +1,14 @@
+import pytest
+
+from tloen.domain import Clip, Note
+
+
+@pytest.mark.asyncio
+async def test_1():
+    clip = Clip(
+        duration=2,
+        notes=[Note(0, 0.5, pitch=60), Note(0.5, 1.5, pitch=62), Note(1, 2, pitch=64)],
+    )
+    await clip.halve()
+    assert clip.duration == 1
+    assert clip.notes == [Note(0, 0.5, pitch=60), Note(0.5, 1, pitch=62)]
@@ -0,0 +1,135 @@
+import struct
+
+import pytest
+
+from tloen.domain import Clip, Note
+from tloen.midi import read_midi_file
+
+
+def test_1(tmp_path):
+    """
+    Reads running status, zero-velocity note-ons, meta events and overlapping
+    notes on one pitch.
+    """
+    events = bytes(
+        [
+            # tempo meta event
+            *(0x00, 0xFF, 0x51, 0x03, 0x07, 0xA1, 0x20),
+            # note on 60, then running status note on 64
+            *(0x00, 0x90, 60, 100),
+            *(0x00, 64, 90),
+            # second note on 60 before the first is released
+            *(0x83, 0x60, 60, 80),
+            # running status zero-velocity note-ons release both 60s and 64
+            *(0x83, 0x60, 60, 0),
+            *(0x00, 64, 0),
+            *(0x83, 0x60, 60, 0),
+            # program change, then end of track one measure later
+            *(0x00, 0xC0, 0x05),
+            *(0x83, 0x60, 0xFF, 0x2F, 0x00),
+        ]
+    )
+    path = tmp_path / "test.mid"
+    path.write_bytes(
+        b"MThd"
+        + struct.pack(">IHHH", 6, 0, 1, 480)
+        + b"MTrk"
+        + struct.pack(">I", len(events))
+        + events
+    )
+    batches = list(read_midi_file(path, batch_size=2))
+    assert [len(batch.rows) for batch in batches] == [2, 1]
+    assert [batch.stop_offset for batch in batches] == [None, 1.0]
+    assert sorted(row for batch in batches for row in batch.rows) == [
+        (0.0, 0.5, 60.0, 100.0),
+        (0.0, 0.5, 64.0, 90.0),
+        (0.25, 0.75, 60.0, 80.0),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage", [Clip.Storage.TREE, Clip.Storage.ARRAY])
+async def test_2(storage, tmp_path):
+    """
+    Exported clips import back with their notes and duration.
+    """
+    if storage == Clip.Storage.ARRAY:
+        pytest.importorskip("numpy")
+    notes = [
+        Note(0, 0.25, pitch=60),
+        Note(0.25, 0.5, pitch=62, velocity=64),
+        Note(0.5, 0.75, pitch=64, velocity=32),
+        Note(1.0, 1.5, pitch=65),
+    ]
+    Clip(duration=2, notes=notes).export_midi(tmp_path / "test.mid")
+    clip = Clip(storage=storage)
+    await clip.import_midi(tmp_path / "test.mid", batch_size=3)
+    assert clip.notes == notes
+    assert clip.duration == 2.0
+
+
+@pytest.mark.asyncio
+async def test_3(tmp_path):
+    """
+    Notes shorter than a tick export as one-tick notes.
+    """
+    Clip(duration=1, notes=[Note(0.5, 0.5001, pitch=60)]).export_midi(
+        tmp_path / "test.mid"
+    )
+    clip = Clip()
+    await clip.import_midi(tmp_path / "test.mid")
+    assert clip.notes == [Note(0.5, 0.5 + 1 / 1920, pitch=60)]
+
+
+def test_4(tmp_path):
+    """
+    Truncated track events raise a ValueError.
+    """
+    events = bytes([0x00, 0x90, 60])
+    path = tmp_path / "test.mid"
+    path.write_bytes(
+        b"MThd"
+        + struct.pack(">IHHH", 6, 0, 1, 480)
+        + b"MTrk"
+        + struct.pack(">I", len(events))
+        + events
+    )
+    with pytest.raises(ValueError):
+        list(read_midi_file(path))
+
+
+@pytest.mark.asyncio
+async def test_5(tmp_path):
+    """
+    Notes of one pitch starting together merge whatever the batch size.
+    """
+    events = bytes(
+        [
+            # pitch 60 starts on two channels, and pitch 64 in between
+            *(0x00, 0x90, 60, 120),
+            *(0x00, 0x91, 60, 80),
+            *(0x00, 0x90, 64, 100),
+            # the louder 60 stops first, then 64, then the longer 60
+            *(0x83, 0x60, 0x80, 60, 0),
+            *(0x83, 0x60, 0x80, 64, 0),
+            *(0x87, 0x40, 0x81, 60, 0),
+            *(0x00, 0xFF, 0x2F, 0x00),
+        ]
+    )
+    path = tmp_path / "test.mid"
+    path.write_bytes(
+        b"MThd"
+        + struct.pack(">IHHH", 6, 0, 1, 480)
+        + b"MTrk"
+        + struct.pack(">I", len(events))
+        + events
+    )
+    clip = Clip()
+    await clip.import_midi(path)
+    assert clip.notes == [
+        Note(0, 0.5, pitch=64),
+        Note(0, 1.0, pitch=60, velocity=120),
+    ]
+    batched_clip = Clip()
+    await batched_clip.import_midi(path, batch_size=1)
+    assert batched_clip.notes == clip.notes
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+from supriya.clocks import AsyncTempoClock
+
+from tloen.domain import Application, BusParameter, Envelope, Note
+
+
+@pytest.fixture
+async def application(mocker, monkeypatch):
+    async def wait_for_event(self, sleep_time):
+        await asyncio.sleep(0)
+        await self._event.wait()
+
+    monkeypatch.setattr(AsyncTempoClock, "_wait_for_event", wait_for_event)
+    mock_time = mocker.patch.object(AsyncTempoClock, "get_current_time")
+    mock_time.return_value = 0.0
+
+    application = await Application.new(1, 1, 1)
+    track = application.contexts[0].tracks[0]
+    await track.slots[0].add_clip(notes=[Note(0, 1, pitch=60)])
+    yield application
+    await application.transport.stop()
+
+
+@pytest.fixture
+def automation(monkeypatch):
+    calls = []
+
+    async def ramp(self, start_value, stop_value, duration, *, moment=None):
+        calls.append(("ramp", moment.offset, start_value, stop_value, duration))
+
+    async def set_(self, value, *, moment=None):
+        calls.append(("set", moment.offset, value))
+
+    monkeypatch.setattr(BusParameter, "ramp", ramp)
+    monkeypatch.setattr(BusParameter, "set_", set_)
+    return calls
+
+
+async def set_time(new_time, transport):
+    transport._clock.get_current_time.return_value = new_time
+    transport._clock._event.set()
+    await asyncio.sleep(0.01)
+
+
+def test_1():
+    """
+    Breakpoints stay sorted, and re-adding an offset replaces its value.
+    """
+    envelope = Envelope(None, [(0.5, 1.0), (0.0, 0.0), (0.25, 0.5)])
+    envelope.add_breakpoints([(0.25, 0.75)])
+    assert envelope.breakpoints == [(0.0, 0.0), (0.25, 0.75), (0.5, 1.0)]
+    envelope.remove_breakpoints([0.25, 0.3])
+    assert envelope.breakpoints == [(0.0, 0.0), (0.5, 1.0)]
+
+
+def test_2():
+    """
+    Values ramp between breakpoints and hold outside them.
+    """
+    envelope = Envelope(None, [(0.25, 0.0), (0.75, 1.0)])
+    assert [envelope.value_at(offset) for offset in [0, 0.25, 0.5, 0.75, 1]] == [
+        0.0,
+        0.0,
+        0.5,
+        1.0,
+        1.0,
+    ]
+    assert envelope.segment_at(0.5) == (0.25, 0.75, 0.0, 1.0)
+    assert envelope.segment_at(1.0) == (0.75, None, 1.0, 1.0)
+    assert Envelope(None).segment_at(0.0) is None
+
+
+@pytest.mark.asyncio
+async def test_3(application):
+    """
+    Envelopes round-trip through serialization, and double with their clip.
+    """
+    track = application.contexts[0].tracks[0]
+    parameter = track.parameters["gain"]
+    clip = track.slots[0].clip
+    await clip.set_envelope(parameter, [(0.0, -12.0), (0.5, 0.0)])
+    new_application = await Application.deserialize(application.serialize())
+    new_clip = new_application.contexts[0].tracks[0].slots[0].clip
+    assert new_clip.envelopes[parameter.uuid].breakpoints == [
+        (0.0, -12.0),
+        (0.5, 0.0),
+    ]
+    await clip.double()
+    assert clip.envelopes[parameter.uuid].breakpoints == [
+        (0.0, -12.0),
+        (0.5, 0.0),
+        (1.0, -12.0),
+        (1.5, 0.0),
+    ]
+    await clip.halve()
+    assert clip.envelopes[parameter.uuid].breakpoints == [
+        (0.0, -12.0),
+        (0.5, 0.0),
+        (1.0, -12.0),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_4(application, automation):
+    """
+    Playback renders one ramp per breakpoint segment, looping with the clip.
+    """
+    track = application.contexts[0].tracks[0]
+    clip = track.slots[0].clip
+    await clip.set_envelope(track.parameters["gain"], [(0.0, -12.0), (0.5, 0.0)])
+    await track.slots[0].fire()
+    await set_time(0.0, application.transport)
+    assert automation == [("ramp", 0.0, -12.0, 0.0, 1.0)]
+    await set_time(1.0, application.transport)
+    assert automation[1:] == [("set", 0.5, 0.0)]
+    await set_time(2.0, application.transport)
+    assert automation[2:] == [("ramp", 1.0, -12.0, 0.0, 1.0)]
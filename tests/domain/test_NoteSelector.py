@@ -0,0 +1,238 @@
+import pytest
+
+from tloen.domain import Clip, Note
+from tloen.domain.notes import NoteSelector
+
+
+@pytest.fixture(params=[Clip.Storage.TREE, Clip.Storage.ARRAY])
+def clip(request):
+    if request.param == Clip.Storage.ARRAY:
+        pytest.importorskip("numpy")
+    return Clip(
+        duration=4,
+        notes=[
+            Note(0, 1, pitch=60),
+            Note(0, 0.5, pitch=64),
+            Note(1, 1.5, pitch=62),
+            Note(1, 3, pitch=72),
+            Note(2, 2.25, pitch=67),
+            Note(3, 4, pitch=48),
+        ],
+        storage=request.param,
+    )
+
+
+def test_between_offsets(clip):
+    selector = NoteSelector(clip)
+    assert list(selector.between_offsets(1, 2.5)) == [
+        Note(1, 1.5, pitch=62),
+        Note(2, 2.25, pitch=67),
+    ]
+    assert list(selector.between_offsets(stop_offset=1)) == [
+        Note(0, 0.5, pitch=64),
+        Note(0, 1, pitch=60),
+    ]
+    assert list(selector.between_offsets(start_offset=3)) == [Note(3, 4, pitch=48)]
+    assert list(selector.between_offsets(3, 0.5)) == [
+        Note(0, 0.5, pitch=64),
+        Note(3, 4, pitch=48),
+    ]
+
+
+def test_between_pitches(clip):
+    selector = NoteSelector(clip)
+    assert list(selector.between_pitches(60, 64)) == [
+        Note(0, 0.5, pitch=64),
+        Note(0, 1, pitch=60),
+        Note(1, 1.5, pitch=62),
+    ]
+    assert list(selector.between_pitches(70, 50)) == [
+        Note(1, 3, pitch=72),
+        Note(3, 4, pitch=48),
+    ]
+
+
+def test_with_durations(clip):
+    selector = NoteSelector(clip)
+    assert list(selector.with_durations([0.25, 0.5])) == [
+        Note(0, 0.5, pitch=64),
+        Note(1, 1.5, pitch=62),
+        Note(2, 2.25, pitch=67),
+    ]
+    assert list(selector.with_durations(1, ">")) == [Note(1, 3, pitch=72)]
+
+
+def test_with_pitches(clip):
+    selector = NoteSelector(clip)
+    assert list(selector.with_pitches([60, 62])) == [
+        Note(0, 1, pitch=60),
+        Note(1, 1.5, pitch=62),
+    ]
+    assert list(selector.with_pitches(62, "<")) == [
+        Note(0, 1, pitch=60),
+        Note(3, 4, pitch=48),
+    ]
+    with pytest.raises(ValueError):
+        selector.with_pitches(60, "~")
+
+
+def test_with_pitch_classes(clip):
+    selector = NoteSelector(clip)
+    assert list(selector.with_pitch_classes(0)) == [
+        Note(0, 1, pitch=60),
+        Note(1, 3, pitch=72),
+        Note(3, 4, pitch=48),
+    ]
+    assert list(selector.with_pitch_classes(0).between_offsets(0, 2)) == [
+        Note(0, 1, pitch=60)
+    ]
+
+
+def test_set_operations(clip):
+    selector = NoteSelector(clip)
+    low = selector.between_pitches(stop_pitch=62)
+    early = selector.between_offsets(stop_offset=1.5)
+    assert list(low & early) == [Note(0, 1, pitch=60), Note(1, 1.5, pitch=62)]
+    assert list(low | early) == [
+        Note(0, 0.5, pitch=64),
+        Note(0, 1, pitch=60),
+        Note(1, 1.5, pitch=62),
+        Note(3, 4, pitch=48),
+    ]
+    assert list(low ^ early) == [Note(0, 0.5, pitch=64), Note(3, 4, pitch=48)]
+    assert list(~low) == [
+        Note(0, 0.5, pitch=64),
+        Note(1, 3, pitch=72),
+        Note(2, 2.25, pitch=67),
+    ]
+    assert list(~selector) == []
+
+
+@pytest.mark.asyncio
+async def test_quantize(mocker):
+    pytest.importorskip("numpy")
+    clip = Clip(notes=[Note(0.0625, 0.1875, pitch=60), Note(0.3125, 0.4375, pitch=62)])
+    notify = mocker.spy(clip, "_notify")
+    await NoteSelector(clip).with_pitches(60).quantize(0.25)
+    assert notify.call_count == 1
+    assert clip.notes == [Note(0, 0.125, pitch=60), Note(0.3125, 0.4375, pitch=62)]
+    await NoteSelector(clip).with_pitches(62).quantize(
+        0.5, strength=0.5, quantize_stops=True
+    )
+    assert clip.notes == [Note(0, 0.125, pitch=60), Note(0.40625, 0.46875, pitch=62)]
+
+
+@pytest.mark.asyncio
+async def test_swing():
+    pytest.importorskip("numpy")
+    clip = Clip(notes=[Note(x / 8, (x + 1) / 8, pitch=60) for x in range(4)])
+    await NoteSelector(clip).swing(1 / 8, 0.5)
+    assert clip.notes == [
+        Note(0, 1 / 8, pitch=60),
+        Note(3 / 16, 1 / 4, pitch=60),
+        Note(1 / 4, 3 / 8, pitch=60),
+        Note(7 / 16, 9 / 16, pitch=60),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_humanize():
+    pytest.importorskip("numpy")
+    notes = [Note(x / 4, (x + 1) / 4, pitch=60 + x) for x in range(4)]
+    clip = Clip(notes=notes)
+    await NoteSelector(clip).humanize(timing=0.01, velocity=10, seed=1)
+    assert len(clip.notes) == 4
+    for old_note, new_note in zip(notes, clip.notes):
+        assert new_note.pitch == old_note.pitch
+        assert abs(new_note.start_offset - old_note.start_offset) <= 0.01
+        assert new_note.stop_offset - new_note.start_offset == pytest.approx(0.25)
+        assert abs(new_note.velocity - old_note.velocity) <= 10
+
+
+@pytest.mark.asyncio
+async def test_legato():
+    pytest.importorskip("numpy")
+    clip = Clip(
+        notes=[
+            Note(0, 0.1, pitch=60),
+            Note(0, 0.2, pitch=64),
+            Note(0.5, 0.6, pitch=62),
+            Note(1, 1.1, pitch=60),
+        ]
+    )
+    await NoteSelector(clip).legato()
+    assert clip.notes == [
+        Note(0, 0.5, pitch=60),
+        Note(0, 0.5, pitch=64),
+        Note(0.5, 1, pitch=62),
+        Note(1, 1.1, pitch=60),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_velocities():
+    pytest.importorskip("numpy")
+    clip = Clip(
+        notes=[
+            Note(0, 1, pitch=60, velocity=40),
+            Note(0, 1, pitch=62, velocity=80),
+            Note(0, 1, pitch=64, velocity=120),
+        ]
+    )
+    await NoteSelector(clip).scale_velocities(1.5)
+    assert [note.velocity for note in clip.notes] == [60, 120, 127]
+    await NoteSelector(clip).compress_velocities(100, 4)
+    assert [note.velocity for note in clip.notes] == [60, 105, 106.75]
+
+
+@pytest.mark.asyncio
+async def test_humanize_array(mocker):
+    """
+    Array-backed clips transform their columns, matching tree-backed clips.
+    """
+    pytest.importorskip("numpy")
+    notes = [Note(x / 4, (x + 1) / 4, pitch=60 + x % 2) for x in range(8)]
+    tree_clip = Clip(notes=notes)
+    array_clip = Clip(notes=notes, storage=Clip.Storage.ARRAY)
+    notify = mocker.spy(array_clip, "_notify")
+    get_notes = mocker.spy(array_clip.note_store, "_get_notes")
+    for clip in (tree_clip, array_clip):
+        await NoteSelector(clip).with_pitches(61).humanize(
+            timing=0.01, velocity=10, seed=1
+        )
+    assert notify.call_count == 1
+    assert get_notes.call_count == 1  # selecting, but not transforming
+    assert array_clip.notes == tree_clip.notes
+    assert array_clip.notes[::2] == notes[::2]
+
+
+@pytest.mark.asyncio
+async def test_humanize_without_numpy(monkeypatch):
+    """
+    Transforms fail with a RuntimeError when NumPy is missing.
+    """
+    import tloen.domain.notes
+
+    monkeypatch.setattr(tloen.domain.notes, "numpy", None)
+    clip = Clip(notes=[Note(0, 1, pitch=60)])
+    with pytest.raises(RuntimeError):
+        await NoteSelector(clip).humanize(timing=0.01, seed=1)
+
+
+@pytest.mark.asyncio
+async def test_pattern():
+    """
+    Selecting from a pattern clip leaves its pattern unexpanded until edited.
+    """
+    clip = Clip(pattern=r"\repeat unfold 2 { c4 d }")
+    selector = NoteSelector(clip).with_pitches(62).between_offsets(0.5, 1)
+    assert list(selector) == [Note(0.75, 1.0, pitch=62)]
+    assert clip.pattern is not None
+    assert not clip._note_store.notes
+    await selector.delete()
+    assert clip.pattern is None
+    assert clip.notes == [
+        Note(0.0, 0.25, pitch=60),
+        Note(0.25, 0.5, pitch=62),
+        Note(0.5, 0.75, pitch=60),
+    ]
@@ -0,0 +1,32 @@
+import pytest
+
+from tloen.domain import Application, DeviceObject
+
+
+@pytest.mark.asyncio
+async def test_1():
+    """
+    Routes follow devices and tracks as they're added, moved and removed.
+    """
+    application = await Application.new(1, 2, 1)
+    track_one, track_two = application.primary_context.tracks
+    device_one = await track_one.add_device(DeviceObject)
+    device_two = await track_one.add_device(DeviceObject)
+    assert device_one._next_performer() == device_two._perform_input
+    assert device_two._next_performer() == track_one._perform_output
+    assert track_one._next_performer() == track_two._perform_input
+    device_three = await track_one.add_device(DeviceObject)
+    assert device_two._next_performer() == device_three._perform_input
+    await device_one.move(track_one, 2)
+    assert list(track_one.devices) == [device_two, device_three, device_one]
+    assert device_three._next_performer() == device_one._perform_input
+    assert device_one._next_performer() == track_one._perform_output
+    await device_one.move(track_two, 0)
+    assert device_three._next_performer() == track_one._perform_output
+    assert device_one._next_performer() == track_two._perform_output
+    await track_two.move(track_one, 0)
+    assert track_one._next_performer() is None
+    assert track_two._next_performer() == track_one._perform_output
+    assert device_one._next_performer() == track_two._perform_output
+    await track_one.remove_devices(device_two)
+    assert device_two._next_performer() is None
@@ -1,7 +1,15 @@
+import contextlib
+
 import pytest
 
-from tloen.domain import Application, Instrument, RackDevice, Transfer
-from tloen.midi import NoteOnMessage
+from tloen.domain import (
+    Application,
+    DeviceObject,
+    Instrument,
+    RackDevice,
+    Transfer,
+)
+from tloen.midi import ControllerChangeMessage, NoteOffMessage, NoteOnMessage
 
 
 @pytest.mark.asyncio
@@ -33,3 +41,52 @@ async def test():
             moment=None, label="I", message=NoteOnMessage(pitch=60, velocity=100)
         )
     ]
+
+
+@pytest.mark.asyncio
+async def test_transfer_routing():
+    """
+    Notes only reach the chains whose transfers accept their pitch.
+    """
+    application = await Application.new(1, 1, 1)
+    track = application.contexts[0].tracks[0]
+    rack = await track.add_device(RackDevice)
+    devices = []
+    for transfer in [Transfer(in_pitch=60), Transfer(in_pitch=61), Transfer()]:
+        chain = await rack.add_chain(transfer=transfer)
+        devices.append(await chain.add_device(DeviceObject))
+    chain_one, chain_two, chain_three = rack.chains
+
+    async def perform(*midi_messages):
+        with contextlib.ExitStack() as exit_stack:
+            captures = [exit_stack.enter_context(_.capture()) for _ in devices]
+            await track.perform(list(midi_messages))
+        return [[_.message for _ in capture if _.label == "I"] for capture in captures]
+
+    assert await perform(NoteOnMessage(pitch=60)) == [
+        [NoteOnMessage(pitch=60)],
+        [],
+        [NoteOnMessage(pitch=60)],
+    ]
+    assert await perform(NoteOnMessage(pitch=62), ControllerChangeMessage()) == [
+        [ControllerChangeMessage()],
+        [ControllerChangeMessage()],
+        [NoteOnMessage(pitch=62), ControllerChangeMessage()],
+    ]
+    await chain_two.set_transfer(Transfer(in_pitch=62, out_pitch=48))
+    assert await perform(NoteOffMessage(pitch=62)) == [
+        [],
+        [NoteOffMessage(pitch=48)],
+        [NoteOffMessage(pitch=62)],
+    ]
+    await rack.remove_chains(chain_three)
+    assert await perform(NoteOnMessage(pitch=60)) == [
+        [NoteOnMessage(pitch=60)],
+        [],
+        [],
+    ]
+    assert rack._get_performers_by_pitch() == {
+        60: [chain_one._perform_input],
+        62: [chain_two._perform_input],
+        None: [],
+    }
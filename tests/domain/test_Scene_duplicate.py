@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from supriya.clocks import AsyncTempoClock
+
+from tloen.domain import Application, Note, Track
+
+
+@pytest.mark.asyncio
+async def test_1():
+    application = await Application.new(1, 2, 2)
+    context = application.contexts[0]
+    await context.tracks[0].add_track()
+    clip = await context.tracks[0].slots[0].add_clip(notes=[Note(0, 1, pitch=60)])
+    scene = await application.scenes[0].duplicate()
+    assert application.scenes.index(scene) == 1
+    assert len(application.scenes) == 3
+    for track in application.recurse(Track):
+        assert len(track.slots) == 3
+    copied_clip = context.tracks[0].slots[1].clip
+    assert copied_clip is not clip
+    assert copied_clip.note_store is clip.note_store
+    assert copied_clip.notes == [Note(0, 1, pitch=60)]
+    assert context.tracks[1].slots[1].clip is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_2(mocker, monkeypatch):
+    """
+    Duplicating a scene above a playing clip keeps the clip playing.
+    """
+
+    async def wait_for_event(self, sleep_time):
+        await asyncio.sleep(0)
+        await self._event.wait()
+
+    monkeypatch.setattr(AsyncTempoClock, "_wait_for_event", wait_for_event)
+    mocker.patch.object(AsyncTempoClock, "get_current_time").return_value = 0.0
+    application = await Application.new(1, 1, 3)
+    track = application.contexts[0].tracks[0]
+    clip = await track.slots[1].add_clip(notes=[Note(0, 1, pitch=60)])
+    await track.slots[1].fire()
+    transport = application.transport
+    transport._clock._event.set()
+    await asyncio.sleep(0.01)
+    assert track._active_slot_index == 1
+    await track.slots[2].fire()
+    await application.scenes[0].duplicate()
+    assert track.slots[track._active_slot_index].clip is clip
+    assert track._pending_slot_index == 3
+    await transport.stop()
@@ -0,0 +1,45 @@
+import pytest
+
+from tloen.domain import Application, Note
+from tloen.midi import MidiFileTrack, write_midi_file
+
+
+@pytest.mark.asyncio
+async def test_1(tmp_path):
+    """
+    Scenes export and import one file track per application track.
+    """
+    application = await Application.new(1, 3, 2)
+    tracks = application.contexts[0].tracks
+    await tracks[0].slots[0].add_clip(notes=[Note(0, 0.5, pitch=60)])
+    await tracks[2].slots[0].add_clip(notes=[Note(0.5, 1.0, pitch=48)])
+    await tracks[2].slots[0].clip.double()
+    application.scenes[0].export_midi(tmp_path / "test.mid")
+    await application.scenes[1].import_midi(tmp_path / "test.mid")
+    assert tracks[0].slots[1].clip.notes == [Note(0, 0.5, pitch=60)]
+    assert tracks[1].slots[1].clip is None
+    assert tracks[2].slots[1].clip.notes == [
+        Note(0.5, 1.0, pitch=48),
+        Note(1.5, 2.0, pitch=48),
+    ]
+    assert tracks[2].slots[1].clip.duration == 2.0
+
+
+@pytest.mark.asyncio
+async def test_2(tmp_path):
+    """
+    Scenes import from a later file track, skipping a conductor track.
+    """
+    application = await Application.new(1, 2, 1)
+    tracks = application.contexts[0].tracks
+    write_midi_file(
+        tmp_path / "test.mid",
+        [
+            MidiFileTrack(rows=[], stop_offset=1.0),
+            MidiFileTrack(rows=[(0.0, 0.5, 60.0, 100.0)]),
+            MidiFileTrack(rows=[(0.5, 1.0, 48.0, 100.0)]),
+        ],
+    )
+    await application.scenes[0].import_midi(tmp_path / "test.mid", track_index=1)
+    assert tracks[0].slots[0].clip.notes == [Note(0, 0.5, pitch=60)]
+    assert tracks[1].slots[0].clip.notes == [Note(0.5, 1.0, pitch=48)]
@@ -0,0 +1,40 @@
+import pytest
+
+from tloen.domain import Application, Note
+
+
+@pytest.mark.asyncio
+async def test_1():
+    """
+    Duplicate into the next empty slot, sharing notes until edited
+    """
+    application = await Application.new(1, 1, 3)
+    track = application.contexts[0].tracks[0]
+    clip = await track.slots[0].add_clip(notes=[Note(0, 1, pitch=60)])
+    await track.slots[1].add_clip()
+    copied_clip = await track.slots[0].duplicate_clip()
+    assert copied_clip is track.slots[2].clip
+    assert copied_clip is not clip
+    assert copied_clip.notes == clip.notes
+    assert copied_clip.note_store is clip.note_store
+    await copied_clip.add_notes([Note(1, 2, pitch=62)])
+    assert copied_clip.note_store is not clip.note_store
+    assert clip.notes == [Note(0, 1, pitch=60)]
+    assert copied_clip.notes == [Note(0, 1, pitch=60), Note(1, 2, pitch=62)]
+    with pytest.raises(RuntimeError):
+        await track.slots[0].duplicate_clip()
+
+
+@pytest.mark.asyncio
+async def test_2():
+    """
+    Editing the original detaches it from the copy
+    """
+    application = await Application.new(1, 1, 2)
+    track = application.contexts[0].tracks[0]
+    clip = await track.slots[0].add_clip(notes=[Note(0, 1, pitch=60)])
+    copied_clip = await track.slots[0].duplicate_clip(track.slots[1])
+    await clip.remove_notes([Note(0, 1, pitch=60)])
+    assert clip.notes == []
+    assert copied_clip.notes == [Note(0, 1, pitch=60)]
+    assert not copied_clip.note_store.is_shared
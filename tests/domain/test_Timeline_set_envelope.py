@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from supriya.clocks import AsyncTempoClock
+
+from tloen.domain import Application, BusParameter
+
+
+@pytest.fixture
+async def application(mocker, monkeypatch):
+    async def wait_for_event(self, sleep_time):
+        await asyncio.sleep(0)
+        await self._event.wait()
+
+    monkeypatch.setattr(AsyncTempoClock, "_wait_for_event", wait_for_event)
+    mock_time = mocker.patch.object(AsyncTempoClock, "get_current_time")
+    mock_time.return_value = 0.0
+
+    application = await Application.new(1, 1, 1)
+    yield application
+    if application.transport.is_running:
+        await application.transport.stop()
+
+
+@pytest.fixture
+def automation(monkeypatch):
+    calls = []
+
+    async def ramp(self, start_value, stop_value, duration, *, moment=None):
+        calls.append(("ramp", moment.offset, start_value, stop_value, duration))
+
+    async def set_(self, value, *, moment=None):
+        calls.append(("set", moment.offset, value))
+
+    monkeypatch.setattr(BusParameter, "ramp", ramp)
+    monkeypatch.setattr(BusParameter, "set_", set_)
+    return calls
+
+
+async def set_time(new_time, transport):
+    transport._clock.get_current_time.return_value = new_time
+    transport._clock._event.set()
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_1(application, automation):
+    """
+    Timeline envelopes play from the start of the transport.
+    """
+    parameter = application.contexts[0].tracks[0].parameters["gain"]
+    await application.timeline.set_envelope(
+        parameter, [(0.5, -6.0), (1.0, -6.0), (2.0, 0.0)]
+    )
+    await application.transport.start()
+    await set_time(0.0, application.transport)
+    assert automation == [("set", 0.0, -6.0)]
+    await set_time(1.0, application.transport)
+    assert automation[1:] == [("set", 0.5, -6.0)]
+    await set_time(2.0, application.transport)
+    assert automation[2:] == [("ramp", 1.0, -6.0, 0.0, 2.0)]
+    await set_time(4.0, application.transport)
+    assert automation[3:] == [("set", 2.0, 0.0)]
+    await application.transport.stop()
+    assert not application.timeline._event_ids
+
+
+@pytest.mark.asyncio
+async def test_2(application):
+    """
+    Timeline envelopes round-trip through serialization.
+    """
+    parameter = application.contexts[0].tracks[0].parameters["gain"]
+    await application.timeline.set_envelope(parameter, [(0.0, -6.0), (1.0, 0.0)])
+    new_application = await Application.deserialize(application.serialize())
+    assert new_application.timeline.envelopes[parameter.uuid].breakpoints == [
+        (0.0, -6.0),
+        (1.0, 0.0),
+    ]
+    await application.timeline.remove_envelope(parameter)
+    assert "timeline" not in application.serialize()["entities"][0]["spec"]
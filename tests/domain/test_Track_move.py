@@ -131,3 +131,19 @@ async def test_4():
             ["/n_set", 1044, "gate", 0],
         ],
     ]
+
+
+@pytest.mark.asyncio
+async def test_5():
+    """
+    Unbooted, move one track into another, old siblings reindex
+    """
+    application = Application()
+    context = await application.add_context()
+    track_one = await context.add_track()
+    track_two = await context.add_track()
+    track_three = await context.add_track()
+    await track_one.move(track_three, 0)
+    assert list(context.tracks) == [track_two, track_three]
+    assert [track.cached_state["index"] for track in context.tracks] == [0, 1]
+    assert track_one.cached_state["index"] == 0
@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+from supriya.clocks import AsyncTempoClock
+
+from tloen.domain import Application, Note
+from tloen.midi import NoteOffMessage, NoteOnMessage
+
+
+@pytest.fixture
+async def application(mocker, monkeypatch):
+    async def wait_for_event(self, sleep_time):
+        await asyncio.sleep(0)
+        await self._event.wait()
+
+    monkeypatch.setattr(AsyncTempoClock, "_wait_for_event", wait_for_event)
+    mock_time = mocker.patch.object(AsyncTempoClock, "get_current_time")
+    mock_time.return_value = 0.0
+
+    application = await Application.new(1, 1, 2)
+    track = application.contexts[0].tracks[0]
+    await track.slots[0].add_clip(
+        notes=[
+            Note(0, 0.25, pitch=60),
+            Note(0.25, 0.5, pitch=62),
+            Note(0.5, 0.75, pitch=64),
+            Note(0.75, 1.0, pitch=65),
+        ]
+    )
+    await track.slots[1].add_clip(notes=[Note(0, 1, pitch=48)])
+    yield application
+    await application.transport.stop()
+
+
+async def set_time(new_time, transport):
+    transport._clock.get_current_time.return_value = new_time
+    transport._clock._event.set()
+    await asyncio.sleep(0.01)
+
+
+def get_messages(transcript):
+    return [
+        (entry.moment.offset, entry.message)
+        for entry in transcript
+        if entry.label == "I"
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_1(application):
+    """
+    Performs a whole lookahead window at once.
+    """
+    track = application.contexts[0].tracks[0]
+    await track.set_clip_lookahead(0.5)
+    assert track.clip_lookahead == 0.5
+    with track.capture() as transcript:
+        await track.slots[0].fire()
+        await set_time(0.0, application.transport)
+    assert get_messages(transcript) == [
+        (0.0, NoteOnMessage(pitch=60, velocity=100.0)),
+        (0.25, NoteOffMessage(pitch=60)),
+        (0.25, NoteOnMessage(pitch=62, velocity=100.0)),
+    ]
+    with track.capture() as transcript:
+        await set_time(1.0, application.transport)
+    assert get_messages(transcript) == [
+        (0.5, NoteOffMessage(pitch=62)),
+        (0.5, NoteOnMessage(pitch=64, velocity=100.0)),
+        (0.75, NoteOffMessage(pitch=64)),
+        (0.75, NoteOnMessage(pitch=65, velocity=100.0)),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_2(application):
+    """
+    Clip edits take effect from the next lookahead window.
+    """
+    track = application.contexts[0].tracks[0]
+    await track.set_clip_lookahead(0.5)
+    with track.capture() as transcript:
+        await track.slots[0].fire()
+        await set_time(0.0, application.transport)
+        await track.slots[0].clip.add_notes(
+            [Note(0.125, 0.25, pitch=67), Note(0.625, 0.75, pitch=67)]
+        )
+        await set_time(1.0, application.transport)
+    assert get_messages(transcript) == [
+        (0.0, NoteOnMessage(pitch=60, velocity=100.0)),
+        (0.25, NoteOffMessage(pitch=60)),
+        (0.25, NoteOnMessage(pitch=62, velocity=100.0)),
+        (0.5, NoteOffMessage(pitch=62)),
+        (0.5, NoteOnMessage(pitch=64, velocity=100.0)),
+        (0.625, NoteOnMessage(pitch=67, velocity=100.0)),
+        (0.75, NoteOffMessage(pitch=64)),
+        (0.75, NoteOffMessage(pitch=67)),
+        (0.75, NoteOnMessage(pitch=65, velocity=100.0)),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_3(application):
+    """
+    Slot launches inside a performed window wait for it to finish.
+    """
+    track = application.contexts[0].tracks[0]
+    await track.set_clip_lookahead(0.5)
+    with track.capture() as transcript:
+        await track.slots[0].fire()
+        await set_time(0.0, application.transport)
+        await track._fire(1, quantization="1/4")
+        await set_time(1.0, application.transport)
+    assert get_messages(transcript) == [
+        (0.0, NoteOnMessage(pitch=60, velocity=100.0)),
+        (0.25, NoteOffMessage(pitch=60)),
+        (0.25, NoteOnMessage(pitch=62, velocity=100.0)),
+        (0.5, NoteOffMessage(pitch=62)),
+        (0.5, NoteOnMessage(pitch=48, velocity=100.0)),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_4(application):
+    """
+    Stopping inside a performed window releases its notes once it plays out.
+    """
+    track = application.contexts[0].tracks[0]
+    await track.set_clip_lookahead(0.5)
+    with track.capture() as transcript:
+        await track.slots[0].fire()
+        await set_time(0.0, application.transport)
+        await track._stop_clips(application.transport.offset_to_moment(0.125))
+    assert get_messages(transcript) == [
+        (0.0, NoteOnMessage(pitch=60, velocity=100.0)),
+        (0.25, NoteOffMessage(pitch=60)),
+        (0.25, NoteOnMessage(pitch=62, velocity=100.0)),
+        (0.5, NoteOffMessage(pitch=62)),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_5(application):
+    """
+    Changing the lookahead keeps a performed window's launches waiting for it.
+    """
+    track = application.contexts[0].tracks[0]
+    await track.set_clip_lookahead(0.5)
+    with track.capture() as transcript:
+        await track.slots[0].fire()
+        await set_time(0.0, application.transport)
+        await track.set_clip_lookahead(None)
+        await track._fire(1, quantization="1/4")
+        await set_time(1.0, application.transport)
+    assert get_messages(transcript) == [
+        (0.0, NoteOnMessage(pitch=60, velocity=100.0)),
+        (0.25, NoteOffMessage(pitch=60)),
+        (0.25, NoteOnMessage(pitch=62, velocity=100.0)),
+        (0.5, NoteOffMessage(pitch=62)),
+        (0.5, NoteOnMessage(pitch=48, velocity=100.0)),
+    ]
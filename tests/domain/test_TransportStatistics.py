@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from supriya.clocks import AsyncTempoClock
+
+from tloen.domain import Application, Transport
+from tloen.domain.transports import TransportStatistics
+
+
+@pytest.fixture
+async def application(mocker, monkeypatch):
+    async def wait_for_event(self, sleep_time):
+        await asyncio.sleep(0)
+        await self._event.wait()
+
+    monkeypatch.setattr(AsyncTempoClock, "_wait_for_event", wait_for_event)
+    mock_time = mocker.patch.object(AsyncTempoClock, "get_current_time")
+    mock_time.return_value = 0.0
+
+    application = await Application.new(1, 1, 1)
+    yield application
+    if application.transport.is_running:
+        await application.transport.stop()
+
+
+async def set_time(new_time, transport):
+    transport._clock.get_current_time.return_value = new_time
+    transport._clock._event.set()
+    await asyncio.sleep(0.01)
+
+
+def test_1():
+    """
+    Samples are retained in fixed-size ring buffers and binned by lateness.
+    """
+    statistics = TransportStatistics(size=4)
+    for lateness in [0.0, 0.003, 0.5, 0.0015, 0.03, 0.0]:
+        statistics.record_callback(Transport.EventType.CLIP_PERFORM, lateness, 0.001)
+    statistics.record_queue_depth(3)
+    snapshot = statistics.snapshot()
+    assert list(snapshot["event_types"]) == ["CLIP_PERFORM"]
+    lateness = snapshot["event_types"]["CLIP_PERFORM"]["lateness"]
+    assert lateness["count"] == 6
+    assert lateness["max"] == 0.5
+    # only the four most recent samples are retained
+    assert lateness["histogram"] == [1, 1, 0, 0, 0, 1, 0, 1]
+    assert snapshot["queue_depth"] == {"count": 1, "max": 3.0, "mean": 3.0}
+    statistics.clear()
+    assert statistics.snapshot()["event_types"] == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_2(application):
+    """
+    The transport records each callback's lateness against its desired moment.
+    """
+    transport = application.transport
+    for schedule_at in [0.0, 0.25]:
+        await transport.schedule(
+            lambda clock_context: None,
+            event_type=transport.EventType.CLIP_PERFORM,
+            schedule_at=schedule_at,
+        )
+    await transport.start()
+    await set_time(0.0, transport)
+    await set_time(0.75, transport)
+    statistics = transport.statistics
+    assert list(statistics._latenesses[transport.EventType.CLIP_PERFORM]) == [
+        0.0,
+        0.25,
+    ]
+    # each dispatch only counts the events at its own offset
+    assert list(statistics._queue_depths) == [1, 1]
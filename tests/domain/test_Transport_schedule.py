@@ -0,0 +1,178 @@
+import asyncio
+
+import pytest
+from supriya.clocks import AsyncTempoClock
+from supriya.providers import Provider
+
+from tloen.domain import Application
+
+
+@pytest.fixture
+async def application(mocker, monkeypatch):
+    async def wait_for_event(self, sleep_time):
+        await asyncio.sleep(0)
+        await self._event.wait()
+
+    monkeypatch.setattr(AsyncTempoClock, "_wait_for_event", wait_for_event)
+    mock_time = mocker.patch.object(AsyncTempoClock, "get_current_time")
+    mock_time.return_value = 0.0
+
+    application = await Application.new(1, 1, 1)
+    yield application
+    if application.transport.is_running:
+        await application.transport.stop()
+
+
+async def set_time(new_time, transport):
+    transport._clock.get_current_time.return_value = new_time
+    transport._clock._event.set()
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_1(application):
+    """
+    Events sharing a moment dispatch in event type order, then scheduling order.
+    """
+    transport = application.transport
+    calls = []
+
+    def callback(clock_context, label):
+        calls.append((clock_context.desired_moment.offset, label))
+
+    for label, event_type in [
+        ("perform-a", transport.EventType.CLIP_PERFORM),
+        ("note-on", transport.EventType.DEVICE_NOTE_ON),
+        ("launch", transport.EventType.CLIP_LAUNCH),
+        ("perform-b", transport.EventType.CLIP_PERFORM),
+        ("note-off", transport.EventType.DEVICE_NOTE_OFF),
+    ]:
+        await transport.schedule(
+            callback, schedule_at=0.5, event_type=event_type, args=[label]
+        )
+    # one clock event per moment, however many events share it
+    assert len(transport._dispatch_event_ids) == 1
+    await transport.start()
+    await set_time(0.0, transport)
+    assert calls == []
+    await set_time(1.0, transport)
+    assert calls == [
+        (0.5, "note-off"),
+        (0.5, "note-on"),
+        (0.5, "launch"),
+        (0.5, "perform-a"),
+        (0.5, "perform-b"),
+    ]
+    assert not transport._events
+    assert not transport._dispatch_event_ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_2(application):
+    """
+    Cancelled and rescheduled events leave their moment, and returned deltas
+    reschedule events into later moments.
+    """
+    transport = application.transport
+    calls = []
+
+    def callback(clock_context, label):
+        calls.append((clock_context.desired_moment.offset, label))
+        if label == "repeat" and clock_context.desired_moment.offset < 0.5:
+            return 0.25
+
+    cancelled_id = await transport.schedule(callback, schedule_at=0.25, args=["x"])
+    moved_id = await transport.schedule(callback, schedule_at=0.25, args=["moved"])
+    await transport.schedule(callback, schedule_at=0.25, args=["repeat"])
+    await transport.cancel(cancelled_id)
+    assert await transport.reschedule(moved_id, schedule_at=0.5) == moved_id
+    assert await transport.reschedule(cancelled_id, schedule_at=0.5) is None
+    assert sorted(transport._dispatch_event_ids) == [0.25, 0.5]
+    await transport.start()
+    await set_time(2.0, transport)
+    assert calls == [(0.25, "repeat"), (0.5, "moved"), (0.5, "repeat")]
+    assert not transport._events
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_3(application):
+    """
+    Every callback at a moment shares each context's provider moment, so the
+    moment flushes as one bundle per provider.
+    """
+    provider = Provider.nonrealtime()
+    with provider.at():
+        application.primary_context._set(provider=provider)
+    transport = application.transport
+    provider_moments = []
+
+    async def callback(clock_context):
+        track = application.primary_context.tracks[0]
+        async with track.lock([track], seconds=clock_context.desired_moment.seconds):
+            provider_moments.append(provider._moments[-1])
+
+    for event_type in [
+        transport.EventType.CLIP_LAUNCH,
+        transport.EventType.CLIP_PERFORM,
+        transport.EventType.CLIP_PERFORM,
+    ]:
+        await transport.schedule(callback, schedule_at=0.25, event_type=event_type)
+    await transport.start()
+    await set_time(1.0, transport)
+    assert len(provider_moments) == 3
+    assert len(set(map(id, provider_moments))) == 1
+    assert provider_moments[0].seconds == 0.5
+    assert not provider._moments
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_4(application):
+    """
+    Only moments with perform or launch events open the providers' moments.
+    """
+    provider = Provider.nonrealtime()
+    with provider.at():
+        application.primary_context._set(provider=provider)
+    transport = application.transport
+    open_moments = []
+
+    def callback(clock_context):
+        open_moments.append(
+            (clock_context.desired_moment.offset, len(provider._moments))
+        )
+
+    await transport.schedule(callback, schedule_at=0.25)
+    await transport.schedule(
+        callback, schedule_at=0.5, event_type=transport.EventType.CLIP_PERFORM
+    )
+    await transport.start()
+    await set_time(2.0, transport)
+    assert open_moments == [(0.25, 0), (0.5, 1)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_5(application):
+    """
+    Events queued before an offline render survive it and play once the
+    transport starts.
+    """
+    transport = application.transport
+    calls = []
+
+    def callback(clock_context, label):
+        calls.append((clock_context.desired_moment.offset, label))
+
+    await transport.schedule(callback, schedule_at=0.5, args=["queued"])
+    await application.render(1.0)
+    assert calls == []
+    assert [event.offset for event in transport._events.values()] == [0.5]
+    assert list(transport._dispatch_event_ids) == [0.5]
+    await transport.start()
+    await set_time(1.0, transport)
+    assert calls == [(0.5, "queued")]
+    assert not transport._events
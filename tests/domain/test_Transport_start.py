@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from supriya.clocks import AsyncTempoClock
+
+from tloen.domain import Application
+from tloen.domain.transports import TransportTicked
+
+
+@pytest.fixture
+async def application(mocker, monkeypatch):
+    async def wait_for_event(self, sleep_time):
+        await asyncio.sleep(0)
+        await self._event.wait()
+
+    monkeypatch.setattr(AsyncTempoClock, "_wait_for_event", wait_for_event)
+    mock_time = mocker.patch.object(AsyncTempoClock, "get_current_time")
+    mock_time.return_value = 0.0
+
+    application = await Application.new(1, 1, 1)
+    yield application
+    if application.transport.is_running:
+        await application.transport.stop()
+
+
+async def set_time(new_time, transport):
+    transport._clock.get_current_time.return_value = new_time
+    transport._clock._event.set()
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_1(application):
+    """
+    Ticks follow the finest resolution requested, and stop without subscribers.
+    """
+    transport, pubsub = application.transport, application.pubsub
+    coarse, fine = [], []
+    await transport.start()
+    assert transport._tick_event_id is None
+
+    def coarse_procedure(event):
+        coarse.append(event.moment.offset)
+
+    pubsub.subscribe(coarse_procedure, TransportTicked)
+    assert transport._tick_event_id is not None
+    await set_time(0.5, transport)  # four beats per second at 120 bpm
+    assert coarse == [0.25]  # ticks missed by a late clock are coalesced
+    await set_time(0.625, transport)
+    assert coarse == [0.25, 0.3125]
+    fine_procedure = fine.append
+    pubsub.subscribe(fine_procedure, TransportTicked, resolution=8)
+    await set_time(0.75, transport)
+    await set_time(0.8125, transport)
+    assert coarse == [0.25, 0.3125, 0.375, 0.40625]
+    assert [event.moment.offset for event in fine] == [0.375, 0.40625]
+    pubsub.unsubscribe(fine_procedure, TransportTicked)
+    await set_time(0.875, transport)
+    assert coarse == [0.25, 0.3125, 0.375, 0.40625, 0.4375]
+    await set_time(0.9375, transport)
+    assert coarse == [0.25, 0.3125, 0.375, 0.40625, 0.4375]
+    pubsub.unsubscribe(coarse_procedure, TransportTicked)
+    assert transport._tick_event_id is None
+    assert not transport._events
+    await transport.stop()
+    assert not pubsub.watchers
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_2(application):
+    """
+    Ticks are published after the clock finishes the moment's other events.
+    """
+    transport = application.transport
+    ticks, seen = [], []
+
+    def callback(clock_context):
+        seen.append(len(ticks))
+
+    application.pubsub.subscribe(ticks.append, TransportTicked)
+    await transport.schedule(
+        callback, event_type=transport.EventType.CLIP_PERFORM, schedule_at=0.0
+    )
+    await transport.start()
+    await set_time(0.0, transport)
+    assert seen == [0]
+    assert [event.moment.offset for event in ticks] == [0.0]
@@ -14,8 +14,8 @@ class ToggleClipNote(Command):
 
     async def do(self, harness):
         clip: Clip = harness.domain_application.registry[self.clip_uuid]
-        moment = clip._interval_tree.get_moment_at(self.offset)
-        for note in moment.start_intervals:
+        start_notes, _, _, _ = clip.event_table.lookup(self.offset)
+        for note in start_notes:
             if note.pitch == self.pitch:
                 await clip.remove_notes([note])
                 break
@@ -4,6 +4,7 @@ from collections.abc import Mapping
 
 from . import domain, gridui, httpui, pubsub, textui
 from .domain.applications import ApplicationLoaded, ApplicationStatusRefreshed
+from .domain.transports import TransportStatisticsRefreshed
 
 
 class Registry(Mapping):
@@ -120,6 +121,11 @@ class Harness:
             if self.domain_application.status == domain.Application.Status.REALTIME:
                 status = self.domain_application.primary_context.provider.server.status
                 self.pubsub.publish(ApplicationStatusRefreshed(status))
+            transport = self.domain_application.transport
+            if transport.is_running:
+                self.pubsub.publish(
+                    TransportStatisticsRefreshed(transport.statistics.snapshot())
+                )
             await asyncio.sleep(self.update_period)
 
     async def exit(self):
@@ -7,7 +7,19 @@ from .bases import (
     Container,
 )
 from .chains import Chain, ChainContainer, RackDevice, Transfer
-from .clips import Clip, Envelope, Note, NoteMoment, Scene, Slot, Timeline
+from .clips import (
+    ArrayNoteStore,
+    Clip,
+    Envelope,
+    Note,
+    NoteEventTable,
+    NoteMoment,
+    NoteStore,
+    Scene,
+    Slot,
+    Timeline,
+    TreeNoteStore,
+)
 from .contexts import Context
 from .controllers import Controller
 from .devices import DeviceIn, DeviceObject, DeviceOut
@@ -39,6 +51,7 @@ __all__ = [
     "Application",
     "ApplicationObject",
     "Arpeggiator",
+    "ArrayNoteStore",
     "AudioEffect",
     "BasicSampler",
     "BasicSynth",
@@ -66,7 +79,9 @@ __all__ = [
     "Limiter",
     "MasterTrack",
     "Note",
+    "NoteEventTable",
     "NoteMoment",
+    "NoteStore",
     "ParameterObject",
     "Patch",
     "RackDevice",
@@ -80,6 +95,7 @@ __all__ = [
     "TrackContainer",
     "TrackObject",
     "Transfer",
+    "TreeNoteStore",
     "Transport",
     "UserTrackObject",
     "Reverb",
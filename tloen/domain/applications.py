@@ -1,10 +1,23 @@
 import asyncio
+import concurrent.futures
 import dataclasses
 import enum
+import hashlib
+import json
 import pathlib
 from collections import deque
 from types import MappingProxyType
-from typing import Deque, Dict, Mapping, Optional, Tuple, Union
+from typing import (
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 from uuid import UUID
 
 import yaml
@@ -18,9 +31,10 @@ import tloen.domain  # noqa
 from ..bases import Event
 from ..pubsub import PubSub
 from .bases import Container
-from .clips import Scene
+from .clips import Scene, Timeline
 from .contexts import Context
 from .controllers import Controller
+from .synthdefs import build_stem_synthdef
 from .transports import Transport
 
 
@@ -41,11 +55,13 @@ class Application(UniqueTreeTuple):
         self._pubsub = pubsub or PubSub()
         self._status = self.Status.OFFLINE
         self._registry: Dict[UUID, "tloen.domain.ApplicationObject"] = {}
+        self._timeline = Timeline(self)
         # tree objects
         self._contexts = Container(label="Contexts")
         self._controllers = Container(label="Controllers")
         self._scenes = Container(label="Scenes")
         self._transport = Transport()
+        self._transport._dependencies.add(self._timeline)
         UniqueTreeTuple.__init__(
             self,
             children=[self._transport, self._controllers, self._scenes, self._contexts],
@@ -201,21 +217,153 @@ class Application(UniqueTreeTuple):
             for index in reversed(indices):
                 track.slots._remove(track.slots[index])
 
-    async def render(self) -> Session:
+    async def render(
+        self, duration: Optional[float] = None, *, scene: Optional[Scene] = None
+    ) -> Session:
+        """
+        Renders the application into a non-realtime session.
+
+        Given a `duration` in seconds, the transport plays offline from a
+        virtual clock, rendering clips, arpeggiators and automation as fast as
+        they can be computed. Given a `scene`, its clips launch at the start,
+        and `duration` defaults to the scene's longest clip.
+        """
+        from .tracks import Track
+
         if self.status != self.Status.OFFLINE:
             raise ValueError
-        self._status == self.Status.NONREALTIME
+        elif scene is not None and scene not in self.scenes:
+            raise ValueError
+        self._status = self.Status.NONREALTIME
         provider = Provider.nonrealtime()
-        with provider.at():
-            for context in self.contexts:
-                context._set(provider=provider)
-        # Magic happens here
-        with provider.at(provider.session.duration or 10):
-            for context in self.contexts:
-                context._set(provider=None)
-        self._status = self.Status.OFFLINE
+        try:
+            with provider.at():
+                for context in self.contexts:
+                    context._set(provider=provider)
+            if duration is not None or scene is not None:
+                transport = self.transport
+                tracks = [
+                    track
+                    for context in self.contexts
+                    for track in context.tracks.depth_first()
+                    if isinstance(track, Track)
+                ]
+                async with transport._offline():
+                    if scene is not None:
+                        index = self.scenes.index(scene)
+                        clips = [
+                            track.slots[index].clip
+                            for track in tracks
+                            if track.slots[index].clip is not None
+                        ]
+                        for clip in clips:
+                            await clip.parent.fire()
+                        if duration is None:
+                            duration = transport.offset_to_moment(
+                                max((clip.duration for clip in clips), default=0.0)
+                            ).seconds
+                    await transport._advance_offline(duration or 0.0)
+                    moment = transport.seconds_to_moment(duration or 0.0)
+                    for track in tracks:
+                        await track._stop_clips(moment)
+            with provider.at(
+                max(duration or 0.0, provider.session.duration or 0.0) or 10
+            ):
+                for context in self.contexts:
+                    context._set(provider=None)
+        finally:
+            self._status = self.Status.OFFLINE
         return provider.session
 
+    async def render_stems(
+        self,
+        directory_path: Union[str, pathlib.Path],
+        *,
+        stems: Optional[Sequence[Union[Context, "tloen.domain.Track"]]] = None,
+        duration: Optional[float] = None,
+        scene: Optional[Scene] = None,
+        mix_file_path: Optional[Union[str, pathlib.Path]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[UUID, pathlib.Path]:
+        """
+        Renders each of `stems`, contexts or tracks and by default every
+        context, to its own audio file in `directory_path`.
+
+        Stems render in parallel worker processes, each from its own copy of
+        the application in which only the stem sounds. Given a
+        `mix_file_path`, the rendered stems are then mixed down into it, also
+        off the event loop.
+
+        `directory_path` doubles as a render cache: each stem's file is named
+        after a hash of the serialized entities it depends on, so only stems
+        whose clips, devices, parameters or routing changed are re-rendered.
+        """
+        from .tracks import Track
+
+        if self.status != self.Status.OFFLINE:
+            raise ValueError
+        elif scene is not None and scene not in self.scenes:
+            raise ValueError
+        stems = list(self.contexts if stems is None else stems)
+        for stem in stems:
+            if not isinstance(stem, (Context, Track)) or stem.application is not self:
+                raise ValueError(stem)
+        directory_path = pathlib.Path(directory_path)
+        directory_path.mkdir(parents=True, exist_ok=True)
+        data = self.serialize()
+        scene_index = self.scenes.index(scene) if scene is not None else None
+        digests = _hash_stems(
+            data, [stem.uuid for stem in stems], duration, scene_index
+        )
+        manifest_path = directory_path / "stems.yml"
+        manifest: Dict[str, float] = {}
+        if manifest_path.exists():
+            manifest = yaml.safe_load(manifest_path.read_text()) or {}
+        file_paths = {
+            stem.uuid: directory_path / f"{stem.uuid}-{digests[stem.uuid]}.aiff"
+            for stem in stems
+        }
+        dirty_stems = [
+            stem
+            for stem in stems
+            if file_paths[stem.uuid].name not in manifest
+            or not file_paths[stem.uuid].exists()
+        ]
+        loop = asyncio.get_running_loop()
+        with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+            results = await asyncio.gather(
+                *[
+                    loop.run_in_executor(
+                        executor,
+                        _render_stem,
+                        data,
+                        stem.uuid,
+                        file_paths[stem.uuid],
+                        duration,
+                        scene_index,
+                    )
+                    for stem in dirty_stems
+                ]
+            )
+            for stem, (file_path, stem_duration) in zip(dirty_stems, results):
+                # drop the stem's stale renders
+                for old_file_path in directory_path.glob(f"{stem.uuid}-*.aiff"):
+                    if old_file_path != file_path:
+                        old_file_path.unlink()
+                        manifest.pop(old_file_path.name, None)
+                manifest[file_path.name] = stem_duration
+            manifest_path.write_text(yaml.dump(manifest))
+            if mix_file_path is not None:
+                await loop.run_in_executor(
+                    executor,
+                    _mix_stems,
+                    list(file_paths.values()),
+                    pathlib.Path(mix_file_path),
+                    max(manifest[file_path.name] for file_path in file_paths.values()),
+                    self.channel_count,
+                )
+        return file_paths
+
     @classmethod
     def load(cls, file_path: Union[str, pathlib.Path]):
         return cls.deserialize(yaml.safe_load(pathlib.Path(file_path).read_text()))
@@ -240,6 +388,7 @@ class Application(UniqueTreeTuple):
                 "channel_count": self.channel_count,
                 "contexts": [],
                 "scenes": [],
+                "timeline": self.timeline._serialize(),
                 "transport": self.transport._serialize(),
             },
         }
@@ -266,6 +415,7 @@ class Application(UniqueTreeTuple):
         await application.transport._deserialize(
             entity_data["spec"]["transport"], application.transport,
         )
+        await application.timeline._deserialize(entity_data["spec"].get("timeline", {}))
         while entities_data:
             entity_data = entities_data.popleft()
             if entity_data.get("visits", 0) > 2:
@@ -290,6 +440,8 @@ class Application(UniqueTreeTuple):
 
     def set_pubsub(self, pubsub: PubSub):
         self._pubsub = pubsub
+        if self.transport._tick_pubsub is not None:
+            self.transport._watch_ticks(pubsub)
 
     ### PUBLIC PROPERTIES ###
 
@@ -331,11 +483,146 @@ class Application(UniqueTreeTuple):
     def status(self):
         return self._status
 
+    @property
+    def timeline(self) -> Timeline:
+        return self._timeline
+
     @property
     def transport(self) -> Transport:
         return self._transport
 
 
+def _hash_stems(
+    data, stem_uuids: List[UUID], duration: Optional[float], scene_index: Optional[int]
+) -> Dict[UUID, str]:
+    # hashes the serialized entities each stem's render depends on
+    application_data, *entities = data["entities"]
+    entities_by_uuid = {entity["meta"]["uuid"]: entity for entity in entities}
+    children: Dict[Optional[str], List[str]] = {}
+    for entity in entities:
+        children.setdefault(entity["meta"].get("parent"), []).append(
+            entity["meta"]["uuid"]
+        )
+    contexts = set(application_data["spec"].get("contexts", []))
+
+    def subtree(uuid: str) -> Set[str]:
+        uuids, stack = set(), [uuid]
+        while stack:
+            uuids.add(stack[-1])
+            stack.extend(children.get(stack.pop(), []))
+        return uuids
+
+    def top_level_track(uuid: str) -> str:
+        # the context's child whose subtree holds the entity
+        parent = entities_by_uuid[uuid]["meta"].get("parent")
+        while parent is not None and parent not in contexts:
+            uuid, parent = parent, entities_by_uuid[parent]["meta"].get("parent")
+        return uuid
+
+    references = [
+        (entity["meta"]["uuid"], value)
+        for entity in entities
+        for value in entity.get("spec", {}).values()
+        if isinstance(value, str) and value in entities_by_uuid
+    ]
+    shared = dict(application_data["spec"], contexts=None)
+    digests = {}
+    for stem_uuid in map(str, stem_uuids):
+        dependencies = subtree(stem_uuid)
+        uuid = stem_uuid
+        while uuid not in contexts:
+            uuid = entities_by_uuid[uuid]["meta"]["parent"]
+            dependencies.add(uuid)
+            if uuid not in contexts:
+                # an enclosing track's parameters and devices shape the stem,
+                # but its other subtracks don't
+                dependencies |= {
+                    descendant
+                    for child in children.get(uuid, [])
+                    if entities_by_uuid[child]["kind"] != "Track"
+                    for descendant in subtree(child)
+                }
+            else:
+                for key in ("cue_track", "master_track"):
+                    if key in entities_by_uuid[uuid]["spec"]:
+                        dependencies |= subtree(entities_by_uuid[uuid]["spec"][key])
+        # follow sends and receives across tracks until nothing new is reached
+        changed = True
+        while changed:
+            changed = False
+            for source, target in references:
+                for uuid in (source, target):
+                    if (source in dependencies) != (target in dependencies):
+                        if uuid not in dependencies and uuid not in contexts:
+                            dependencies |= subtree(top_level_track(uuid))
+                            changed = True
+        payload = json.dumps(
+            [
+                shared,
+                duration,
+                scene_index,
+                [
+                    entity
+                    for entity in entities
+                    if entity["meta"]["uuid"] in dependencies
+                ],
+            ],
+            sort_keys=True,
+        )
+        digests[UUID(stem_uuid)] = hashlib.sha256(payload.encode()).hexdigest()[:16]
+    return digests
+
+
+def _mix_stems(
+    file_paths: List[pathlib.Path],
+    output_file_path: pathlib.Path,
+    duration: float,
+    channel_count: int,
+):
+    session = Session(output_bus_channel_count=channel_count)
+    synthdef = build_stem_synthdef(channel_count)
+    with session.at(0):
+        for file_path in file_paths:
+            buffer_ = session.add_buffer(file_path=str(file_path))
+            session.add_synth(buffer_id=buffer_, duration=duration, synthdef=synthdef)
+    exit_code, _ = session.render(output_file_path, duration=duration)
+    if exit_code:
+        raise RuntimeError(f"Mixing stems failed: {exit_code}")
+
+
+async def _build_stem_session(
+    data, stem_uuid: UUID, duration: Optional[float], scene_index: Optional[int]
+) -> Session:
+    # renders a copy of the application in which only the stem sounds
+    application = await Application.deserialize(data)
+    stem = application.registry[stem_uuid]
+    if isinstance(stem, Context):
+        context = stem
+    else:
+        context = stem.context
+        await stem.solo()
+    await application.remove_contexts(
+        *(_ for _ in application.contexts if _ is not context)
+    )
+    scene = application.scenes[scene_index] if scene_index is not None else None
+    return await application.render(duration, scene=scene)
+
+
+def _render_stem(
+    data,
+    stem_uuid: UUID,
+    file_path: pathlib.Path,
+    duration: Optional[float],
+    scene_index: Optional[int],
+) -> Tuple[pathlib.Path, float]:
+    # runs in a worker process
+    session = asyncio.run(_build_stem_session(data, stem_uuid, duration, scene_index))
+    exit_code, _ = session.render(file_path)
+    if exit_code:
+        raise RuntimeError(f"Rendering stem {stem_uuid} failed: {exit_code}")
+    return file_path, session.duration
+
+
 @dataclasses.dataclass
 class ApplicationBooting(Event):
     ...
@@ -49,6 +49,10 @@ class AudioEffect(AllocatableDevice):
             **self._build_kwargs(),
         )
 
+    def _plan_allocation(self, plan):
+        super()._plan_allocation(plan)
+        plan.node_count += 1
+
     def _reallocate(self, difference):
         channel_count = self.effective_channel_count
         synth_synth = self._node_proxies.pop("synth")
@@ -1,17 +1,16 @@
 import logging
-from collections import deque
-from contextlib import AsyncExitStack, asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
 from types import MappingProxyType
 from typing import (
     Any,
     Callable,
-    Deque,
     Dict,
     List,
     Mapping,
     NamedTuple,
     Optional,
     Set,
+    Tuple,
     Union,
 )
 
@@ -27,6 +26,7 @@ from supriya.providers import (
     SynthProxy,
 )
 from supriya.querytree import QueryTreeGroup, QueryTreeSynth
+from supriya.realtime import Block
 from supriya.typing import Missing
 from uqbar.containers import UniqueTreeTuple
 
@@ -38,10 +38,18 @@ logger = logging.getLogger("tloen.domain")
 
 class ApplicationObject(UniqueTreeTuple):
 
+    ### CLASS VARIABLES ###
+
+    # bumped whenever any container's items change, which is the only way any
+    # object's position can change
+    _graph_version = 0
+
     ### INITIALIZER ###
 
     def __init__(self, *, name=None):
         self._application: Optional["tloen.domain.Application"] = None
+        self._ancestors: Dict[str, Any] = {}
+        self._graph_order: Tuple[int, Tuple[int, ...]] = (-1, ())
         UniqueTreeTuple.__init__(self, name=name)
         self._cached_state = self._get_state()
 
@@ -108,6 +116,28 @@ class ApplicationObject(UniqueTreeTuple):
                 self._parameter_group._append(new_parameter)
                 self._parameters[new_parameter.name] = new_parameter
 
+    def _get_ancestor(self, key, predicate, *, inclusive=True):
+        # memoized per node and built from the parent's memoized answer, so
+        # repeated lookups stop walking the whole parentage
+        if not inclusive:
+            parent = self.parent
+            if isinstance(parent, ApplicationObject):
+                return parent._get_ancestor(key, predicate)
+            for node in parent.parentage if parent is not None else ():
+                if predicate(node):
+                    return node
+            return None
+        try:
+            return self._ancestors[key]
+        except KeyError:
+            pass
+        if predicate(self):
+            ancestor = self
+        else:
+            ancestor = self._get_ancestor(key, predicate, inclusive=False)
+        self._ancestors[key] = ancestor
+        return ancestor
+
     def _get_state(self):
         index = None
         if self.parent:
@@ -125,6 +155,11 @@ class ApplicationObject(UniqueTreeTuple):
             difference[key] = old_state[key], new_state[key]
         return difference
 
+    def _invalidate_ancestors(self):
+        self._ancestors.clear()
+        for node in self.depth_first(prototype=ApplicationObject):
+            node._ancestors.clear()
+
     def _reconcile(self, **kwargs):
         difference = self._get_state_difference()
         if "application" in difference:
@@ -181,11 +216,18 @@ class ApplicationObject(UniqueTreeTuple):
 
     def _set_items(self, new_items, old_items, start_index, stop_index):
         UniqueTreeTuple._set_items(self, new_items, old_items, start_index, stop_index)
+        ApplicationObject._graph_version += 1
+        Performable._invalidate_routes(self, new_items, old_items)
         for item in new_items:
             item._set(application=self.application)
         for item in old_items:
             item._set(application=None)
 
+    def _set_parent(self, new_parent):
+        UniqueTreeTuple._set_parent(self, new_parent)
+        ApplicationObject._graph_version += 1
+        self._invalidate_ancestors()
+
     ### PUBLIC METHODS ###
 
     @classmethod
@@ -210,10 +252,19 @@ class ApplicationObject(UniqueTreeTuple):
     def context(self) -> Optional["tloen.domain.Context"]:
         from .contexts import Context
 
-        for parent in self.parentage:
-            if isinstance(parent, Context):
-                return parent
-        return None
+        return self._get_ancestor("context", lambda x: isinstance(x, Context))
+
+    @property
+    def graph_order(self) -> Tuple[int, ...]:
+        version, graph_order = self._graph_order
+        if version != ApplicationObject._graph_version:
+            parent = self.parent
+            if isinstance(parent, ApplicationObject):
+                graph_order = parent.graph_order + (parent.index(self),)
+            else:
+                graph_order = UniqueTreeTuple.graph_order.fget(self)
+            self._graph_order = ApplicationObject._graph_version, graph_order
+        return graph_order
 
     @property
     def label(self):
@@ -308,9 +359,28 @@ class Allocatable(ApplicationObject):
         )
         self.node_proxy.move(add_action=add_action, target_node=target_node)
 
+    def _plan_allocation(self, plan):
+        pass
+
     def _reallocate(self, difference):
         self._debug_tree(self, "Reallocating")
 
+    def _reindex_children(self, skipped_items=()):
+        # children shifted by an insertion or removal keep their node order,
+        # so only their cached index and the sends below them need updating
+        from .sends import SendObject
+
+        for index, child in enumerate(self):
+            if child in skipped_items or child._cached_state["index"] == index:
+                continue
+            if isinstance(child, SendObject):
+                child._reconcile()
+                continue
+            child._cached_state["index"] = index
+            if isinstance(child, Allocatable) and child.provider:
+                child._reconcile_children({"index": (None, index)})
+                child._reconcile_dependents()
+
     def _reconcile(
         self,
         target_node: Optional[NodeProxy] = None,
@@ -326,26 +396,30 @@ class Allocatable(ApplicationObject):
                 for child in self:
                     child._set(provider=None, dispose_only=True)
             if new_provider:
-                for parameter in getattr(self, "parameters", {}).values():
-                    parameter._preallocate(new_provider, self)
-                self._allocate(new_provider, target_node, add_action)
-                target_node, add_action = self.node_proxy, AddAction.ADD_TO_HEAD
-                for child in self:
-                    child._set(
-                        provider=new_provider,
-                        target_node=target_node,
-                        add_action=add_action,
-                    )
-                    if isinstance(child, Allocatable) and child.node_proxy is not None:
-                        target_node, add_action = child.node_proxy, AddAction.ADD_AFTER
+                with AllocationPlan.reserve(self, new_provider):
+                    for parameter in getattr(self, "parameters", {}).values():
+                        parameter._preallocate(new_provider, self)
+                    self._allocate(new_provider, target_node, add_action)
+                    target_node, add_action = self.node_proxy, AddAction.ADD_TO_HEAD
+                    for child in self:
+                        child._set(
+                            provider=new_provider,
+                            target_node=target_node,
+                            add_action=add_action,
+                        )
+                        if (
+                            isinstance(child, Allocatable)
+                            and child.node_proxy is not None
+                        ):
+                            target_node = child.node_proxy
+                            add_action = AddAction.ADD_AFTER
             self._reconcile_dependents()
         elif self.provider:
             if "index" in difference or "parent" in difference:
                 self._move(target_node, add_action)
             if "channel_count" in difference:
                 self._reallocate(difference)
-            for child in self:
-                child._reconcile()
+            self._reconcile_children(difference)
             self._reconcile_dependents()
         if "application" in difference:
             old_application, new_application = difference.pop("application")
@@ -356,6 +430,26 @@ class Allocatable(ApplicationObject):
             for child in self:
                 child._set(application=new_application)
 
+    def _reconcile_children(self, difference):
+        # children inherit channel counts, and sends into or out of a moved
+        # subtree may change feedback, but nothing else below depends on this
+        # node's state, so unchanged subtrees aren't revisited
+        from .sends import SendObject
+
+        if "channel_count" in difference:
+            for child in self:
+                child._reconcile()
+        elif "index" in difference or "parent" in difference:
+            for node in self.depth_first(prototype=Allocatable):
+                if not isinstance(node, SendObject):
+                    node._reconcile_dependents()
+                elif not all(
+                    anchor is not None and self in anchor.parentage
+                    for anchor in (node.source_anchor, node.target_anchor)
+                ):
+                    # sends within the subtree keep their relative order
+                    node._reconcile()
+
     def _reconcile_dependents(self):
         pass
 
@@ -376,6 +470,7 @@ class Allocatable(ApplicationObject):
             self._provider = provider
         if not isinstance(channel_count, Missing):
             self._channel_count = channel_count
+            self._invalidate_ancestors()
         self._reconcile(target_node=target_node, add_action=add_action, **kwargs)
 
     def _collect_for_cleanup(self, new_items, old_items):
@@ -392,7 +487,14 @@ class Allocatable(ApplicationObject):
                 if start_index:
                     target_node, add_action = self[start_index], AddAction.ADD_AFTER
         to_cleanup = self._collect_for_cleanup(new_items, old_items)
+        old_parents = {
+            item.parent for item in new_items if item.parent not in (None, self)
+        }
         UniqueTreeTuple._set_items(self, new_items, old_items, start_index, stop_index)
+        ApplicationObject._graph_version += 1
+        Performable._invalidate_routes(self, new_items, old_items)
+        for container in (self, *old_parents):
+            container._reindex_children(skipped_items=new_items)
         for item in new_items:
             item._set(
                 application=self.application,
@@ -417,9 +519,18 @@ class Allocatable(ApplicationObject):
             providers = set()
             for object_ in objects:
                 provider = getattr(object_, "provider", None)
-                if provider is not None and provider not in providers:
+                if provider is None or provider in providers:
+                    continue
+                providers.add(provider)
+                if provider.session is None:
                     await exit_stack.enter_async_context(provider.at(seconds))
-                    providers.add(provider)
+                # non-realtime moments only open their session moment when
+                # entered synchronously, and exiting a re-entered moment would
+                # close the session moment beneath it
+                elif not (
+                    provider._moments and provider._moments[-1].seconds == seconds
+                ):
+                    exit_stack.enter_context(provider.at(seconds))
             yield
 
     async def query(self):
@@ -473,10 +584,15 @@ class Allocatable(ApplicationObject):
 
     @property
     def effective_channel_count(self) -> int:
-        for object_ in self.parentage:
-            channel_count = getattr(object_, "channel_count", None)
-            if channel_count:
-                return channel_count
+        if self.channel_count:
+            return self.channel_count
+        ancestor = self._get_ancestor(
+            "channel_count",
+            lambda x: getattr(x, "channel_count", None),
+            inclusive=False,
+        )
+        if ancestor is not None:
+            return ancestor.channel_count
         return 2
 
     @property
@@ -500,6 +616,135 @@ class Allocatable(ApplicationObject):
         return self._provider
 
 
+class AllocationPlan:
+    """
+    Counts the node IDs and bus channels allocating a subtree takes.
+
+    While reserved, every node ID and bus the subtree allocates is drawn from
+    one block per server allocator, instead of from the allocators one at a
+    time.
+    """
+
+    ### INITIALIZER ###
+
+    def __init__(self):
+        self.node_count = 0
+        self.audio_channel_count = 0
+        self.control_channel_count = 0
+
+    ### PUBLIC METHODS ###
+
+    @classmethod
+    def from_tree(cls, root: Allocatable) -> "AllocationPlan":
+        plan = cls()
+        root._plan_allocation(plan)
+        for node in root.depth_first(prototype=Allocatable):
+            node._plan_allocation(plan)
+        return plan
+
+    @classmethod
+    @contextmanager
+    def reserve(cls, root: Allocatable, provider: Provider):
+        server = provider.server
+        # non-realtime providers allocate from their session, and a subtree
+        # allocated within another shares the enclosing reservation
+        if server is None or isinstance(server.node_id_allocator, _NodeIdReservation):
+            yield None
+            return
+        plan = cls.from_tree(root)
+        reservations = {
+            "_node_id_allocator": _NodeIdReservation(
+                server.node_id_allocator, plan.node_count
+            ),
+            "_audio_bus_allocator": _BusReservation(
+                server.audio_bus_allocator, plan.audio_channel_count
+            ),
+            "_control_bus_allocator": _BusReservation(
+                server.control_bus_allocator, plan.control_channel_count
+            ),
+        }
+        for name, reservation in reservations.items():
+            setattr(server, name, reservation)
+        try:
+            yield plan
+        finally:
+            for name, reservation in reservations.items():
+                setattr(server, name, reservation.allocator)
+                reservation.release()
+
+
+class _BusReservation:
+    """
+    Hands out bus channels from one reserved block, falling back to the
+    allocator once the block runs out.
+    """
+
+    def __init__(self, allocator, channel_count: int):
+        self.allocator = allocator
+        self.blocks: Dict[int, int] = {}
+        self.freed: List[int] = []
+        self.start = allocator.allocate(channel_count) if channel_count else None
+        self.cursor = self.start
+        self.stop = None if self.start is None else self.start + channel_count
+
+    def __getattr__(self, name):
+        return getattr(self.allocator, name)
+
+    def allocate(self, desired_block_size=1):
+        if self.start is None or self.cursor + desired_block_size > self.stop:
+            return self.allocator.allocate(desired_block_size)
+        block_id, self.cursor = self.cursor, self.cursor + desired_block_size
+        self.blocks[block_id] = self.cursor
+        return block_id
+
+    def free(self, block_id):
+        if int(block_id) in self.blocks:
+            self.freed.append(int(block_id))
+        else:
+            self.allocator.free(block_id)
+
+    def release(self):
+        if self.start is None:
+            return
+        # split the reserved block into the blocks handed out, so each frees
+        # on its own, and give back whatever went unused
+        blocks = [Block(start, stop, used=True) for start, stop in self.blocks.items()]
+        if self.cursor < self.stop:
+            blocks.append(Block(self.cursor, self.stop, used=True))
+            self.freed.append(self.cursor)
+        used_heap = self.allocator._used_heap
+        with self.allocator._lock:
+            used_heap.remove(used_heap.find_intervals_starting_at(self.start)[0])
+            used_heap.update(blocks)
+        for block_id in self.freed:
+            self.allocator.free(block_id)
+
+
+class _NodeIdReservation:
+    """
+    Hands out node IDs from one reserved range, falling back to the allocator
+    once the range runs out.
+    """
+
+    def __init__(self, allocator, node_count: int):
+        self.allocator = allocator
+        self.next_id = allocator.allocate_node_id(node_count) if node_count else 0
+        self.stop_id = self.next_id + node_count
+
+    def __getattr__(self, name):
+        return getattr(self.allocator, name)
+
+    def allocate_node_id(self, count=1):
+        if self.next_id + count > self.stop_id:
+            return self.allocator.allocate_node_id(count)
+        node_id, self.next_id = self.next_id, self.next_id + count
+        return node_id
+
+    def release(self):
+        # node IDs are never reused, so unused ones are simply skipped
+        pass
+
+
 class Container(ApplicationObject):
 
     ### INITIALIZER ###
@@ -562,6 +807,9 @@ class AllocatableContainer(Allocatable):
             target_node=target_node, add_action=self.add_action, name=self.label
         )
 
+    def _plan_allocation(self, plan):
+        plan.node_count += 1
+
     ### PUBLIC PROPERTIES ###
 
     @property
@@ -625,25 +873,33 @@ class Performable(ApplicationObject):
         self._input_pitches: Dict[float, List[float]] = {}
         self._output_pitches: Set[float] = set()
         self._captures: Set["Performable.Capture"] = set()
+        self._next_performer_is_stale = True
+        self._next_performer_cache: Optional[Callable] = None
 
     ### PRIVATE METHODS ###
 
+    @classmethod
+    def _invalidate_routes(cls, container, new_items, old_items):
+        # a mutation only reroutes the container's children and moved subtrees
+        nodes = list(container)
+        for item in (*new_items, *old_items):
+            nodes.append(item)
+            nodes.extend(item.depth_first())
+        for node in nodes:
+            if isinstance(node, Performable):
+                node._next_performer_is_stale = True
+
     def _next_performer(self) -> Optional[Callable]:
-        if self.parent is None:
-            return None
-        index = self.parent.index(self)
-        if index < len(self.parent) - 1:
-            return self.parent[index + 1]._perform_input
-        for parent in self.parentage[1:]:
-            if parent is None:
-                return None
-            elif hasattr(parent, "_perform_output"):
-                return parent._perform_output
-        return None
+        if self._next_performer_is_stale:
+            self._next_performer_cache = self._route()
+            self._next_performer_is_stale = False
+        return self._next_performer_cache
 
     def _perform_input(self, moment, midi_messages):
+        captures = self._captures
         for message in midi_messages:
-            self._update_captures(moment, message, "I")
+            if captures:
+                self._update_captures(moment, message, "I")
             if isinstance(message, NoteOnMessage):
                 self._input_pitches[message.pitch] = [message.pitch]
             elif (
@@ -654,33 +910,60 @@ class Performable(ApplicationObject):
         return self._perform_output, midi_messages
 
     def _perform_output(self, moment, midi_messages):
-        next_performer = self._next_performer()
+        # filters the batch in place, as no other performer holds it by now
+        captures, output_pitches, index = self._captures, self._output_pitches, 0
         for message in midi_messages:
-            self._update_captures(moment, message, "O")
+            if captures:
+                self._update_captures(moment, message, "O")
             if isinstance(message, NoteOnMessage):
-                if message.pitch in self._output_pitches:
+                if message.pitch in output_pitches:
                     continue
-                else:
-                    self._output_pitches.add(message.pitch)
+                output_pitches.add(message.pitch)
             elif isinstance(message, NoteOffMessage):
-                if message.pitch not in self._output_pitches:
+                if message.pitch not in output_pitches:
                     continue
-                else:
-                    self._output_pitches.remove(message.pitch)
-            yield next_performer, [message]
+                output_pitches.remove(message.pitch)
+            midi_messages[index] = message
+            index += 1
+        del midi_messages[index:]
+        yield self._next_performer(), midi_messages
 
     @classmethod
     def _perform_loop(cls, moment, performer, midi_messages):
-        stack: Deque = deque()
-        stack.append((performer, midi_messages))
-        out_messages = []
-        while stack:
-            in_performer, in_messages = stack.popleft()
+        # breadth-first, each performer handling its whole batch at once
+        queue: List[Tuple[Callable, List[MidiMessage]]] = [
+            (performer, list(midi_messages))
+        ]
+        out_messages: List[MidiMessage] = []
+        index = 0
+        while index < len(queue):
+            in_performer, in_messages = queue[index]
+            index += 1
             for out_performer, out_messages in in_performer(moment, in_messages):
                 if out_messages and out_performer is not None:
-                    stack.append((out_performer, out_messages))
+                    queue.append((out_performer, out_messages))
         return out_messages
 
+    def _route(self) -> Optional[Callable]:
+        if self.parent is None:
+            return None
+        index = self.parent.index(self)
+        if index < len(self.parent) - 1:
+            return self.parent[index + 1]._perform_input
+        for parent in self.parentage[1:]:
+            if parent is None:
+                return None
+            elif hasattr(parent, "_perform_output"):
+                return parent._perform_output
+        return None
+
+    def _set_parent(self, new_parent):
+        # moving into another container never mutates the one left behind
+        old_parent = self.parent
+        ApplicationObject._set_parent(self, new_parent)
+        if old_parent is not None and old_parent is not new_parent:
+            Performable._invalidate_routes(old_parent, (), ())
+
     def _update_captures(self, moment, message, label):
         if not self._captures:
             return
@@ -1,5 +1,5 @@
 import dataclasses
-from typing import Optional
+from typing import Callable, Dict, List, Optional
 from uuid import UUID
 
 from supriya.enums import AddAction, CalculationRate
@@ -100,11 +100,18 @@ class Chain(UserTrackObject):
         )
         if self.devices:
             next_performer = self.devices[0]._perform_input
+        # the rack shares its batch across chains, so transfer into a new one
+        out_messages = []
         for message in midi_messages:
             out_message = self.transfer(message)
-            if out_message is None:
-                continue
-            yield next_performer, [out_message]
+            if out_message is not None:
+                out_messages.append(out_message)
+        yield next_performer, out_messages
+
+    def _route(self):
+        # chains play side by side, so each one outputs to its rack
+        mixer = self.mixer
+        return mixer._perform_output if mixer is not None else None
 
     def _serialize(self):
         serialized, auxiliary_entities = super()._serialize()
@@ -112,15 +119,16 @@ class Chain(UserTrackObject):
         return serialized, auxiliary_entities
 
     def _set_parent(self, new_parent):
-        if self.is_soloed:
-            mixer = self.mixer
-            if mixer is not None:
-                mixer._soloed_tracks.remove(self)
+        old_mixer = self.mixer
+        if self.is_soloed and old_mixer is not None:
+            old_mixer._soloed_tracks.remove(self)
         UserTrackObject._set_parent(self, new_parent)
-        if self.is_soloed:
-            mixer = self.mixer
-            if mixer is not None:
-                mixer._soloed_tracks.add(self)
+        new_mixer = self.mixer
+        if self.is_soloed and new_mixer is not None:
+            new_mixer._soloed_tracks.add(self)
+        for mixer in (old_mixer, new_mixer):
+            if isinstance(mixer, RackDevice):
+                mixer._performers_by_pitch = None
 
     @classmethod
     def _update_activation(cls, object_):
@@ -160,6 +168,13 @@ class Chain(UserTrackObject):
         async with self.lock([self, container]):
             container.chains._mutate(slice(position, position), [self])
 
+    async def set_transfer(self, transfer: Transfer):
+        async with self.lock([self]):
+            self._transfer = transfer
+            mixer = self.mixer
+            if isinstance(mixer, RackDevice):
+                mixer._performers_by_pitch = None
+
     async def solo(self, exclusive=True):
         async with self.lock([self]):
             if self.is_soloed:
@@ -236,6 +251,9 @@ class RackDevice(DeviceObject, Mixer):
         Mixer.__init__(self)
         self._chains = ChainContainer("input", AddAction.ADD_AFTER)
         self._send_target = Target(label="SendTarget")
+        # chain performers by the note pitch their transfers accept, with
+        # None for any other pitch, rebuilt when chains or transfers change
+        self._performers_by_pitch: Optional[Dict[Optional[int], List[Callable]]] = None
         self._mutate(
             slice(None), [self._parameter_group, self._chains, self._send_target]
         )
@@ -305,16 +323,44 @@ class RackDevice(DeviceObject, Mixer):
     def _cleanup(self):
         Chain._update_activation(self)
 
+    def _get_performers_by_pitch(self) -> Dict[Optional[int], List[Callable]]:
+        if self._performers_by_pitch is None:
+            pitches = {chain.transfer.in_pitch for chain in self.chains}
+            self._performers_by_pitch = {
+                pitch: [
+                    chain._perform_input
+                    for chain in self.chains
+                    if chain.transfer.in_pitch in (None, pitch)
+                ]
+                for pitch in pitches | {None}
+            }
+        return self._performers_by_pitch
+
     def _perform_input(self, moment, midi_messages):
         next_performer, midi_messages = Performable._perform_input(
             self, moment, midi_messages,
         )
-        performers = [next_performer]
-        if self.chains:
-            performers = [chain._perform_input for chain in self.chains]
+        if not self.chains:
+            yield next_performer, midi_messages
+            return
+        performers_by_pitch = self._get_performers_by_pitch()
+        wildcard_performers = performers_by_pitch[None]
+        performers = [chain._perform_input for chain in self.chains]
         for message in midi_messages:
-            for performer in performers:
-                yield performer, [message]
+            # each message fans out to its chains before the next one does
+            batch = [message]
+            if isinstance(message, (NoteOnMessage, NoteOffMessage)):
+                for performer in performers_by_pitch.get(
+                    message.pitch, wildcard_performers
+                ):
+                    yield performer, batch
+            else:
+                for performer in performers:
+                    yield performer, batch
+
+    def _plan_allocation(self, plan):
+        plan.node_count += 3
+        plan.audio_channel_count += self.effective_channel_count
 
     def _reallocate(self, difference):
         channel_count = self.effective_channel_count
@@ -1,15 +1,46 @@
+import abc
+import array
+import bisect
 import dataclasses
+import enum
+import weakref
 from collections import deque
-from typing import Optional, Tuple
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 from uuid import UUID, uuid4
 
 from supriya.clocks import TimeUnit
-from supriya.intervals import IntervalTree
+from supriya.intervals import Interval, IntervalTree
 
-from tloen.midi import NoteOffMessage, NoteOnMessage
+import tloen.domain  # noqa
+from tloen.midi import (
+    MidiFileTrack,
+    NoteOffMessage,
+    NoteOnMessage,
+    read_midi_file,
+    write_midi_file,
+)
 
 from ..bases import Event
 from .bases import ApplicationObject
+from .parameters import BusParameter
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
 
 
 @dataclasses.dataclass(frozen=True, order=True)
@@ -32,7 +63,7 @@ class Note:
         )
 
     def transpose(self, transposition):
-        return dataclasses.replace(self, self.pitch + transposition)
+        return dataclasses.replace(self, pitch=self.pitch + transposition)
 
     def translate(self, start_translation=None, stop_translation=None):
         start_offset = self.start_offset + (start_translation or 0)
@@ -66,63 +97,189 @@ class NoteMoment:
         ]
 
 
-class Envelope:
+class NoteEventTable(NamedTuple):
     """
-    An automation envelope, in a Clip or Timeline.
+    A compiled, immutable lookup table of a clip's note boundaries.
+
+    Boundary offsets are stored in ascending order, alongside the notes
+    starting, stopping and overlapping at each boundary, and the notes sounding
+    in the open interval following each boundary.
     """
 
-    pass
+    offsets: Tuple[float, ...] = ()
+    start_notes: Tuple[Tuple[Note, ...], ...] = ()
+    stop_notes: Tuple[Tuple[Note, ...], ...] = ()
+    overlap_notes: Tuple[Tuple[Note, ...], ...] = ()
+    sustain_notes: Tuple[Tuple[Note, ...], ...] = ()
 
+    @classmethod
+    def from_notes(cls, notes: Iterable[Note]) -> "NoteEventTable":
+        starts_by_offset = {}
+        stops_by_offset = {}
+        for note in sorted(notes):
+            starts_by_offset.setdefault(note.start_offset, []).append(note)
+            stops_by_offset.setdefault(note.stop_offset, []).append(note)
+        offsets = sorted(set(starts_by_offset).union(stops_by_offset))
+        start_notes, stop_notes, overlap_notes, sustain_notes = [], [], [], []
+        sounding = set()
+        for offset in offsets:
+            stopping = stops_by_offset.get(offset, ())
+            starting = starts_by_offset.get(offset, ())
+            for note in stopping:
+                sounding.discard(note)
+            overlapping = tuple(sorted(sounding))
+            for note in starting:
+                sounding.add(note)
+            start_notes.append(tuple(starting))
+            stop_notes.append(tuple(stopping))
+            overlap_notes.append(overlapping)
+            sustain_notes.append(tuple(sorted(sounding)))
+        return cls(
+            offsets=tuple(offsets),
+            start_notes=tuple(start_notes),
+            stop_notes=tuple(stop_notes),
+            overlap_notes=tuple(overlap_notes),
+            sustain_notes=tuple(sustain_notes),
+        )
 
-class ClipObject(ApplicationObject):
+    def lookup(
+        self, offset: float
+    ) -> Tuple[List[Note], List[Note], List[Note], Optional[float]]:
+        """
+        Gets start, stop and overlap notes at `offset`, and the next boundary
+        offset after `offset`, if any.
+        """
+        offsets = self.offsets
+        index = bisect.bisect_left(offsets, offset)
+        if index < len(offsets) and offsets[index] == offset:
+            start_notes = list(self.start_notes[index])
+            stop_notes = list(self.stop_notes[index])
+            overlap_notes = list(self.overlap_notes[index])
+            index += 1
+        else:
+            start_notes, stop_notes = [], []
+            overlap_notes = list(self.sustain_notes[index - 1]) if index else []
+        next_offset = offsets[index] if index < len(offsets) else None
+        return start_notes, stop_notes, overlap_notes, next_offset
+
+
+class NoteStore(abc.ABC):
+    """
+    Storage for a clip's notes.
 
-    ### INITIALIZER ###
+    Adding notes resolves overlaps between notes of the same pitch: notes
+    starting together merge, and later notes mask or truncate earlier ones.
 
-    def __init__(self, *, name=None, uuid=None):
-        ApplicationObject.__init__(self, name=name)
-        self._uuid = uuid or uuid4()
+    A store may be shared by several clips, which copy it before editing.
+    """
 
     ### INITIALIZER ###
 
-    def at(self, offset, start_delta=0.0, force_stop=False):
-        pass
+    def __init__(self):
+        self._owners: "weakref.WeakSet[Clip]" = weakref.WeakSet()
+        self._sorted_notes: Optional[List[Note]] = None
+
+    ### SPECIAL METHODS ###
+
+    @abc.abstractmethod
+    def __iter__(self) -> Iterator[Note]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    ### PUBLIC METHODS ###
+
+    @abc.abstractmethod
+    def add(self, notes: Iterable[Note]) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def copy(self) -> "NoteStore":
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def find_between_offsets(
+        self, start_offset: Optional[float] = None, stop_offset: Optional[float] = None
+    ) -> List[Note]:
+        """
+        Finds notes starting at or after `start_offset` and stopping at or
+        before `stop_offset`.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def find_with_pitches(self, pitches: Iterable[float]) -> List[Note]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def remove(self, notes: Iterable[Note]) -> None:
+        raise NotImplementedError
 
     ### PUBLIC PROPERTIES ###
 
     @property
-    def uuid(self):
-        return self._uuid
+    def notes(self) -> List[Note]:
+        if self._sorted_notes is None:
+            self._sorted_notes = sorted(self)
+        return self._sorted_notes
 
+    @property
+    def is_shared(self) -> bool:
+        return len(self._owners) > 1
 
-class Clip(ClipObject):
+    @property
+    @abc.abstractmethod
+    def pitches(self) -> List[float]:
+        raise NotImplementedError
+
+
+class TreeNoteStore(NoteStore):
+    """
+    Interval-tree-backed note storage.
+
+    Alongside the interval tree, each pitch keeps its notes in a list sorted by
+    start offset. Notes of the same pitch never overlap, so a new note can only
+    mask or truncate the old notes found between its neighbours in that list.
+    """
 
     ### INITIALIZER ###
 
-    def __init__(
-        self, *, duration=4 / 4, is_looping=True, name=None, notes=None, uuid=None
-    ):
-        ClipObject.__init__(self, name=name, uuid=uuid)
-        self._duration = float(duration)
-        self._is_looping = is_looping
-        self._is_playing = False
-        self._start_delta = 0.0
+    def __init__(self):
+        NoteStore.__init__(self)
         self._interval_tree = IntervalTree()
-        self._add_notes(notes or [])
+        self._notes_by_pitch: Dict[float, List[Note]] = {}
+        self._start_offsets_by_pitch: Dict[float, List[float]] = {}
 
     ### SPECIAL METHODS ###
 
-    def __str__(self):
-        obj_name = type(self).__name__
-        return "\n".join(
-            [
-                f"<{obj_name} {self.uuid}>",
-                *(f"    {line}" for child in self for line in str(child).splitlines()),
-            ]
-        )
+    def __iter__(self) -> Iterator[Note]:
+        return iter(self._interval_tree)
+
+    def __len__(self) -> int:
+        return len(self._interval_tree)
 
     ### PRIVATE METHODS ###
 
-    def _add_notes(self, notes):
+    def _index_add(self, note: Note) -> None:
+        start_offsets = self._start_offsets_by_pitch.setdefault(note.pitch, [])
+        index = bisect.bisect_left(start_offsets, note.start_offset)
+        start_offsets.insert(index, note.start_offset)
+        self._notes_by_pitch.setdefault(note.pitch, []).insert(index, note)
+
+    def _index_remove(self, note: Note) -> None:
+        start_offsets = self._start_offsets_by_pitch[note.pitch]
+        index = bisect.bisect_left(start_offsets, note.start_offset)
+        del start_offsets[index]
+        del self._notes_by_pitch[note.pitch][index]
+        if not start_offsets:
+            del self._start_offsets_by_pitch[note.pitch]
+            del self._notes_by_pitch[note.pitch]
+
+    ### PUBLIC METHODS ###
+
+    def add(self, notes: Iterable[Note]) -> None:
         def validate_new_notes(new_notes):
             validated_new_notes = [new_notes.popleft()]
             while new_notes:
@@ -151,53 +308,646 @@ class Clip(ClipObject):
                 validated_new_notes.append(current_note)
             return validated_new_notes
 
-        def invalidate_old_notes(new_notes, old_notes):
-            invalidated_old_notes = []
+        def invalidate_old_notes(new_notes, pitch):
+            invalidated_old_notes = {}
             truncated_old_notes = []
-            if not old_notes:
+            start_offsets = self._start_offsets_by_pitch.get(pitch)
+            if not start_offsets:
                 return invalidated_old_notes, truncated_old_notes
-            iterator = iter(new_notes)
-            new_note = next(iterator)
-            for old_note in old_notes:
-                while new_note.stop_offset <= old_note.start_offset:
-                    try:
-                        new_note = next(iterator)
-                    except StopIteration:
-                        return invalidated_old_notes, truncated_old_notes
-                if (
-                    new_note.start_offset
-                    <= old_note.start_offset
-                    < new_note.stop_offset
-                ):
-                    invalidated_old_notes.append(old_note)
-                elif (
-                    old_note.start_offset < new_note.start_offset < old_note.stop_offset
-                ):
-                    invalidated_old_notes.append(old_note)
-                    truncated_old_notes.append(
-                        dataclasses.replace(old_note, stop_offset=new_note.start_offset)
-                    )
+            old_notes = self._notes_by_pitch[pitch]
+            for new_note in new_notes:
+                index = bisect.bisect_left(start_offsets, new_note.start_offset)
+                # the preceding old note may extend past the new note's start
+                if index:
+                    old_note = old_notes[index - 1]
+                    if (
+                        new_note.start_offset < old_note.stop_offset
+                        and old_note not in invalidated_old_notes
+                    ):
+                        invalidated_old_notes[old_note] = None
+                        truncated_old_notes.append(
+                            dataclasses.replace(
+                                old_note, stop_offset=new_note.start_offset
+                            )
+                        )
+                # old notes starting under the new note are masked
+                stop_index = bisect.bisect_left(start_offsets, new_note.stop_offset)
+                for old_note in old_notes[index:stop_index]:
+                    invalidated_old_notes[old_note] = None
             return invalidated_old_notes, truncated_old_notes
 
-        self._debug_tree(self, "Editing")
         to_add = []
         to_remove = []
         new_notes_by_pitch = {}
         for note in sorted(notes):
             new_notes_by_pitch.setdefault(note.pitch, deque()).append(note)
-        old_notes_by_pitch = {}
-        for note in self._interval_tree:
-            old_notes_by_pitch.setdefault(note.pitch, []).append(note)
         for pitch, new_notes in new_notes_by_pitch.items():
             validated_new_notes = validate_new_notes(new_notes)
             invalidated_old_notes, truncated_old_notes = invalidate_old_notes(
-                validated_new_notes, old_notes_by_pitch.get(pitch, [])
+                validated_new_notes, pitch
             )
             to_add.extend(validated_new_notes)
             to_add.extend(truncated_old_notes)
             to_remove.extend(invalidated_old_notes)
-        self._remove_notes(to_remove)
+        self.remove(to_remove)
         self._interval_tree.update(to_add)
+        for note in to_add:
+            self._index_add(note)
+        self._sorted_notes = None
+
+    def copy(self) -> "TreeNoteStore":
+        note_store = type(self)()
+        note_store._interval_tree.update(self._interval_tree)
+        for pitch, notes in self._notes_by_pitch.items():
+            note_store._notes_by_pitch[pitch] = notes[:]
+            note_store._start_offsets_by_pitch[pitch] = self._start_offsets_by_pitch[
+                pitch
+            ][:]
+        note_store._sorted_notes = self._sorted_notes
+        return note_store
+
+    def find_between_offsets(
+        self, start_offset: Optional[float] = None, stop_offset: Optional[float] = None
+    ) -> List[Note]:
+        if not len(self):
+            return []
+        if start_offset is None:
+            start_offset = self._interval_tree.start_offset
+        if stop_offset is None:
+            stop_offset = self._interval_tree.stop_offset
+        if stop_offset <= start_offset:
+            return []
+        return [
+            note
+            for note in self._interval_tree.find_intersection(
+                Interval(start_offset, stop_offset)
+            )
+            if start_offset <= note.start_offset and note.stop_offset <= stop_offset
+        ]
+
+    def find_with_pitches(self, pitches: Iterable[float]) -> List[Note]:
+        return [
+            note for pitch in pitches for note in self._notes_by_pitch.get(pitch, ())
+        ]
+
+    def remove(self, notes: Iterable[Note]) -> None:
+        for note in notes:
+            self._interval_tree.remove(note)
+            self._index_remove(note)
+        self._sorted_notes = None
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def pitches(self) -> List[float]:
+        return sorted(self._notes_by_pitch)
+
+
+class ArrayNoteStore(NoteStore):
+    """
+    Structure-of-arrays note storage, backed by NumPy.
+
+    Start offsets, stop offsets, pitches and velocities live in parallel
+    columns, ordered by pitch and then start offset. Because notes of the same
+    pitch never overlap, each pitch's rows form a contiguous run of ascending,
+    unique start offsets, which lets overlap resolution and removal run as
+    array operations per pitch rather than per note.
+    """
+
+    ### INITIALIZER ###
+
+    def __init__(self):
+        if numpy is None:
+            raise RuntimeError("Array-backed note storage requires NumPy")
+        NoteStore.__init__(self)
+        self._start_offsets = numpy.empty(0)
+        self._stop_offsets = numpy.empty(0)
+        self._pitches = numpy.empty(0)
+        self._velocities = numpy.empty(0)
+
+    ### SPECIAL METHODS ###
+
+    def __iter__(self) -> Iterator[Note]:
+        return iter(self.notes)
+
+    def __len__(self) -> int:
+        return len(self._pitches)
+
+    ### PRIVATE METHODS ###
+
+    def _find_rows(self, notes):
+        # a mask of the rows holding `notes`, each of which must be stored
+        notes = sorted(notes, key=lambda note: (note.pitch, note.start_offset))
+        rows = numpy.zeros(len(self), dtype=bool)
+        start_offsets = numpy.fromiter(
+            (note.start_offset for note in notes), float, len(notes)
+        )
+        pitches = numpy.fromiter((note.pitch for note in notes), float, len(notes))
+        pitch_bounds = numpy.flatnonzero(pitches[1:] != pitches[:-1]) + 1
+        for indices in numpy.split(numpy.arange(len(notes)), pitch_bounds):
+            old_slice = self._pitch_slice(pitches[indices[0]])
+            old_start_offsets = self._start_offsets[old_slice]
+            positions = numpy.searchsorted(old_start_offsets, start_offsets[indices])
+            for index, position in zip(indices, positions.tolist()):
+                note, row = notes[index], old_slice.start + position
+                if (
+                    position >= len(old_start_offsets)
+                    or self._start_offsets[row] != note.start_offset
+                    or self._stop_offsets[row] != note.stop_offset
+                    or self._velocities[row] != note.velocity
+                    or rows[row]
+                ):
+                    raise ValueError(note)
+                rows[row] = True
+        return rows
+
+    def _get_notes(self, rows) -> List[Note]:
+        return list(
+            map(
+                Note,
+                self._start_offsets[rows].tolist(),
+                self._stop_offsets[rows].tolist(),
+                self._pitches[rows].tolist(),
+                self._velocities[rows].tolist(),
+            )
+        )
+
+    def _pitch_slice(self, pitch) -> slice:
+        return slice(
+            int(numpy.searchsorted(self._pitches, pitch, side="left")),
+            int(numpy.searchsorted(self._pitches, pitch, side="right")),
+        )
+
+    def _set_columns(self, start_offsets, stop_offsets, pitches, velocities):
+        order = numpy.lexsort((start_offsets, pitches))
+        self._start_offsets = start_offsets[order]
+        self._stop_offsets = stop_offsets[order]
+        self._pitches = pitches[order]
+        self._velocities = velocities[order]
+        self._sorted_notes = None
+
+    @staticmethod
+    def _validate_columns(start_offsets, stop_offsets, pitches, velocities):
+        # sort by pitch, start offset, then stop offset
+        order = numpy.lexsort((stop_offsets, start_offsets, pitches))
+        start_offsets = start_offsets[order]
+        stop_offsets = stop_offsets[order]
+        pitches = pitches[order]
+        velocities = velocities[order]
+        # simultaneous new note starts: longer note wins
+        is_first = numpy.ones(len(pitches), dtype=bool)
+        is_first[1:] = (pitches[1:] != pitches[:-1]) | (
+            start_offsets[1:] != start_offsets[:-1]
+        )
+        (firsts,) = numpy.nonzero(is_first)
+        stop_offsets = numpy.maximum.reduceat(stop_offsets, firsts)
+        velocities = numpy.maximum.reduceat(velocities, firsts)
+        start_offsets = start_offsets[firsts]
+        pitches = pitches[firsts]
+        # new note overlaps: later notes masks earlier note
+        same_pitch = pitches[1:] == pitches[:-1]
+        stop_offsets[:-1] = numpy.where(
+            same_pitch,
+            numpy.minimum(stop_offsets[:-1], start_offsets[1:]),
+            stop_offsets[:-1],
+        )
+        return start_offsets, stop_offsets, pitches, velocities
+
+    ### PUBLIC METHODS ###
+
+    def add(self, notes: Iterable[Note]) -> None:
+        notes = list(notes)
+        if not notes:
+            return
+        new_columns = self._validate_columns(
+            numpy.fromiter((note.start_offset for note in notes), float, len(notes)),
+            numpy.fromiter((note.stop_offset for note in notes), float, len(notes)),
+            numpy.fromiter((note.pitch for note in notes), float, len(notes)),
+            numpy.fromiter((note.velocity for note in notes), float, len(notes)),
+        )
+        self.add_columns(*new_columns, validated=True)
+
+    def add_columns(
+        self, start_offsets, stop_offsets, pitches, velocities, *, validated=False
+    ) -> None:
+        """
+        Adds notes from parallel arrays of start offsets, stop offsets, pitches
+        and velocities.
+        """
+        columns = [
+            numpy.asarray(column, dtype=float)
+            for column in (start_offsets, stop_offsets, pitches, velocities)
+        ]
+        if not len(columns[0]):
+            return
+        if numpy.any(columns[0] >= columns[1]):
+            raise ValueError
+        if not validated:
+            columns = self._validate_columns(*columns)
+        new_start_offsets, new_stop_offsets, new_pitches, new_velocities = columns
+        keep = numpy.ones(len(self), dtype=bool)
+        truncated_stop_offsets = self._stop_offsets.copy()
+        is_truncated = numpy.zeros(len(self), dtype=bool)
+        pitch_bounds = numpy.flatnonzero(new_pitches[1:] != new_pitches[:-1]) + 1
+        for indices in numpy.split(numpy.arange(len(new_pitches)), pitch_bounds):
+            old_slice = self._pitch_slice(new_pitches[indices[0]])
+            old_start_offsets = self._start_offsets[old_slice]
+            old_stop_offsets = self._stop_offsets[old_slice]
+            if not len(old_start_offsets):
+                continue
+            # first new note stopping after each old note starts
+            candidates = numpy.searchsorted(
+                new_stop_offsets[indices], old_start_offsets, side="right"
+            )
+            candidate_start_offsets = numpy.append(
+                new_start_offsets[indices], numpy.inf
+            )[candidates]
+            masked = candidate_start_offsets <= old_start_offsets
+            truncated = (old_start_offsets < candidate_start_offsets) & (
+                candidate_start_offsets < old_stop_offsets
+            )
+            keep[old_slice] &= ~(masked | truncated)
+            is_truncated[old_slice] |= truncated
+            truncated_stop_offsets[old_slice] = numpy.where(
+                truncated, candidate_start_offsets, old_stop_offsets
+            )
+        keep |= is_truncated
+        self._set_columns(
+            numpy.concatenate([self._start_offsets[keep], new_start_offsets]),
+            numpy.concatenate([truncated_stop_offsets[keep], new_stop_offsets]),
+            numpy.concatenate([self._pitches[keep], new_pitches]),
+            numpy.concatenate([self._velocities[keep], new_velocities]),
+        )
+
+    def copy(self) -> "ArrayNoteStore":
+        # columns are replaced rather than written in place, so copies can
+        # share them
+        note_store = type(self)()
+        note_store._start_offsets = self._start_offsets
+        note_store._stop_offsets = self._stop_offsets
+        note_store._pitches = self._pitches
+        note_store._velocities = self._velocities
+        note_store._sorted_notes = self._sorted_notes
+        return note_store
+
+    def find_between_offsets(
+        self, start_offset: Optional[float] = None, stop_offset: Optional[float] = None
+    ) -> List[Note]:
+        mask = numpy.ones(len(self), dtype=bool)
+        if start_offset is not None:
+            mask &= start_offset <= self._start_offsets
+        if stop_offset is not None:
+            mask &= self._stop_offsets <= stop_offset
+        return self._get_notes(mask)
+
+    def find_with_pitches(self, pitches: Iterable[float]) -> List[Note]:
+        notes = []
+        for pitch in pitches:
+            notes.extend(self._get_notes(self._pitch_slice(pitch)))
+        return notes
+
+    def remove(self, notes: Iterable[Note]) -> None:
+        notes = list(notes)
+        if not notes:
+            return
+        keep = ~self._find_rows(notes)
+        self._start_offsets = self._start_offsets[keep]
+        self._stop_offsets = self._stop_offsets[keep]
+        self._pitches = self._pitches[keep]
+        self._velocities = self._velocities[keep]
+        self._sorted_notes = None
+
+    def transform_notes(self, notes: Iterable[Note], transform) -> None:
+        """
+        Replaces `notes` with the notes `transform` makes from their start
+        offset, stop offset, pitch and velocity columns, without building notes
+        in between.
+
+        Columns are passed in note order.
+        """
+        notes = list(notes)
+        if not notes:
+            return
+        mask = self._find_rows(notes)
+        rows = numpy.flatnonzero(mask)
+        rows = rows[
+            numpy.lexsort(
+                (
+                    self._velocities[rows],
+                    self._pitches[rows],
+                    self._stop_offsets[rows],
+                    self._start_offsets[rows],
+                )
+            )
+        ]
+        new_columns = [
+            numpy.asarray(column, dtype=float)
+            for column in transform(*(column[rows] for column in self.columns))
+        ]
+        if numpy.any(new_columns[0] >= new_columns[1]):
+            raise ValueError
+        keep = ~mask
+        self._start_offsets = self._start_offsets[keep]
+        self._stop_offsets = self._stop_offsets[keep]
+        self._pitches = self._pitches[keep]
+        self._velocities = self._velocities[keep]
+        self.add_columns(*new_columns)
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def columns(self):
+        """
+        Gets start offset, stop offset, pitch and velocity columns, ordered by
+        pitch and start offset.
+        """
+        return (
+            self._start_offsets,
+            self._stop_offsets,
+            self._pitches,
+            self._velocities,
+        )
+
+    @property
+    def notes(self) -> List[Note]:
+        if self._sorted_notes is None:
+            order = numpy.lexsort(
+                (
+                    self._velocities,
+                    self._pitches,
+                    self._stop_offsets,
+                    self._start_offsets,
+                )
+            )
+            self._sorted_notes = self._get_notes(order)
+        return self._sorted_notes
+
+    @property
+    def pitches(self) -> List[float]:
+        return numpy.unique(self._pitches).tolist()
+
+
+class EnvelopeSegment(NamedTuple):
+    start_offset: float
+    stop_offset: Optional[float]
+    start_value: float
+    stop_value: float
+
+    def value_at(self, offset: float) -> float:
+        if self.stop_offset is None or self.start_value == self.stop_value:
+            return self.start_value
+        ratio = (offset - self.start_offset) / (self.stop_offset - self.start_offset)
+        return self.start_value + (self.stop_value - self.start_value) * ratio
+
+
+class Envelope:
+    """
+    An automation envelope, in a Clip or Timeline.
+
+    Breakpoints are held in a pair of parallel, offset-sorted arrays. Values
+    ramp linearly between breakpoints and hold before the first and after the
+    last, so each pair of neighbouring breakpoints renders as a single
+    server-side ramp.
+    """
+
+    ### INITIALIZER ###
+
+    def __init__(
+        self,
+        parameter_uuid: UUID,
+        breakpoints: Optional[Iterable[Tuple[float, float]]] = None,
+    ):
+        self._parameter_uuid = parameter_uuid
+        self._offsets = array.array("d")
+        self._values = array.array("d")
+        self.add_breakpoints(breakpoints or [])
+
+    ### SPECIAL METHODS ###
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        return zip(self._offsets, self._values)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    ### PRIVATE METHODS ###
+
+    @classmethod
+    def _deserialize(cls, data) -> "Envelope":
+        return cls(
+            UUID(data["parameter"]),
+            [tuple(breakpoint) for breakpoint in data.get("breakpoints", [])],
+        )
+
+    async def _perform(self, parameter, transport, moment, offset, stop_offset=None):
+        """
+        Renders the segment at `offset` onto `parameter` with one ramp, ending
+        at the segment's last breakpoint or `stop_offset`, whichever is first.
+
+        Returns the offset delta to the next segment, if any.
+        """
+        segment = self.segment_at(offset)
+        if segment is None:
+            return None
+        if segment.stop_offset is not None and (
+            stop_offset is None or segment.stop_offset < stop_offset
+        ):
+            stop_offset = segment.stop_offset
+        start_value = segment.value_at(offset)
+        if stop_offset is None:
+            await parameter.set_(start_value, moment=moment)
+            return None
+        stop_value = segment.value_at(stop_offset)
+        if start_value == stop_value or not isinstance(parameter, BusParameter):
+            await parameter.set_(start_value, moment=moment)
+        else:
+            duration = (
+                transport.offset_to_moment(moment.offset + stop_offset - offset).seconds
+                - moment.seconds
+            )
+            await parameter.ramp(start_value, stop_value, duration, moment=moment)
+        return stop_offset - offset
+
+    def _serialize(self):
+        return dict(
+            parameter=str(self.parameter_uuid),
+            breakpoints=[list(breakpoint) for breakpoint in self],
+        )
+
+    ### PUBLIC METHODS ###
+
+    def add_breakpoints(self, breakpoints: Iterable[Tuple[float, float]]):
+        for offset, value in breakpoints:
+            offset, value = float(offset), float(value)
+            index = bisect.bisect_left(self._offsets, offset)
+            if index < len(self._offsets) and self._offsets[index] == offset:
+                self._values[index] = value
+            else:
+                self._offsets.insert(index, offset)
+                self._values.insert(index, value)
+
+    def copy(self) -> "Envelope":
+        envelope = type(self)(self.parameter_uuid)
+        envelope._offsets = array.array("d", self._offsets)
+        envelope._values = array.array("d", self._values)
+        return envelope
+
+    def remove_breakpoints(self, offsets: Iterable[float]):
+        for offset in offsets:
+            index = bisect.bisect_left(self._offsets, offset)
+            if index < len(self._offsets) and self._offsets[index] == offset:
+                del self._offsets[index]
+                del self._values[index]
+
+    def segment_at(self, offset: float) -> Optional[EnvelopeSegment]:
+        if not self._offsets:
+            return None
+        index = bisect.bisect_right(self._offsets, offset)
+        if not index:
+            value = self._values[0]
+            return EnvelopeSegment(offset, self._offsets[0], value, value)
+        if index == len(self._offsets):
+            value = self._values[-1]
+            return EnvelopeSegment(self._offsets[-1], None, value, value)
+        return EnvelopeSegment(
+            self._offsets[index - 1],
+            self._offsets[index],
+            self._values[index - 1],
+            self._values[index],
+        )
+
+    def value_at(self, offset: float) -> Optional[float]:
+        segment = self.segment_at(offset)
+        if segment is None:
+            return None
+        return segment.value_at(offset)
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def breakpoints(self) -> List[Tuple[float, float]]:
+        return list(self)
+
+    @property
+    def parameter_uuid(self) -> UUID:
+        return self._parameter_uuid
+
+
+class ClipObject(ApplicationObject):
+
+    ### INITIALIZER ###
+
+    def __init__(self, *, name=None, uuid=None):
+        ApplicationObject.__init__(self, name=name)
+        self._uuid = uuid or uuid4()
+
+    ### INITIALIZER ###
+
+    def at(self, offset, start_delta=0.0, force_stop=False):
+        pass
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def uuid(self):
+        return self._uuid
+
+
+class Clip(ClipObject):
+
+    ### CLASS VARIABLES ###
+
+    class Storage(enum.IntEnum):
+        TREE = 0
+        ARRAY = 1
+
+    ### INITIALIZER ###
+
+    def __init__(
+        self,
+        *,
+        duration=None,
+        is_looping=True,
+        name=None,
+        notes=None,
+        pattern=None,
+        storage=Storage.TREE,
+        uuid=None,
+    ):
+        from .parser import parse_pattern
+
+        ClipObject.__init__(self, name=name, uuid=uuid)
+        self._pattern = parse_pattern(pattern) if pattern else None
+        if duration is None:
+            duration = self._pattern.duration if self._pattern else 4 / 4
+        self._duration = float(duration)
+        self._is_looping = is_looping
+        self._is_playing = False
+        self._start_delta = 0.0
+        self._storage = self.Storage(storage)
+        self._note_store: NoteStore = {
+            self.Storage.TREE: TreeNoteStore,
+            self.Storage.ARRAY: ArrayNoteStore,
+        }[self._storage]()
+        self._note_store._owners.add(self)
+        self._event_table: Optional[NoteEventTable] = None
+        self._edit_depth = 0
+        self._envelopes: Dict[UUID, Envelope] = {}
+        self._pending_additions: Dict[Note, None] = {}
+        # pending removal -> whether it also cancelled a pending addition
+        self._pending_removals: Dict[Note, bool] = {}
+        if notes:
+            self._add_notes(notes)
+
+    ### SPECIAL METHODS ###
+
+    def __str__(self):
+        obj_name = type(self).__name__
+        return "\n".join(
+            [
+                f"<{obj_name} {self.uuid}>",
+                *(f"    {line}" for child in self for line in str(child).splitlines()),
+            ]
+        )
+
+    ### PRIVATE METHODS ###
+
+    def _add_notes(self, notes):
+        self._debug_tree(self, "Editing")
+        self._own_note_store()
+        self._realize_pattern()
+        self._note_store.add(notes)
+        self._event_table = None
+
+    def _add_note_rows(self, rows):
+        # (start_offset, stop_offset, pitch, velocity) rows, as columns when
+        # the note store can take them directly
+        if not rows:
+            return
+        if self.storage != self.Storage.ARRAY:
+            self._add_notes([Note(*row) for row in rows])
+            return
+        self._debug_tree(self, "Editing")
+        self._own_note_store()
+        self._realize_pattern()
+        self._note_store.add_columns(*zip(*rows))
+        self._event_table = None
+
+    def _copy(self) -> "Clip":
+        clip = type(self)(
+            duration=self.duration,
+            is_looping=self.is_looping,
+            name=self.name,
+            storage=self.storage,
+        )
+        clip._note_store = self._note_store
+        clip._note_store._owners.add(clip)
+        clip._event_table = self._event_table
+        clip._pattern = self._pattern
+        clip._envelopes = {
+            uuid: envelope.copy() for uuid, envelope in self._envelopes.items()
+        }
+        return clip
 
     @classmethod
     async def _deserialize(cls, data, application) -> bool:
@@ -206,12 +956,17 @@ class Clip(ClipObject):
         if parent is None:
             return True
         clip = cls(
-            duration=data["spec"].get("duration", 4 / 4),
+            duration=data["spec"].get("duration"),
             is_looping=bool(data["spec"].get("is_looping", True)),
             name=data["meta"].get("name"),
             notes=[Note(**note_spec) for note_spec in data["spec"].get("notes", [])],
+            pattern=data["spec"].get("pattern"),
+            storage=cls.Storage[data["spec"].get("storage", "TREE")],
             uuid=UUID(data["meta"]["uuid"]),
         )
+        for envelope_spec in data["spec"].get("envelopes", []):
+            envelope = Envelope._deserialize(envelope_spec)
+            clip._envelopes[envelope.parameter_uuid] = envelope
         parent._append(clip)
         return False
 
@@ -221,48 +976,113 @@ class Clip(ClipObject):
             return
         if self.is_playing:
             track = self.parent.parent.parent
-            await self.transport.reschedule(
-                track._clip_perform_event_id,
-                schedule_at=self.transport._clock.get_current_time(),
-                time_unit=TimeUnit.SECONDS,
+            # lookahead playback can't recall submitted bundles, so re-render
+            # from the end of the current window
+            if track._clip_rendered_until is not None:
+                await self.transport.reschedule(
+                    track._clip_perform_event_id,
+                    schedule_at=max(
+                        track._clip_rendered_until,
+                        self.transport.current_moment.offset,
+                    ),
+                )
+            else:
+                await self.transport.reschedule(
+                    track._clip_perform_event_id,
+                    schedule_at=self.transport.clock.get_current_time(),
+                    time_unit=TimeUnit.SECONDS,
+                )
+        self.application.pubsub.publish(ClipModified(self.uuid))
+
+    async def _notify_envelopes(self):
+        if self.application is None:
+            return
+        if self.is_playing:
+            await self.parent.parent.parent._schedule_clip_automation(
+                self.transport.current_moment.offset
             )
         self.application.pubsub.publish(ClipModified(self.uuid))
 
+    def _midi_file_track(self) -> MidiFileTrack:
+        return MidiFileTrack(
+            rows=[
+                (note.start_offset, note.stop_offset, note.pitch, note.velocity)
+                for note in self.notes
+            ],
+            stop_offset=self.duration,
+        )
+
+    def _own_note_store(self):
+        # copy-on-write: detach from note storage shared with other clips
+        if not self._note_store.is_shared:
+            return
+        self._note_store._owners.discard(self)
+        self._note_store = self._note_store.copy()
+        self._note_store._owners.add(self)
+
+    def _realize_pattern(self):
+        # expand a pattern into concrete notes before they're edited
+        if self._pattern is None:
+            return
+        pattern, self._pattern = self._pattern, None
+        self._note_store.add(pattern.notes)
+        self._event_table = None
+
     def _remove_notes(self, notes):
         self._debug_tree(self, "Editing")
-        for note in notes:
-            self._interval_tree.remove(note)
+        self._own_note_store()
+        self._realize_pattern()
+        self._note_store.remove(notes)
+        self._event_table = None
+
+    def _transform_notes(self, notes, transform):
+        # transform columns in place of notes when the note store holds them
+        self._debug_tree(self, "Editing")
+        self._own_note_store()
+        self._realize_pattern()
+        self._note_store.transform_notes(notes, transform)
+        self._event_table = None
 
     def _serialize(self):
         serialized, auxiliary_entities = super()._serialize()
         if self.parent is not None:
             serialized["meta"]["parent"] = str(self.parent.uuid)
         serialized["spec"]["notes"] = []
-        for note in self.notes:
+        for note in self._note_store.notes:
             serialized["spec"]["notes"].append(note._serialize())
+        if self._pattern is not None:
+            serialized["spec"]["pattern"] = self._pattern.text
+        if self.storage != self.Storage.TREE:
+            serialized["spec"]["storage"] = self.storage.name
+        serialized["spec"]["envelopes"] = [
+            envelope._serialize() for envelope in self._envelopes.values()
+        ]
         return serialized, auxiliary_entities
 
     ### PUBLIC METHODS ###
 
     async def add_notes(self, notes):
+        if self._edit_depth:
+            self._pending_additions.update(dict.fromkeys(notes))
+            return
         self._add_notes(notes)
         await self._notify()
 
     def at(self, offset, start_delta=0.0, force_stop=False):
-        start_notes, stop_notes, overlap_notes = [], [], []
         local_offset = loop_local_offset = offset - start_delta
         count = 0
         if self.is_looping and local_offset >= 0.0:
             count, loop_local_offset = divmod(local_offset, self.clip_stop)
-        moment = self._interval_tree.get_moment_at(loop_local_offset)
-        start_notes = moment.start_intervals
-        stop_notes = moment.stop_intervals
-        overlap_notes = moment.overlap_intervals
+        event_table = self.event_table
+        start_notes, stop_notes, overlap_notes, next_offset = event_table.lookup(
+            loop_local_offset
+        )
         if count and not loop_local_offset:  # at a non-zero loop boundary
-            moment_two = self._interval_tree.get_moment_at(self.duration)
-            stop_notes.extend(moment_two.overlap_intervals)
-            stop_notes.extend(moment_two.stop_intervals)
-        next_offset = self._interval_tree.get_offset_after(loop_local_offset)
+            _, boundary_stop_notes, boundary_overlap_notes, _ = event_table.lookup(
+                self.duration
+            )
+            stop_notes.extend(boundary_overlap_notes)
+            stop_notes.extend(boundary_stop_notes)
         if next_offset is None and self.is_looping:
             next_offset = self.duration
         if next_offset is not None:
@@ -283,10 +1103,124 @@ class Clip(ClipObject):
             overlap_notes=overlap_notes or None,
         )
 
+    async def double(self):
+        notes = self.notes
+        async with self.edit():
+            await self.add_notes(
+                [note.translate(self.duration, self.duration) for note in notes]
+            )
+            for envelope in self._envelopes.values():
+                envelope.add_breakpoints(
+                    [(offset + self.duration, value) for offset, value in envelope]
+                )
+            self._duration *= 2
+        if not notes:
+            await self._notify()
+
+    @asynccontextmanager
+    async def edit(self):
+        """
+        Batches note edits into a single transaction.
+
+        Notes added or removed inside the transaction are validated in one
+        merged pass when the outermost transaction exits, followed by a single
+        reschedule and notification. Pending edits are discarded if the
+        transaction raises.
+        """
+        self._edit_depth += 1
+        try:
+            yield self
+        except BaseException:
+            if self._edit_depth == 1:
+                self._pending_additions.clear()
+                self._pending_removals.clear()
+            raise
+        finally:
+            self._edit_depth -= 1
+        if self._edit_depth:
+            return
+        additions, self._pending_additions = list(self._pending_additions), {}
+        removals, self._pending_removals = self._pending_removals, {}
+        if not additions and not removals:
+            return
+        # validate every removal before anything changes, so a failed commit
+        # leaves the clip untouched; notes added and removed within the
+        # transaction needn't exist
+        self._own_note_store()
+        self._realize_pattern()
+        existing = set(
+            self._note_store.find_with_pitches({note.pitch for note in removals})
+        )
+        for note, cancelled_addition in removals.items():
+            if note not in existing and not cancelled_addition:
+                raise ValueError(note)
+        self._remove_notes([note for note in removals if note in existing])
+        self._add_notes(additions)
+        await self._notify()
+
+    def export_midi(self, file_path):
+        write_midi_file(file_path, [self._midi_file_track()])
+
+    async def halve(self):
+        duration = self.duration / 2
+        notes = [note for note in self.notes if note.stop_offset > duration]
+        async with self.edit():
+            await self.remove_notes(notes)
+            await self.add_notes(
+                [
+                    dataclasses.replace(note, stop_offset=duration)
+                    for note in notes
+                    if note.start_offset < duration
+                ]
+            )
+            for envelope in self._envelopes.values():
+                offsets = [offset for offset, _ in envelope if offset > duration]
+                if offsets:
+                    envelope.add_breakpoints([(duration, envelope.value_at(duration))])
+                    envelope.remove_breakpoints(offsets)
+            self._duration = duration
+        if not notes:
+            await self._notify()
+
+    async def import_midi(self, file_path, *, track_index=0, batch_size=4096):
+        """
+        Adds the notes of one track of a Standard MIDI File, streaming them
+        into the note store in batches, and extends the clip to cover the
+        track.
+        """
+        for batch in read_midi_file(file_path, batch_size=batch_size):
+            if batch.track_index < track_index:
+                continue
+            if batch.track_index > track_index:
+                break
+            self._add_note_rows(batch.rows)
+            if batch.stop_offset is not None:
+                self._duration = max(self._duration, batch.stop_offset)
+        await self._notify()
+
+    async def remove_envelope(self, parameter):
+        if self._envelopes.pop(parameter.uuid, None) is None:
+            return
+        await self._notify_envelopes()
+
     async def remove_notes(self, notes):
+        if self._edit_depth:
+            for note in notes:
+                # the note may also already be in the clip, so its removal is
+                # recorded even when it cancels a pending addition
+                cancelled_addition = note in self._pending_additions
+                self._pending_additions.pop(note, None)
+                self._pending_removals[note] = (
+                    self._pending_removals.get(note, False) or cancelled_addition
+                )
+            return
         self._remove_notes(notes)
         await self._notify()
 
+    async def set_envelope(self, parameter, breakpoints):
+        self._envelopes[parameter.uuid] = Envelope(parameter.uuid, breakpoints)
+        await self._notify_envelopes()
+
     ### PUBLIC PROPERTIES ###
 
     @property
@@ -301,6 +1235,18 @@ class Clip(ClipObject):
     def duration(self):
         return self._duration
 
+    @property
+    def envelopes(self) -> Mapping[UUID, Envelope]:
+        return MappingProxyType(self._envelopes)
+
+    @property
+    def event_table(self) -> Union[NoteEventTable, "tloen.domain.parser.Pattern"]:
+        if self._pattern is not None:
+            return self._pattern
+        if self._event_table is None:
+            self._event_table = NoteEventTable.from_notes(self._note_store)
+        return self._event_table
+
     @property
     def is_looping(self):
         return self._is_looping
@@ -309,9 +1255,27 @@ class Clip(ClipObject):
     def is_playing(self):
         return self._is_playing
 
+    @property
+    def note_store(self) -> NoteStore:
+        # patterns only expand into the clip's own store when edited, so
+        # queries read from the pattern's store until then
+        if self._pattern is not None:
+            return self._pattern.note_store
+        return self._note_store
+
     @property
     def notes(self):
-        return sorted(self._interval_tree)
+        if self._pattern is not None:
+            return self._pattern.notes
+        return list(self._note_store.notes)
+
+    @property
+    def pattern(self) -> Optional[str]:
+        return self._pattern.text if self._pattern is not None else None
+
+    @property
+    def storage(self) -> Storage:
+        return self._storage
 
     @property
     def clip_delta(self):
@@ -374,8 +1338,23 @@ class Slot(ApplicationObject):
         await self._set_clip(clip)
         return clip
 
-    async def duplicate_clip(self):
-        pass
+    async def duplicate_clip(self, slot=None):
+        """
+        Copies this slot's clip into `slot`, or into the next empty slot on
+        the track.
+
+        The copy shares the original's note storage until either is edited.
+        """
+        if self.clip is None:
+            return None
+        if slot is None:
+            slots = self.parent[self.parent.index(self) + 1 :]
+            slot = next((x for x in slots if x.clip is None), None)
+            if slot is None:
+                raise RuntimeError("No empty slot")
+        clip = self.clip._copy()
+        await slot._set_clip(clip)
+        return clip
 
     async def fire(self):
         if not self.application:
@@ -405,10 +1384,9 @@ class Slot(ApplicationObject):
     def track(self):
         from .tracks import Track
 
-        for parent in self.parentage[1:]:
-            if isinstance(parent, Track):
-                return parent
-        return None
+        return self._get_ancestor(
+            "track", lambda x: isinstance(x, Track), inclusive=False
+        )
 
     @property
     def uuid(self):
@@ -442,17 +1420,107 @@ class Scene(ApplicationObject):
         application.scenes._append(scene)
         return False
 
+    def _iterate_tracks(self):
+        from .tracks import Track
+
+        for context in self.application.contexts:
+            for node in context.tracks.depth_first():
+                if isinstance(node, Track):
+                    yield node
+
     ### PUBLIC METHODS ###
 
     def delete(self):
         pass
 
-    def duplicate(self):
-        pass
+    async def duplicate(self):
+        """
+        Inserts a copy of this scene after it, copying each track's clip in
+        this scene into the new scene's slot.
+        """
+        from .tracks import Track
+
+        if self.application is None:
+            raise ValueError
+        index = self.application.scenes.index(self) + 1
+        scene = Scene(name=self.name)
+        self.application.scenes._mutate(slice(index, index), [scene])
+        tracks: Deque[Track] = deque()
+        for context in self.application.contexts:
+            tracks.extend(context.tracks)
+        while tracks:
+            track = tracks.pop()
+            if track.tracks:
+                tracks.extend(track.tracks)
+            slot = Slot()
+            track.slots._mutate(slice(index, index), [slot])
+            # playing and pending clips are tracked by slot index, so follow
+            # the slots the new one pushed down
+            if track._active_slot_index is not None:
+                if track._active_slot_index >= index:
+                    track._active_slot_index += 1
+            if track._pending_slot_index is not None:
+                if track._pending_slot_index >= index:
+                    track._pending_slot_index += 1
+            clip = track.slots[index - 1].clip
+            if clip is not None:
+                await slot._set_clip(clip._copy())
+        return scene
+
+    def export_midi(self, file_path):
+        """
+        Writes each track's clip in this scene as one track of a Standard MIDI
+        File, with empty tracks for empty slots.
+        """
+        if self.application is None:
+            raise ValueError
+        index = self.application.scenes.index(self)
+        midi_file_tracks = []
+        for track in self._iterate_tracks():
+            clip = track.slots[index].clip
+            if clip is None:
+                midi_file_tracks.append(MidiFileTrack(rows=[]))
+            else:
+                midi_file_tracks.append(clip._midi_file_track())
+        write_midi_file(file_path, midi_file_tracks)
 
     async def fire(self):
         pass
 
+    async def import_midi(self, file_path, *, track_index=0, batch_size=4096):
+        """
+        Streams each track of a Standard MIDI File, from file track
+        `track_index` on, into the clip in this scene on the corresponding
+        track, adding clips to empty slots as needed.
+
+        Pass ``track_index=1`` to skip the conductor track many format 1 files
+        start with.
+        """
+        if self.application is None:
+            raise ValueError
+        index = self.application.scenes.index(self)
+        tracks = list(self._iterate_tracks())
+        clips: Dict[int, Clip] = {}
+        for batch in read_midi_file(file_path, batch_size=batch_size):
+            if batch.track_index < track_index:
+                continue
+            track_offset = batch.track_index - track_index
+            if track_offset >= len(tracks):
+                break
+            if not batch.rows and track_offset not in clips:
+                continue  # don't add clips for empty tracks
+            clip = clips.get(track_offset)
+            if clip is None:
+                slot = tracks[track_offset].slots[index]
+                if slot.clip is None:
+                    await slot.add_clip()
+                clip = clips[track_offset] = slot.clip
+            clip._add_note_rows(batch.rows)
+            if batch.stop_offset is not None:
+                clip._duration = max(clip._duration, batch.stop_offset)
+        for clip in clips.values():
+            await clip._notify()
+
     ### PUBLIC PROPERTIES ###
 
     @property
@@ -461,7 +1529,85 @@ class Scene(ApplicationObject):
 
 
 class Timeline:
-    pass
+    """
+    Transport-level automation, with breakpoints at absolute transport offsets.
+    """
+
+    ### INITIALIZER ###
+
+    def __init__(self, application):
+        self._application = application
+        self._envelopes: Dict[UUID, Envelope] = {}
+        self._event_ids: Dict[UUID, int] = {}
+
+    ### PRIVATE METHODS ###
+
+    async def _automation_callback(self, clock_context, envelope):
+        parameter = self._application.registry.get(envelope.parameter_uuid)
+        if parameter is None:
+            return None
+        moment = clock_context.desired_moment
+        return await envelope._perform(
+            parameter, self._application.transport, moment, moment.offset
+        )
+
+    async def _deserialize(self, data):
+        for envelope_spec in data.get("envelopes", []):
+            envelope = Envelope._deserialize(envelope_spec)
+            self._envelopes[envelope.parameter_uuid] = envelope
+
+    async def _schedule(self, uuid, offset):
+        transport = self._application.transport
+        await transport.cancel(self._event_ids.pop(uuid, None))
+        if uuid not in self._envelopes:
+            return
+        self._event_ids[uuid] = await transport.schedule(
+            self._automation_callback,
+            schedule_at=offset,
+            args=[self._envelopes[uuid]],
+            event_type=transport.EventType.CLIP_PERFORM,
+        )
+
+    def _serialize(self):
+        if not self._envelopes:
+            return {}
+        return {
+            "envelopes": [
+                envelope._serialize() for envelope in self._envelopes.values()
+            ]
+        }
+
+    async def _start(self):
+        for uuid in self._envelopes:
+            await self._schedule(uuid, 0.0)
+
+    async def _stop(self):
+        transport = self._application.transport
+        while self._event_ids:
+            _, event_id = self._event_ids.popitem()
+            await transport.cancel(event_id)
+
+    async def _update(self, uuid):
+        transport = self._application.transport
+        if transport.is_running:
+            await self._schedule(uuid, transport.current_moment.offset)
+
+    ### PUBLIC METHODS ###
+
+    async def remove_envelope(self, parameter):
+        if self._envelopes.pop(parameter.uuid, None) is None:
+            return
+        await self._update(parameter.uuid)
+
+    async def set_envelope(self, parameter, breakpoints):
+        self._envelopes[parameter.uuid] = Envelope(parameter.uuid, breakpoints)
+        await self._update(parameter.uuid)
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def envelopes(self) -> Mapping[UUID, Envelope]:
+        return MappingProxyType(self._envelopes)
 
 
 @dataclasses.dataclass
@@ -79,6 +79,9 @@ class Context(Allocatable, Mixer):
         application.contexts._append(context)
         return False
 
+    def _plan_allocation(self, plan):
+        plan.node_count += 1
+
     def _serialize(self):
         serialized, auxiliary_entities = super()._serialize()
         serialized["spec"].update(
@@ -217,10 +217,15 @@ class DeviceObject(Allocatable, Performable):
         return result
 
     def _perform_input(self, moment, midi_messages):
-        out_messages = []
+        captures, event_handlers, out_messages = (
+            self._captures,
+            self._event_handlers,
+            [],
+        )
         for message in midi_messages:
-            self._update_captures(moment, message, "I")
-            event_handler = self._event_handlers.get(type(message))
+            if captures:
+                self._update_captures(moment, message, "I")
+            event_handler = event_handlers.get(type(message))
             if not event_handler:
                 out_messages.append(message)
                 continue
@@ -280,10 +285,9 @@ class DeviceObject(Allocatable, Performable):
     def track_object(self):
         from .tracks import TrackObject
 
-        for parent in self.parentage[1:]:
-            if isinstance(parent, TrackObject):
-                return parent
-        return None
+        return self._get_ancestor(
+            "track_object", lambda x: isinstance(x, TrackObject), inclusive=False
+        )
 
     @property
     def uuid(self) -> UUID:
@@ -352,6 +356,10 @@ class AllocatableDevice(DeviceObject):
     def _free_audio_buses(self):
         self._audio_bus_proxies.pop("output").free()
 
+    def _plan_allocation(self, plan):
+        plan.node_count += 2
+        plan.audio_channel_count += self.effective_channel_count
+
     def _reallocate(self, difference):
         channel_count = self.effective_channel_count
         self._free_audio_buses()
@@ -74,8 +74,8 @@ class Arpeggiator(DeviceObject):
         old_application.transport._dependencies.remove(self)
 
     def _handle_note_off(self, moment, midi_message):
-        self._input_pitches.pop(midi_message.pitch)
-        self._input_pitches.pop(midi_message.pitch)
+        self._input_pitches.pop(midi_message.pitch, None)
+        self._input_pitches_to_velocities.pop(midi_message.pitch, None)
         self._pattern = self._rebuild_pattern()
         return []
 
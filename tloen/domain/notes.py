@@ -1,144 +1,392 @@
+from operator import eq, ge, gt, le, lt, ne
+from typing import FrozenSet, Optional
+
+from .clips import Note
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
 class NoteSelector:
+    """
+    Selects notes in a clip.
+
+    Filters are planned against the clip's note indexes: offset ranges query
+    the note store's interval index and pitch filters its per-pitch index,
+    each resolving to a set of notes. Set operators combine those sets
+    directly.
+    """
 
     _valid_operators = frozenset(("==", "!=", "<", ">", "<=", ">="))
 
+    _operators = {"==": eq, "!=": ne, "<": lt, ">": gt, "<=": le, ">=": ge}
+
+    _indexed_filters = frozenset(
+        ("between_offsets", "between_pitches", "with_pitch_classes", "with_pitches")
+    )
+
+    _set_filters = frozenset(("and_selector", "invert", "or_selector", "xor_selector"))
+
     def __init__(self, clip, filters=None):
         self._clip = clip
         self._filters = tuple(filters or ())
 
     def __iter__(self):
-        source = iter(self._clip)
-        for filter_ in self._filters:
-            filter_name, filter_args = filter_[0], filter_[1:]
-            filter_func = getattr(self, "_" + filter_name)
-            source = filter_func(source, *filter_args)
-        yield from source
+        yield from sorted(self._select())
 
     def __and__(self, selector):
-        pass
+        return self._with_filter(("and_selector", selector))
 
     def __or__(self, selector):
-        pass
+        return self._with_filter(("or_selector", selector))
 
     def __invert__(self):
-        pass
+        return self._with_filter(("invert",))
+
+    def __xor__(self, selector):
+        return self._with_filter(("xor_selector", selector))
 
-    def __xor__(self):
-        pass
+    def _all_notes(self):
+        return frozenset(self._clip.notes)
 
     def _and_selector(self, source, selector):
-        pass
+        if source is None:
+            return selector._select()
+        return source & selector._select()
 
     def _or_selector(self, source, selector):
-        pass
+        if source is None:
+            return None
+        return source | selector._select()
 
     def _xor_selector(self, source, selector):
-        pass
+        if source is None:
+            source = self._all_notes()
+        return source ^ selector._select()
 
     def _invert(self, source):
-        pass
+        if source is None:
+            return frozenset()
+        return self._all_notes() - source
 
     def _between_offsets(self, source, start_offset, stop_offset):
-        if start_offset is None and stop_offset is not None:
-            for note in source:
-                if note.stop_offset <= stop_offset:
-                    yield note
-        elif start_offset is not None and stop_offset is None:
-            for note in source:
-                if start_offset <= note.start_offset:
-                    yield note
-        elif start_offset < stop_offset:
-            for note in source:
-                if (
-                    start_offset <= note.start_offset
-                    and note.stop_offset <= stop_offset
-                ):
-                    yield note
-        elif stop_offset < start_offset:
-            for note in source:
-                if note.stop_offset <= stop_offset or start_offset <= note.start_offset:
-                    yield note
+        note_store = self._clip.note_store
+        if start_offset == stop_offset:
+            return source
+        elif start_offset is None or stop_offset is None or start_offset < stop_offset:
+            notes = note_store.find_between_offsets(start_offset, stop_offset)
         else:
-            yield from source
+            notes = note_store.find_between_offsets(stop_offset=stop_offset)
+            notes.extend(note_store.find_between_offsets(start_offset=start_offset))
+        return self._restrict(source, notes)
 
     def _between_pitches(self, source, start_pitch, stop_pitch):
-        if start_pitch is None and stop_pitch is not None:
-            for note in source:
-                if note.pitch <= stop_pitch:
-                    yield note
-        elif start_pitch is not None and stop_pitch is None:
-            for note in source:
-                if start_pitch <= note.pitch:
-                    yield note
+        if start_pitch == stop_pitch:
+            return source
+        elif start_pitch is None:
+            pitches = [x for x in self._clip.note_store.pitches if x <= stop_pitch]
+        elif stop_pitch is None:
+            pitches = [x for x in self._clip.note_store.pitches if start_pitch <= x]
         elif start_pitch < stop_pitch:
-            for note in source:
-                if start_pitch <= note.pitch <= stop_pitch:
-                    yield note
-        elif stop_pitch < start_pitch:
-            for note in source:
-                if note.pitch <= stop_pitch or start_pitch <= note.pitch:
-                    yield note
+            pitches = [
+                x
+                for x in self._clip.note_store.pitches
+                if start_pitch <= x <= stop_pitch
+            ]
         else:
-            yield from source
+            pitches = [
+                x
+                for x in self._clip.note_store.pitches
+                if x <= stop_pitch or start_pitch <= x
+            ]
+        return self._restrict(source, self._clip.note_store.find_with_pitches(pitches))
+
+    def _compare(self, value, values, operator):
+        if operator == "==":
+            return value in values
+        elif operator == "!=":
+            return value not in values
+        return any(self._operators[operator](value, x) for x in values)
+
+    def _plan(self):
+        # restricting filters commute, so run indexed filters first within
+        # each run of them between set operations
+        plan, run = [], []
+        for filter_ in self._filters + (None,):
+            if filter_ is None or filter_[0] in self._set_filters:
+                run.sort(key=lambda x: x[0] not in self._indexed_filters)
+                plan.extend(run)
+                run = []
+                if filter_ is not None:
+                    plan.append(filter_)
+            else:
+                run.append(filter_)
+        return plan
+
+    def _restrict(self, source, notes):
+        if source is None:
+            return frozenset(notes)
+        return source.intersection(notes)
+
+    def _select(self) -> FrozenSet:
+        # None stands for every note in the clip, until a filter narrows it
+        source: Optional[FrozenSet] = None
+        for filter_ in self._plan():
+            filter_name, filter_args = filter_[0], filter_[1:]
+            filter_func = getattr(self, "_" + filter_name)
+            source = filter_func(source, *filter_args)
+        if source is None:
+            return self._all_notes()
+        return source
 
     def _with_durations(self, source, durations, operator):
-        pass
+        if source is None:
+            source = self._all_notes()
+        return frozenset(
+            note
+            for note in source
+            if self._compare(note.stop_offset - note.start_offset, durations, operator)
+        )
+
+    async def _transform(self, transform):
+        # apply `transform` to the selected notes' columns in one vectorized
+        # pass, then swap old for new notes in a single clip transaction
+        if numpy is None:
+            raise RuntimeError("Bulk note transforms require NumPy")
+        notes = list(self)
+        if not notes:
+            return
+        clip = self._clip
+        if clip.storage == clip.Storage.ARRAY and not clip._edit_depth:
+            # the note store's columns go straight through the transform
+            clip._transform_notes(notes, transform)
+            await clip._notify()
+            return
+        start_offsets, stop_offsets, pitches, velocities = transform(
+            *(
+                numpy.fromiter(
+                    (getattr(note, name) for note in notes), float, len(notes)
+                )
+                for name in ("start_offset", "stop_offset", "pitch", "velocity")
+            )
+        )
+        new_notes = list(
+            map(
+                Note,
+                start_offsets.tolist(),
+                stop_offsets.tolist(),
+                pitches.tolist(),
+                velocities.tolist(),
+            )
+        )
+        async with clip.edit():
+            await clip.remove_notes(notes)
+            await clip.add_notes(new_notes)
+
+    def _with_filter(self, filter_):
+        return type(self)(self._clip, self._filters + (filter_,))
 
     def _with_pitches(self, source, pitches, operator):
-        pass
+        pitches = [
+            x
+            for x in self._clip.note_store.pitches
+            if self._compare(x, pitches, operator)
+        ]
+        return self._restrict(source, self._clip.note_store.find_with_pitches(pitches))
 
     def _with_pitch_classes(self, source, pitch_classes, operator):
-        pass
+        pitches = [
+            x
+            for x in self._clip.note_store.pitches
+            if self._compare(x % 12, pitch_classes, operator)
+        ]
+        return self._restrict(source, self._clip.note_store.find_with_pitches(pitches))
+
+    @classmethod
+    def _coerce_values(cls, values, operator):
+        if operator not in cls._valid_operators:
+            raise ValueError(operator)
+        if isinstance(values, (int, float)):
+            values = [values]
+        return frozenset(float(x) for x in values)
 
     def between_offsets(self, start_offset=None, stop_offset=None):
         if start_offset is not None:
             start_offset = float(start_offset)
         if stop_offset is not None:
             stop_offset = float(stop_offset)
-        filter_ = ("between_offsets", start_offset, stop_offset)
-        filters = self._filters + (filter_,)
-        return type(self)(self._clip, filters)
+        return self._with_filter(("between_offsets", start_offset, stop_offset))
 
     def between_pitches(self, start_pitch=None, stop_pitch=None):
         if start_pitch is not None:
             start_pitch = float(start_pitch)
         if stop_pitch is not None:
             stop_pitch = float(stop_pitch)
-        filter_ = ("between_pitches", start_pitch, stop_pitch)
-        filters = self._filters + (filter_,)
-        return type(self)(self._clip, filters)
+        return self._with_filter(("between_pitches", start_pitch, stop_pitch))
 
     def with_durations(self, durations, operator="=="):
-        pass
+        durations = self._coerce_values(durations, operator)
+        return self._with_filter(("with_durations", durations, operator))
 
     def with_pitches(self, pitches, operator="=="):
-        pass
+        pitches = self._coerce_values(pitches, operator)
+        return self._with_filter(("with_pitches", pitches, operator))
 
     def with_pitch_classes(self, pitch_classes, operator="=="):
-        pass
+        pitch_classes = frozenset(
+            x % 12 for x in self._coerce_values(pitch_classes, operator)
+        )
+        return self._with_filter(("with_pitch_classes", pitch_classes, operator))
 
-    def delete(self):
-        self._clip.remove_notes(self)
+    async def delete(self):
+        await self._clip.remove_notes(list(self))
 
-    def replace(self, notes):
-        self._clip.remove_notes(self)
-        self._clip.add_notes(notes)
+    async def replace(self, notes):
+        async with self._clip.edit():
+            await self._clip.remove_notes(list(self))
+            await self._clip.add_notes(notes)
 
-    def transpose(self, transposition):
+    async def transpose(self, transposition):
         notes = list(self)
-        self._clip.remove_notes(self)
-        self._clip.add_notes([note.transpose(transposition) for note in notes])
+        async with self._clip.edit():
+            await self._clip.remove_notes(notes)
+            await self._clip.add_notes(
+                [note.transpose(transposition) for note in notes]
+            )
 
-    def translate(self, translation):
+    async def translate(self, translation):
         notes = list(self)
-        self._clip.remove_notes(self)
-        self._clip.add_notes(
-            [note.translate(translation, translation) for note in notes]
-        )
+        async with self._clip.edit():
+            await self._clip.remove_notes(notes)
+            await self._clip.add_notes(
+                [note.translate(translation, translation) for note in notes]
+            )
 
-    def translate_offsets(self, start_translation=None, stop_translation=None):
+    async def translate_offsets(self, start_translation=None, stop_translation=None):
         notes = list(self)
-        self._clip.remove_notes(self)
-        self._clip.add_notes(
-            [note.translate(start_translation, stop_translation) for note in notes]
-        )
+        async with self._clip.edit():
+            await self._clip.remove_notes(notes)
+            await self._clip.add_notes(
+                [note.translate(start_translation, stop_translation) for note in notes]
+            )
+
+    async def compress_velocities(self, threshold, ratio):
+        """
+        Compresses velocities above `threshold` by `ratio`.
+        """
+        if ratio < 1:
+            raise ValueError(ratio)
+
+        def transform(start_offsets, stop_offsets, pitches, velocities):
+            velocities = numpy.where(
+                velocities > threshold,
+                threshold + (velocities - threshold) / ratio,
+                velocities,
+            )
+            return start_offsets, stop_offsets, pitches, velocities
+
+        await self._transform(transform)
+
+    async def humanize(self, timing=0.0, velocity=0.0, seed=None):
+        """
+        Randomly shifts notes by up to `timing` and velocities by up to
+        `velocity`, in either direction.
+        """
+
+        def transform(start_offsets, stop_offsets, pitches, velocities):
+            generator = numpy.random.default_rng(seed)
+            shifts = generator.uniform(-timing, timing, len(start_offsets))
+            shifts = numpy.maximum(shifts, -start_offsets)
+            velocities = velocities + generator.uniform(
+                -velocity, velocity, len(velocities)
+            )
+            return (
+                start_offsets + shifts,
+                stop_offsets + shifts,
+                pitches,
+                numpy.clip(velocities, 0, 127),
+            )
+
+        await self._transform(transform)
+
+    async def legato(self, gap=0.0):
+        """
+        Extends each note to the next selected note start, less `gap`.
+        """
+
+        def transform(start_offsets, stop_offsets, pitches, velocities):
+            unique_start_offsets = numpy.unique(start_offsets)
+            next_start_offsets = numpy.append(unique_start_offsets, numpy.inf)[
+                numpy.searchsorted(unique_start_offsets, start_offsets, side="right")
+            ]
+            new_stop_offsets = next_start_offsets - gap
+            stop_offsets = numpy.where(
+                numpy.isfinite(new_stop_offsets) & (start_offsets < new_stop_offsets),
+                new_stop_offsets,
+                stop_offsets,
+            )
+            return start_offsets, stop_offsets, pitches, velocities
+
+        await self._transform(transform)
+
+    async def quantize(self, grid, strength=1.0, quantize_stops=False):
+        """
+        Moves note starts toward the nearest `grid` line by `strength`, keeping
+        durations unless `quantize_stops` is set.
+        """
+        if grid <= 0:
+            raise ValueError(grid)
+        if not 0 <= strength <= 1:
+            raise ValueError(strength)
+
+        def transform(start_offsets, stop_offsets, pitches, velocities):
+            shifts = (
+                numpy.round(start_offsets / grid) * grid - start_offsets
+            ) * strength
+            start_offsets = start_offsets + shifts
+            if quantize_stops:
+                stop_offsets = stop_offsets + strength * (
+                    numpy.round(stop_offsets / grid) * grid - stop_offsets
+                )
+                stop_offsets = numpy.where(
+                    start_offsets < stop_offsets, stop_offsets, start_offsets + grid
+                )
+            else:
+                stop_offsets = stop_offsets + shifts
+            return start_offsets, stop_offsets, pitches, velocities
+
+        await self._transform(transform)
+
+    async def scale_velocities(self, factor, offset=0.0):
+        """
+        Scales velocities by `factor`, then adds `offset`.
+        """
+
+        def transform(start_offsets, stop_offsets, pitches, velocities):
+            velocities = numpy.clip(velocities * factor + offset, 0, 127)
+            return start_offsets, stop_offsets, pitches, velocities
+
+        await self._transform(transform)
+
+    async def swing(self, grid, amount):
+        """
+        Delays notes starting on every other `grid` line by `amount` of the
+        grid.
+        """
+        if grid <= 0:
+            raise ValueError(grid)
+        if not 0 <= amount < 1:
+            raise ValueError(amount)
+
+        def transform(start_offsets, stop_offsets, pitches, velocities):
+            steps = numpy.round(start_offsets / grid)
+            shifts = numpy.where(
+                numpy.isclose(start_offsets, steps * grid) & (steps % 2 == 1),
+                amount * grid,
+                0.0,
+            )
+            return start_offsets + shifts, stop_offsets + shifts, pitches, velocities
+
+        await self._transform(transform)
@@ -1,4 +1,5 @@
 import dataclasses
+import functools
 from typing import Callable, Optional
 from uuid import UUID, uuid4
 
@@ -170,6 +171,13 @@ class ParameterObject(ApplicationObject):
     def _preallocate(self, provider, client):
         ...
 
+    def _set_uuid(self, uuid: UUID):
+        # builtin parameters take their serialized uuid, so re-register them
+        if self.application is not None:
+            self.application._registry.pop(self._uuid)
+            self.application._registry[uuid] = self
+        self._uuid = uuid
+
     ### PUBLIC PROPERTIES ###
 
     @property
@@ -241,7 +249,7 @@ class BufferParameter(Allocatable, ParameterObject):
         if parameter.name in parent.parameters:
             old_parameter = parent.parameters.get(parameter.name)
             old_parameter._path = parameter.path
-            old_parameter._uuid = parameter.uuid
+            old_parameter._set_uuid(parameter.uuid)
         else:
             parent._add_parameter(parameter)
         return False
@@ -339,6 +347,7 @@ class BusParameter(Allocatable, ParameterObject):
         )
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def _build_ramp_synthdef(cls):
         with SynthDefBuilder(
             out=(0.0, "scalar"),
@@ -361,6 +370,12 @@ class BusParameter(Allocatable, ParameterObject):
             )
         return builder.build("mixer/ramp")
 
+    def _deallocate(self, old_provider, *, dispose_only=False):
+        ramp = self._node_proxies.pop("ramp", None)
+        if ramp is not None and not dispose_only:
+            ramp.free()
+        Allocatable._deallocate(self, old_provider, dispose_only=dispose_only)
+
     @classmethod
     async def _deserialize(cls, data, application) -> bool:
         parent_uuid = UUID(data["meta"]["parent"])
@@ -376,13 +391,17 @@ class BusParameter(Allocatable, ParameterObject):
         )
         if parameter.name in parent.parameters:
             old_parameter = parent.parameters.get(parameter.name)
-            old_parameter._uuid = parameter.uuid
+            old_parameter._set_uuid(parameter.uuid)
         else:
             parent._add_parameter(parameter)
         parameter = parent.parameters[data["meta"]["name"]]
         await parameter.set_(data["spec"]["value"])
         return False
 
+    def _plan_allocation(self, plan):
+        plan.node_count += 1
+        plan.control_channel_count += 1
+
     def _preallocate(self, provider, client):
         self._debug_tree(self, "Pre-Allocating", suffix=f"{hex(id(provider))}")
         self._client = client
@@ -399,11 +418,42 @@ class BusParameter(Allocatable, ParameterObject):
 
     ### PUBLIC METHODS ###
 
+    async def ramp(
+        self, start_value, stop_value, duration: float, *, moment: Moment = None
+    ):
+        """
+        Ramps the parameter's bus from `start_value` to `stop_value` over
+        `duration` seconds with a single server-side ramp synth, replacing any
+        ramp already running.
+        """
+        async with self.lock(
+            [self], seconds=moment.seconds if moment is not None else None
+        ):
+            start_value, self._value = self.spec(start_value), self.spec(stop_value)
+            ramp = self._node_proxies.pop("ramp", None)
+            if ramp is not None:
+                ramp.free()
+            if self.bus_proxy is not None and self.node_proxy is not None:
+                self._node_proxies["ramp"] = self.provider.add_synth(
+                    add_action=AddAction.ADD_TO_HEAD,
+                    synthdef=self._build_ramp_synthdef(),
+                    target_node=self.node_proxy,
+                    out=self.bus_proxy,
+                    start_value=start_value,
+                    stop_value=self._value,
+                    total_time=duration,
+                )
+            if self.application is not None:
+                self.application.pubsub.publish(ParameterModified(self.uuid))
+
     async def set_(self, value, *, moment: Moment = None):
         async with self.lock(
             [self], seconds=moment.seconds if moment is not None else None
         ):
             self._value = self.spec(value)
+            ramp = self._node_proxies.pop("ramp", None)
+            if ramp is not None:
+                ramp.free()
             if self.bus_proxy is not None:
                 self.bus_proxy.set_(self._value)
             if self.application is not None:
@@ -469,7 +519,7 @@ class CallbackParameter(ParameterObject):
         )
         if parameter.name in parent.parameters:
             old_parameter = parent.parameters.get(parameter.name)
-            old_parameter._uuid = parameter.uuid
+            old_parameter._set_uuid(parameter.uuid)
         else:
             parent._add_parameter(parameter)
         parameter = parent.parameters[data["meta"]["name"]]
@@ -533,6 +583,10 @@ class ParameterGroup(AllocatableContainer):
             target_node=target_node, add_action=self.add_action, name=self.label
         )
 
+    def _plan_allocation(self, plan):
+        if any(isinstance(x, BusParameter) for x in self):
+            plan.node_count += 1
+
 
 @dataclasses.dataclass
 class ParameterModified(Event):
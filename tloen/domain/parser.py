@@ -73,89 +73,146 @@ Parses LilyPond-like syntax into a clip.
     Note(start_offset=0.8, stop_offset=0.9, pitch=71, velocity=100.0)
     Note(start_offset=0.9, stop_offset=1.0, pitch=72, velocity=100.0)
 
+::
+
+    >>> for note in parse(r"c4 \\repeat unfold 2 { d8 e } f4").notes:
+    ...     note
+    ...
+    Note(start_offset=0.0, stop_offset=0.25, pitch=60, velocity=100.0)
+    Note(start_offset=0.25, stop_offset=0.375, pitch=62, velocity=100.0)
+    Note(start_offset=0.375, stop_offset=0.5, pitch=64, velocity=100.0)
+    Note(start_offset=0.5, stop_offset=0.625, pitch=62, velocity=100.0)
+    Note(start_offset=0.625, stop_offset=0.75, pitch=64, velocity=100.0)
+    Note(start_offset=0.75, stop_offset=1.0, pitch=65, velocity=100.0)
+
+Patterns keep repeats, tuplets, ties and chords symbolic, computing only the
+notes at the offsets they're looked up at:
+
+::
+
+    >>> from tloen.domain.parser import parse_pattern
+
+::
+
+    >>> pattern = parse_pattern(r"\\repeat unfold 256 { c8 <e g>4 ~8 2/3 { d4 e f } }")
+    >>> pattern.duration
+    256.0
+    >>> start_notes, stop_notes, overlap_notes, next_offset = pattern.lookup(128.25)
+    >>> overlap_notes
+    [Note(start_offset=128.125, stop_offset=128.5, pitch=64, velocity=100.0), Note(start_offset=128.125, stop_offset=128.5, pitch=67, velocity=100.0)]
+    >>> next_offset
+    128.5
+
+Parsed text is memoized, so repeated fragments are only parsed once:
+
+::
+
+    >>> from tloen.domain.parser import parse_rows
+
+::
+
+    >>> parse_rows("c4 <e g>") is parse_rows("c4 <e g>")
+    True
+    >>> parse_rows("c4 <e g>")
+    ((0.0, 0.25, 60, 100.0), (0.25, 0.5, 64, 100.0), (0.25, 0.5, 67, 100.0))
+
 """
 
-from collections import deque
+import bisect
+import functools
+import math
 from fractions import Fraction
 from typing import List, NamedTuple, Optional, Tuple, Union
 
 from sly import Lexer, Parser
 
-from .clips import Clip, Note
+from .clips import Clip, Note, TreeNoteStore
+
+
+def parse(text, storage=Clip.Storage.TREE):
+    clip = Clip(storage=storage)
+    clip._add_note_rows(parse_rows(text))
+    return clip
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_rows(text) -> Tuple[Tuple[float, float, int, float], ...]:
+    """
+    Parses text into ``(start_offset, stop_offset, pitch, velocity)`` rows,
+    ready for a clip's bulk loader.
+
+    Reuses one lexer and parser across calls.
+    """
+    components = _parse_components(text)
+    rows = []
+    offset, pitches, duration = Fraction(0), None, None
+    for leaf in _iterate_leaves(components):
+        if isinstance(leaf, Leaf):
+            if pitches is not None:
+                stop_offset = offset + duration
+                rows.extend(
+                    (float(offset), float(stop_offset), pitch, 100.0)
+                    for pitch in pitches
+                )
+                offset = stop_offset
+            pitches, duration = leaf.pitches, leaf.duration
+        elif pitches is None:
+            raise ValueError("Cannot start with a tie")
+        else:  # ties extend the previous leaf
+            duration += leaf
+    if pitches is not None:
+        stop_offset = offset + duration
+        rows.extend(
+            (float(offset), float(stop_offset), pitch, 100.0) for pitch in pitches
+        )
+    return tuple(rows)
+
 
+@functools.lru_cache(maxsize=1024)
+def parse_pattern(text) -> "Pattern":
+    return Pattern(text)
 
-def parse(text):
-    components = ClipParser().parse(ClipLexer().tokenize(text))
-    # convert components into flat list of leaves, and tie durations, populate deque
-    leaves = deque()
+
+def _parse_components(text):
+    # the lexer and parser are reused, so the parser's running pitch and
+    # duration defaults are reset first
+    _parser.reset()
+    return _parser.parse(_lexer.tokenize(text))
+
+
+def _iterate_leaves(components, multiplier=1):
     for component in components:
         if isinstance(component, Container):
-            leaves.extend(component.to_leaves())
-        else:
-            leaves.append(component)
-    initial_offset = 0
-    current_leaf = None
-    next_leaf = None
-    notes = []
-    while leaves:
-        next_leaf = leaves.popleft()
-        if current_leaf is None:
-            if not isinstance(next_leaf, Leaf):
-                raise ValueError("Cannot start with a tie")
-            current_leaf = next_leaf
-            continue
-        if isinstance(next_leaf, Leaf):
-            new_notes, initial_offset = current_leaf.to_notes(initial_offset)
-            notes.extend(new_notes)
-            current_leaf = next_leaf
-            next_leaf = None
-        else:
-            current_leaf = Leaf(
-                pitches=current_leaf.pitches, duration=current_leaf.duration + next_leaf
+            yield from _iterate_leaves(
+                component.components, multiplier * component.multiplier
+            )
+        elif isinstance(component, Repeat):
+            for _ in range(component.count):
+                yield from _iterate_leaves(
+                    component.container.components,
+                    multiplier * component.container.multiplier,
+                )
+        elif isinstance(component, Leaf) and multiplier != 1:
+            yield Leaf(
+                pitches=component.pitches, duration=component.duration * multiplier
             )
-    if isinstance(current_leaf, Leaf):
-        new_notes, _ = current_leaf.to_notes(initial_offset)
-        notes.extend(new_notes)
-    return Clip(notes=notes)
+        else:
+            yield multiplier * component if multiplier != 1 else component
 
 
 class Leaf(NamedTuple):
     pitches: List[int]
     duration: Fraction
 
-    def to_notes(self, initial_offset=0):
-        notes = []
-        final_offset = initial_offset + self.duration
-        for pitch in self.pitches:
-            note = Note(
-                start_offset=float(initial_offset),
-                stop_offset=float(final_offset),
-                pitch=pitch,
-            )
-            notes.append(note)
-        return notes, final_offset
-
 
 class Container(NamedTuple):
     multiplier: Optional[Tuple]
     components: List[Union[Leaf, "Container", Fraction]]
 
-    def to_leaves(self, multiplier=1):
-        leaves = []
-        multiplier *= self.multiplier
-        for i, component in enumerate(self.components):
-            if isinstance(component, Leaf):
-                leaves.append(
-                    Leaf(
-                        duration=component.duration * multiplier,
-                        pitches=component.pitches,
-                    )
-                )
-            elif isinstance(component, Container):
-                leaves.extend(component.to_leaves(multiplier=multiplier))
-            else:
-                leaves.append(multiplier * component)
-        return leaves
+
+class Repeat(NamedTuple):
+    count: int
+    container: Container
 
 
 def name_to_midi(name):
@@ -185,6 +242,7 @@ class ClipLexer(Lexer):
     OCTAVE_UP = "'"
     REST = "r"
     TIE = "~"
+    UNFOLD = r"\\repeat[ \t]+unfold"
 
     tokens = {
         "CHORD_CLOSE",
@@ -200,6 +258,7 @@ class ClipLexer(Lexer):
         "OCTAVE_UP",
         "REST",
         "TIE",
+        "UNFOLD",
     }
 
 
@@ -208,6 +267,9 @@ class ClipParser(Parser):
     tokens = ClipLexer.tokens
 
     def __init__(self):
+        self.reset()
+
+    def reset(self):
         self._previous_pitches = (60, 64, 67)
         self._previous_duration = Fraction(1, 4)
 
@@ -302,7 +364,7 @@ class ClipParser(Parser):
     def leaf(self, p):
         return p[0]
 
-    @_("leaf", "container", "tuplet")
+    @_("leaf", "container", "tuplet", "unfold")
     def component(self, p):
         return p[0]
 
@@ -321,6 +383,10 @@ class ClipParser(Parser):
     def tuplet(self, p):
         return Container(multiplier=Fraction(p[0]), components=p[1].components)
 
+    @_("UNFOLD NUMBER container")
+    def unfold(self, p):
+        return Repeat(count=int(p[1]), container=p[2])
+
     @_("components")
     def top(self, p):
         return p[0]
@@ -328,3 +394,277 @@ class ClipParser(Parser):
     @_("empty")
     def top(self, p):
         return []
+
+
+class Pattern:
+    """
+    A lazily-evaluated clip expression.
+
+    Repeats, tuplets, ties and chords stay symbolic in a tree of nodes sized
+    in whole notes, and only the notes sounding at an offset are computed when
+    the pattern is looked up, so a long repeating pattern costs no more memory
+    than its text.
+    """
+
+    ### CLASS VARIABLES ###
+
+    # float offsets from the clock are matched against exact offsets within
+    # this tolerance
+    _epsilon = Fraction(1, 10 ** 9)
+
+    ### INITIALIZER ###
+
+    def __init__(self, text):
+        self._text = text
+        self._root = _PatternNode.from_components(_parse_components(text) or [])
+        if self._root.lead:
+            raise ValueError("Cannot start with a tie")
+        self._note_store: Optional[TreeNoteStore] = None
+
+    ### PRIVATE METHODS ###
+
+    def _collect(self, node, start, follow, lower, upper, found):
+        # notes sounding between `lower` and `upper`, where `follow` is the
+        # length of any ties continuing the node's last leaf past its end
+        if (
+            not node.has_notes
+            or start > upper
+            or start + node.duration + follow < lower
+        ):
+            return
+        if node.kind is _PatternNode.LEAF:
+            stop = start + node.duration + follow
+            found.extend((start, stop, pitch) for pitch in node.pitches)
+        elif node.kind is _PatternNode.SEQUENCE:
+            index = max(bisect.bisect_right(node.offsets, lower - start) - 1, 0)
+            while index and (
+                start
+                + node.offsets[index - 1]
+                + node.children[index - 1].duration
+                + node.follow_at(index - 1, follow)
+                >= lower
+            ):
+                index -= 1
+            for index in range(index, len(node.children)):
+                child_start = start + node.offsets[index]
+                if child_start > upper:
+                    break
+                self._collect(
+                    node.children[index],
+                    child_start,
+                    node.follow_at(index, follow),
+                    lower,
+                    upper,
+                    found,
+                )
+        else:
+            body = node.children[0]
+            last = node.count - 1
+            first = min(max(math.floor((lower - start) / body.duration) - 1, 0), last)
+            stop = min(max(math.floor((upper - start) / body.duration), 0), last)
+            for index in range(first, stop + 1):
+                self._collect(
+                    body,
+                    start + index * body.duration,
+                    follow if index == last else body.lead,
+                    lower,
+                    upper,
+                    found,
+                )
+
+    def _next_start(self, node, start, offset):
+        # the earliest note start after `offset`
+        if not node.has_notes or start + node.duration <= offset:
+            return None
+        if node.kind is _PatternNode.LEAF:
+            return start if start > offset else None
+        elif node.kind is _PatternNode.SEQUENCE:
+            index = max(bisect.bisect_right(node.offsets, offset - start) - 1, 0)
+            pairs = zip(node.offsets[index:], node.children[index:])
+        else:
+            body = node.children[0]
+            index = max(math.floor((offset - start) / body.duration), 0)
+            pairs = (
+                (i * body.duration, body)
+                for i in range(index, min(index + 2, node.count))
+            )
+        for child_offset, child in pairs:
+            next_start = self._next_start(child, start + child_offset, offset)
+            if next_start is not None:
+                return next_start
+        return None
+
+    ### PUBLIC METHODS ###
+
+    def lookup(
+        self, offset: float
+    ) -> Tuple[List[Note], List[Note], List[Note], Optional[float]]:
+        """
+        Gets start, stop and overlap notes at `offset`, and the next boundary
+        offset after `offset`, if any, as ``NoteEventTable.lookup()`` does.
+        """
+        exact = Fraction(offset)
+        found: List[Tuple[Fraction, Fraction, int]] = []
+        self._collect(
+            self._root, 0, 0, exact - self._epsilon, exact + self._epsilon, found
+        )
+        start_notes, stop_notes, overlap_notes = [], [], []
+        next_offsets = []
+        for start, stop, pitch in found:
+            note = Note(float(start), float(stop), pitch=pitch)
+            if abs(start - exact) <= self._epsilon:
+                start_notes.append(note)
+            elif abs(stop - exact) <= self._epsilon:
+                stop_notes.append(note)
+                continue
+            elif not start < exact < stop:
+                continue
+            else:
+                overlap_notes.append(note)
+            next_offsets.append(note.stop_offset)
+        next_start = self._next_start(self._root, 0, exact + self._epsilon)
+        if next_start is not None:
+            next_offsets.append(float(next_start))
+        return (
+            sorted(start_notes),
+            sorted(stop_notes),
+            sorted(overlap_notes),
+            min(next_offsets) if next_offsets else None,
+        )
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def duration(self) -> float:
+        return float(self._root.duration)
+
+    @property
+    def note_store(self) -> TreeNoteStore:
+        """
+        Gets a store of the pattern's notes, for querying without expanding
+        the pattern into its clip.
+        """
+        if self._note_store is None:
+            self._note_store = TreeNoteStore()
+            self._note_store.add(self.notes)
+        return self._note_store
+
+    @property
+    def notes(self) -> List[Note]:
+        return sorted(set(Note(*row) for row in parse_rows(self._text)))
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+
+class _PatternNode:
+
+    ### CLASS VARIABLES ###
+
+    LEAF = "leaf"
+    REPEAT = "repeat"
+    SEQUENCE = "sequence"
+    TIE = "tie"
+
+    __slots__ = (
+        "children",
+        "count",
+        "duration",
+        "follows",
+        "has_leaves",
+        "has_notes",
+        "kind",
+        "lead",
+        "offsets",
+        "pitches",
+    )
+
+    ### INITIALIZER ###
+
+    def __init__(self, kind, duration, *, children=(), count=1, pitches=()):
+        self.kind = kind
+        self.children = list(children)
+        self.count = count
+        self.duration = duration
+        self.pitches = tuple(sorted(set(pitches)))
+        self.offsets: List[Fraction] = []
+        # ties continuing each child's last leaf within this node, and
+        # whether they run on to the end of this node
+        self.follows: List[Tuple[Fraction, bool]] = []
+        if kind is self.LEAF:
+            self.has_leaves, self.has_notes, self.lead = True, bool(pitches), 0
+        elif kind is self.TIE:
+            self.has_leaves, self.has_notes, self.lead = False, False, duration
+        elif kind is self.REPEAT:
+            body = self.children[0]
+            self.has_leaves = body.has_leaves and count > 0
+            self.has_notes = body.has_notes and count > 0
+            self.lead = body.lead if body.has_leaves else duration
+        else:
+            offset, self.lead, self.has_leaves = Fraction(0), Fraction(0), False
+            for child in self.children:
+                self.offsets.append(offset)
+                offset += child.duration
+                if not self.has_leaves:
+                    self.lead += child.lead
+                self.has_leaves = self.has_leaves or child.has_leaves
+            self.has_notes = any(child.has_notes for child in self.children)
+            follow, runs_on = Fraction(0), True
+            for child in reversed(self.children):
+                self.follows.append((follow, runs_on))
+                if child.has_leaves:
+                    follow, runs_on = child.lead, False
+                else:
+                    follow += child.duration
+            self.follows.reverse()
+
+    ### PUBLIC METHODS ###
+
+    def follow_at(self, index, follow):
+        child_follow, runs_on = self.follows[index]
+        return child_follow + follow if runs_on else child_follow
+
+    @classmethod
+    def from_components(cls, components, multiplier=1) -> "_PatternNode":
+        children = []
+        for component in components:
+            if isinstance(component, Container):
+                children.append(
+                    cls.from_components(
+                        component.components, multiplier * component.multiplier
+                    )
+                )
+            elif isinstance(component, Repeat):
+                body = cls.from_components(
+                    component.container.components,
+                    multiplier * component.container.multiplier,
+                )
+                if body.duration:
+                    children.append(
+                        cls(
+                            cls.REPEAT,
+                            body.duration * component.count,
+                            children=[body],
+                            count=component.count,
+                        )
+                    )
+            elif isinstance(component, Leaf):
+                children.append(
+                    cls(
+                        cls.LEAF,
+                        component.duration * multiplier,
+                        pitches=component.pitches,
+                    )
+                )
+            else:
+                children.append(cls(cls.TIE, component * multiplier))
+        return cls(
+            cls.SEQUENCE,
+            sum((child.duration for child in children), Fraction(0)),
+            children=children,
+        )
+
+
+_lexer = ClipLexer()
+_parser = ClipParser()
@@ -36,6 +36,9 @@ class SendObject(Allocatable):
 
     ### PRIVATE METHODS ###
 
+    def _plan_allocation(self, plan):
+        plan.node_count += 1
+
     def _reallocate(self, difference):
         Allocatable._reallocate(self, difference)
         node_proxy = self._node_proxies.pop("node")
@@ -330,10 +333,12 @@ class Send(Patch):
     def effective_target(self):
         if not isinstance(self.target, Default):
             return self.target
-        for parent in self.parentage[1:]:
-            if hasattr(parent, "default_send_target"):
-                return parent.default_send_target
-        return None
+        parent = self._get_ancestor(
+            "default_send_target",
+            lambda x: hasattr(x, "default_send_target"),
+            inclusive=False,
+        )
+        return parent.default_send_target if parent is not None else None
 
     @property
     def source(self):
@@ -416,10 +421,12 @@ class Receive(Patch):
     def effective_source(self):
         if not isinstance(self.source, Default):
             return self.source
-        for parent in self.parentage[1:]:
-            if hasattr(parent, "default_receive_target"):
-                return parent.default_receive_target
-        return None
+        parent = self._get_ancestor(
+            "default_receive_target",
+            lambda x: hasattr(x, "default_receive_target"),
+            inclusive=False,
+        )
+        return parent.default_receive_target if parent is not None else None
 
     @property
     def effective_target(self):
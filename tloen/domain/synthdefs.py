@@ -1,4 +1,5 @@
 import bisect
+import functools
 import math
 
 from supriya.enums import CalculationRate, DoneAction
@@ -10,6 +11,7 @@ from supriya.ugens import (
     Mix,
     Out,
     PanAz,
+    PlayBuf,
     ReplaceOut,
     Sanitize,
     SendPeakRMS,
@@ -157,6 +159,7 @@ def sanitize_block(builder, source, state):
     return Sanitize.ar(source=source)
 
 
+@functools.lru_cache(maxsize=None)
 def build_patch_synthdef(
     source_channel_count,
     target_channel_count,
@@ -216,6 +219,7 @@ def build_patch_synthdef(
     return factory.build(name=name)
 
 
+@functools.lru_cache(maxsize=None)
 def build_peak_rms_synthdef(channel_count):
     """
     Build Peak/RMS SynthDef.
@@ -266,3 +270,48 @@ def build_peak_rms_synthdef(channel_count):
         .with_signal_block(peak_rms_block)
     )
     return factory.build(f"mixer/levels/{channel_count}")
+
+
+@functools.lru_cache(maxsize=None)
+def build_stem_synthdef(channel_count):
+    """
+    Build stem playback SynthDef, for mixing rendered stems.
+
+    ::
+
+        >>> from tloen.domain import synthdefs
+        >>> synthdef = synthdefs.build_stem_synthdef(channel_count=2)
+        >>> print(synthdef)
+        synthdef:
+            name: mixer/stem/2
+            ugens:
+            -   Control.ir: null
+            -   Control.kr: null
+            -   PlayBuf.ar:
+                    buffer_id: Control.kr[0:buffer_id]
+                    done_action: 2.0
+                    loop: 0.0
+                    rate: 1.0
+                    start_position: 0.0
+                    trigger: 1.0
+            -   Out.ar:
+                    bus: Control.ir[0:out]
+                    source[0]: PlayBuf.ar[0]
+                    source[1]: PlayBuf.ar[1]
+
+    """
+
+    def playback_block(builder, source, state):
+        return PlayBuf.ar(
+            buffer_id=builder["buffer_id"],
+            channel_count=state["channel_count"],
+            done_action=DoneAction.FREE_SYNTH,
+        )
+
+    factory = (
+        SynthDefFactory(buffer_id=0)
+        .with_channel_count(channel_count)
+        .with_signal_block(playback_block)
+        .with_output()
+    )
+    return factory.build(f"mixer/stem/{channel_count}")
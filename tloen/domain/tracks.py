@@ -209,13 +209,17 @@ class TrackObject(Allocatable, Performable):
         self.node_proxies["output"]["active"] = 0
 
     def _perform_input(self, moment, midi_messages):
-        next_perform, midi_messages = Performable._perform_input(
+        next_performer, midi_messages = Performable._perform_input(
             self, moment, midi_messages,
         )
         if self.devices:
             next_performer = self.devices[0]._perform_input
         yield next_performer, midi_messages
 
+    def _plan_allocation(self, plan):
+        plan.node_count += 6
+        plan.audio_channel_count += 2 * self.effective_channel_count
+
     def _reallocate(self, difference):
         channel_count = self.effective_channel_count
         # buses
@@ -368,10 +372,7 @@ class TrackObject(Allocatable, Performable):
 
     @property
     def mixer(self) -> Optional[Mixer]:
-        for parent in self.parentage:
-            if isinstance(parent, Mixer):
-                return parent
-        return None
+        return self._get_ancestor("mixer", lambda x: isinstance(x, Mixer))
 
     @property
     def parameters(self) -> Mapping[str, ParameterObject]:
@@ -553,8 +554,11 @@ class Track(UserTrackObject):
             self, channel_count=channel_count, name=name, uuid=uuid
         )
         self._active_slot_index: Optional[int] = None
+        self._clip_automation_event_ids: Dict[UUID, int] = {}
         self._clip_launch_event_id: Optional[int] = None
+        self._clip_lookahead: Optional[float] = None
         self._clip_perform_event_id: Optional[int] = None
+        self._clip_rendered_until: Optional[float] = None
         self._pending_slot_index: Optional[int] = None
         self._slots = Container(label="Slots")
         self._tracks = TrackContainer("input", AddAction.ADD_AFTER, label="SubTracks")
@@ -572,6 +576,21 @@ class Track(UserTrackObject):
     def _cleanup(self):
         Track._update_activation(self)
 
+    async def _clip_automation_callback(self, clock_context, envelope):
+        if self._active_slot_index is None:
+            return None
+        parameter = self.application.registry.get(envelope.parameter_uuid)
+        if parameter is None:
+            return None
+        clip = self.slots[self._active_slot_index].clip
+        moment = clock_context.desired_moment
+        offset, stop_offset = moment.offset - clip._start_delta, None
+        if clip.is_looping:
+            offset, stop_offset = offset % clip.duration, clip.duration
+        return await envelope._perform(
+            parameter, self.transport, moment, offset, stop_offset
+        )
+
     async def _clip_launch_callback(self, clock_context):
         self._debug_tree(
             self,
@@ -580,7 +599,13 @@ class Track(UserTrackObject):
                 self._pending_slot_index, clock_context.desired_moment.offset
             ),
         )
+        offset = clock_context.desired_moment.offset
+        # bundles already submitted for the active clip's lookahead window
+        # can't be recalled, so launch once that window has played out
+        if self._clip_rendered_until is not None and offset < self._clip_rendered_until:
+            return self._clip_rendered_until - offset
         self._clip_launch_event_id = None
+        self._clip_rendered_until = None
         # if a clip is active, perform note offs
         if self._active_slot_index is not None:
             midi_messages = [
@@ -601,6 +626,7 @@ class Track(UserTrackObject):
         ):
             self._active_slot_index = None
             self._pending_slot_index = None
+            await self._schedule_clip_automation(clock_context.desired_moment.offset)
             self._debug_tree(self, "Launch/CB", suffix="Bailing")
             return
         # set variables to new clip
@@ -617,6 +643,7 @@ class Track(UserTrackObject):
             schedule_at=clock_context.desired_moment.offset,
             event_type=self.transport.EventType.CLIP_PERFORM,
         )
+        await self._schedule_clip_automation(clock_context.desired_moment.offset)
         self.application.pubsub.publish(
             ClipLaunched(clip_uuid=self.slots[self._active_slot_index].clip.uuid),
         )
@@ -626,9 +653,19 @@ class Track(UserTrackObject):
         if self._active_slot_index is None:
             return None
         clip = self.slots[self._active_slot_index].clip
+        if self._clip_lookahead is not None:
+            return await self._clip_perform_window(clip, clock_context.desired_moment)
         note_moment = clip.at(
             clock_context.desired_moment.offset, start_delta=clip._start_delta
         )
+        midi_messages = self._clip_perform_messages(note_moment)
+        if midi_messages:
+            await self.perform(midi_messages, clock_context.desired_moment)
+        if note_moment.next_offset is None:
+            return None
+        return note_moment.next_offset - clock_context.desired_moment.offset
+
+    def _clip_perform_messages(self, note_moment):
         input_pitches = sorted(self._input_pitches)
         midi_messages = []
         for midi_message in note_moment.note_off_messages:
@@ -640,11 +677,28 @@ class Track(UserTrackObject):
             if input_pitch not in overlap_pitches:
                 midi_messages.append(NoteOffMessage(pitch=input_pitch))
         midi_messages.extend(note_moment.note_on_messages)
-        if midi_messages:
-            await self.perform(midi_messages, clock_context.desired_moment)
-        if note_moment.next_offset is None:
+        return midi_messages
+
+    async def _clip_perform_window(self, clip, moment):
+        """
+        Performs every note boundary from `moment` up to the end of the current
+        lookahead window in one pass, each as its own time-stamped bundle, and
+        wakes again at the first boundary past the window.
+        """
+        start_offset = offset = moment.offset
+        window_stop = (start_offset // self._clip_lookahead + 1) * self._clip_lookahead
+        while offset is not None and offset < window_stop:
+            note_moment = clip.at(offset, start_delta=clip._start_delta)
+            midi_messages = self._clip_perform_messages(note_moment)
+            if midi_messages:
+                if offset != start_offset:
+                    moment = self.transport.offset_to_moment(offset)
+                await self.perform(midi_messages, moment)
+            offset = note_moment.next_offset
+        self._clip_rendered_until = window_stop
+        if offset is None:
             return None
-        return note_moment.next_offset - clock_context.desired_moment.offset
+        return offset - start_offset
 
     @classmethod
     async def _deserialize(cls, data, application) -> bool:
@@ -664,6 +718,8 @@ class Track(UserTrackObject):
             await track.mute()
         if data["spec"].get("is_soloed"):
             await track.solo(exclusive=False)
+        if data["spec"].get("clip_lookahead"):
+            await track.set_clip_lookahead(data["spec"]["clip_lookahead"])
         track.slots._mutate(slice(None, None), [])
         return False
 
@@ -674,6 +730,8 @@ class Track(UserTrackObject):
         self._pending_slot_index = slot_index
         transport = self.transport
         await transport.cancel(self._clip_launch_event_id)
+        if not transport.is_running:
+            self._clip_rendered_until = None
         self._clip_launch_event_id = await transport.cue(
             self._clip_launch_callback,
             # TODO: Get default quantization from transport itself
@@ -714,8 +772,52 @@ class Track(UserTrackObject):
             to_deactivate.extend(result[1])
         return to_activate, to_deactivate
 
+    async def _schedule_clip_automation(self, offset):
+        # one callback per envelope, each waking once per breakpoint segment
+        for event_id in self._clip_automation_event_ids.values():
+            await self.transport.cancel(event_id)
+        self._clip_automation_event_ids.clear()
+        if self._active_slot_index is None:
+            return
+        for uuid, envelope in self.slots[
+            self._active_slot_index
+        ].clip.envelopes.items():
+            self._clip_automation_event_ids[uuid] = await self.transport.schedule(
+                self._clip_automation_callback,
+                schedule_at=offset,
+                args=[envelope],
+                event_type=self.transport.EventType.CLIP_PERFORM,
+            )
+
+    async def _stop_clips(self, moment):
+        # release held notes and forget playback the transport has dropped
+        if self._active_slot_index is not None:
+            # note ons already sent for the rest of the lookahead window can't
+            # be recalled, so release them once the window has played out
+            if (
+                self._clip_rendered_until is not None
+                and moment.offset < self._clip_rendered_until
+            ):
+                moment = self.transport.offset_to_moment(self._clip_rendered_until)
+            midi_messages = [
+                NoteOffMessage(pitch=pitch) for pitch in self._input_pitches
+            ]
+            if midi_messages:
+                await self.perform(midi_messages, moment=moment)
+            clip = self.slots[self._active_slot_index].clip
+            if clip is not None:
+                clip._is_playing = False
+                clip._start_delta = 0.0
+        self._active_slot_index = None
+        self._pending_slot_index = None
+        self._clip_launch_event_id = None
+        self._clip_perform_event_id = None
+        self._clip_rendered_until = None
+        self._clip_automation_event_ids.clear()
+
     def _serialize(self):
         serialized, auxiliary_entities = super()._serialize()
+        serialized["spec"]["clip_lookahead"] = self.clip_lookahead
         serialized["spec"]["slots"] = []
         serialized["spec"]["tracks"] = []
         for slot in self.slots:
@@ -802,6 +904,23 @@ class Track(UserTrackObject):
             for track in tracks:
                 self._tracks._remove(track)
 
+    async def set_clip_lookahead(self, lookahead: Optional[float]):
+        """
+        Sets the clip playback lookahead window, in whole notes.
+
+        With a lookahead, every note event in the window is performed ahead of
+        time as time-stamped bundles, waking the clock once per window rather
+        than once per note boundary. Clip edits take effect from the next
+        window, and slot launches falling inside an already-performed window
+        wait for it to finish.
+
+        A window already performed plays out as it was submitted, and the new
+        lookahead applies from its end.
+        """
+        if lookahead is not None and lookahead <= 0:
+            raise ValueError(lookahead)
+        self._clip_lookahead = lookahead
+
     async def solo(self, exclusive=True):
         from .contexts import Context
 
@@ -855,13 +974,18 @@ class Track(UserTrackObject):
 
     ### PUBLIC PROPERTIES ###
 
+    @property
+    def clip_lookahead(self) -> Optional[float]:
+        return self._clip_lookahead
+
     @property
     def default_send_target(self):
-        for parent in self.parentage[1:]:
-            if hasattr(parent, "tracks"):
-                if hasattr(parent, "master_track"):
-                    return parent.master_track
-                return parent
+        parent = self._get_ancestor(
+            "tracks", lambda x: hasattr(x, "tracks"), inclusive=False
+        )
+        if hasattr(parent, "master_track"):
+            return parent.master_track
+        return parent
 
     @property
     def slots(self):
@@ -1,12 +1,32 @@
+import array
 import asyncio
+import bisect
 import dataclasses
 import enum
-from typing import Dict, Optional, Set, Tuple
-
-from supriya.clocks import AsyncTempoClock, Moment
+import itertools
+import time
+import traceback
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from supriya.clocks import AsyncTempoClock, ClockContext, Moment, TimeUnit
+
+import tloen.domain  # noqa
 
 from ..bases import Event
-from .bases import ApplicationObject
+from ..pubsub import PubSub
+from .bases import Allocatable, ApplicationObject
 from .parameters import ParameterGroup, ParameterObject
 
 
@@ -24,6 +44,24 @@ class Transport(ApplicationObject):
         CLIP_EDIT = 6
         CLIP_PERFORM = 7
 
+    _performing_event_types = frozenset(
+        [
+            EventType.MIDI_PERFORM,
+            EventType.DEVICE_NOTE_OFF,
+            EventType.DEVICE_NOTE_ON,
+            EventType.CLIP_LAUNCH,
+            EventType.CLIP_PERFORM,
+        ]
+    )
+
+    class ScheduledEvent(NamedTuple):
+        event_id: int
+        event_type: int
+        offset: float
+        procedure: Callable
+        args: Optional[Sequence[Any]]
+        kwargs: Optional[Dict[str, Any]]
+
     ### INITIALIZER ###
 
     def __init__(self):
@@ -31,9 +69,22 @@ class Transport(ApplicationObject):
         self._parameter_group = ParameterGroup()
         self._parameters: Dict[str, ParameterObject] = {}
         self._clock = AsyncTempoClock()
-        self._dependencies: Set[ApplicationObject] = set()
+        self._dispatch_event_ids: Dict[float, int] = {}
+        self._dispatch_offset: Optional[float] = None
+        self._event_counter = itertools.count()
+        self._events: Dict[int, Transport.ScheduledEvent] = {}
+        self._statistics = TransportStatistics()
+        # offset -> event type -> event ID -> event, in scheduling order
+        self._queues: Dict[float, Dict[int, Dict[int, Transport.ScheduledEvent]]] = {}
+        self._dependencies: Set[
+            Union[ApplicationObject, "tloen.domain.Timeline"]
+        ] = set()
         self._mutate(slice(None), [self._parameter_group])
-        self._tick_event_id = None
+        self._offline_seconds: Optional[float] = None
+        self._tick_event_id: Optional[int] = None
+        self._tick_moment: Optional[Moment] = None
+        self._tick_pubsub: Optional[PubSub] = None
+        self._tick_resolution = 0
 
     ### PRIVATE METHODS ###
 
@@ -42,11 +93,175 @@ class Transport(ApplicationObject):
             [midi_message], moment=clock_context.current_moment
         )
 
+    def _current_time(self) -> float:
+        if self._offline_seconds is not None:
+            return self._offline_seconds
+        return self._clock.get_current_time()
+
+    def _dequeue(self, event_id) -> Optional["Transport.ScheduledEvent"]:
+        event = self._events.pop(event_id, None)
+        if event is None:
+            return None
+        queues = self._queues.get(event.offset, {})
+        queue = queues.get(event.event_type, {})
+        queue.pop(event_id, None)
+        if not queue:
+            queues.pop(event.event_type, None)
+        if not queues and event.offset != self._dispatch_offset:
+            self._queues.pop(event.offset, None)
+            self._clock.cancel(self._dispatch_event_ids.pop(event.offset))
+        return event
+
     @classmethod
     async def _deserialize(cls, data, transport_object):
         await transport_object.set_tempo(data["spec"]["tempo"])
         await transport_object.set_time_signature(*data["spec"]["time_signature"])
 
+    async def _dispatch_callback(self, clock_context, offset):
+        # every event at this offset shares one clock event; queues drain in
+        # event type order, so note-offs precede note-ons and launches precede
+        # performs, and events queued mid-dispatch join the same pass
+        queues = self._queues[offset]
+        self._dispatch_offset = offset
+        self._statistics.record_queue_depth(sum(map(len, queues.values())))
+        contexts = self.application.contexts if self.application is not None else ()
+        try:
+            if contexts and not self._performing_event_types.isdisjoint(queues):
+                # holding each provider's moment open makes every track's
+                # perform at this moment join it, flushing one bundle per
+                # provider
+                async with Allocatable.lock(
+                    contexts, seconds=clock_context.desired_moment.seconds
+                ):
+                    await self._drain_queues(clock_context, queues)
+            else:
+                await self._drain_queues(clock_context, queues)
+        finally:
+            self._dispatch_offset = None
+            self._queues.pop(offset, None)
+            self._dispatch_event_ids.pop(offset, None)
+
+    async def _drain_queues(self, clock_context, queues):
+        while queues:
+            queue = queues.pop(min(queues))
+            for event in queue.values():
+                if self._events.get(event.event_id) is event:
+                    await self._perform_event(clock_context, event)
+
+    def _enqueue(self, event: "Transport.ScheduledEvent"):
+        self._events[event.event_id] = event
+        queues = self._queues.setdefault(event.offset, {})
+        queues.setdefault(event.event_type, {})[event.event_id] = event
+        if event.offset not in self._dispatch_event_ids:
+            self._schedule_dispatch(event.offset)
+
+    async def _perform_event(self, clock_context, event: "Transport.ScheduledEvent"):
+        lateness = self._current_time() - clock_context.desired_moment.seconds
+        start_time = time.perf_counter()
+        try:
+            result = event.procedure(
+                clock_context, *(event.args or ()), **(event.kwargs or {})
+            )
+            if asyncio.iscoroutine(result):
+                result = await result
+        except Exception:
+            traceback.print_exc()
+            result = None
+        self._statistics.record_callback(
+            event.event_type, lateness, time.perf_counter() - start_time
+        )
+        if self._events.get(event.event_id) is not event:
+            return  # cancelled or rescheduled by its own callback
+        self._events.pop(event.event_id)
+        try:
+            delta, time_unit = result
+        except TypeError:
+            delta, time_unit = result, TimeUnit.BEATS
+        if delta is None or delta <= 0:
+            return
+        moment = clock_context.desired_moment
+        if time_unit == TimeUnit.MEASURES:
+            offset = self._resolve_offset(moment.measure + delta, time_unit)
+        elif time_unit == TimeUnit.SECONDS:
+            offset = self._resolve_offset(moment.seconds + delta, time_unit)
+        else:
+            offset = moment.offset + delta
+        self._enqueue(event._replace(offset=offset))
+
+    def _publish_tick(self):
+        moment, self._tick_moment = self._tick_moment, None
+        if moment is not None and self.application is not None:
+            self.application.pubsub.publish(TransportTicked(moment))
+
+    def _resolve_offset(self, schedule_at, time_unit) -> float:
+        clock = self._clock
+        if clock.is_running:
+            if time_unit == TimeUnit.MEASURES:
+                return clock._measure_to_offset(int(schedule_at))
+            elif time_unit == TimeUnit.SECONDS:
+                return clock._seconds_to_offset(schedule_at)
+            return float(schedule_at)
+        # a stopped clock restarts from offset 0 at measure 1
+        numerator, denominator = clock.time_signature
+        if time_unit == TimeUnit.MEASURES:
+            return (int(schedule_at) - 1) * numerator / denominator
+        elif time_unit == TimeUnit.SECONDS:
+            return schedule_at * clock.beats_per_minute / 60 / denominator
+        return float(schedule_at)
+
+    async def _advance_offline(self, duration: float):
+        # dispatch moments back to back rather than waiting for them
+        while self._queues:
+            offset = min(self._queues)
+            moment = self.offset_to_moment(offset)
+            if moment.seconds >= duration:
+                break
+            self._offline_seconds = max(moment.seconds, self._offline_seconds)
+            await self._dispatch_callback(ClockContext(moment, moment, None), offset)
+        self._offline_seconds = duration
+
+    @asynccontextmanager
+    async def _offline(self):
+        """
+        Runs the transport from a virtual clock starting at zero seconds, which
+        only advances through ``_advance_offline()``.
+        """
+        if self.is_running:
+            raise ValueError
+        clock = self._clock
+        clock._start(initial_time=0.0)
+        self._offline_seconds = 0.0
+        # set realtime events aside, so they neither play offline nor get lost
+        for event_id in self._dispatch_event_ids.values():
+            clock.cancel(event_id)
+        events, self._events = self._events, {}
+        queues, self._queues = self._queues, {}
+        self._dispatch_event_ids = {}
+        try:
+            await asyncio.gather(*[_._start() for _ in self._dependencies])
+            yield
+            await asyncio.gather(*[_._stop() for _ in self._dependencies])
+        finally:
+            # nothing scheduled offline may leak into realtime playback
+            self._events, self._queues = events, queues
+            self._dispatch_event_ids = {}
+            self._offline_seconds = None
+            clock._stop()
+            for offset in self._queues:
+                self._schedule_dispatch(offset)
+
+    def _schedule_dispatch(self, offset):
+        self._dispatch_event_ids[offset] = (
+            None
+            if self._offline_seconds is not None
+            else self._clock.schedule(
+                self._dispatch_callback,
+                schedule_at=offset,
+                event_type=self.EventType.SCHEDULE,
+                args=[offset],
+            )
+        )
+
     def _serialize(self):
         return {
             "kind": type(self).__name__,
@@ -57,16 +272,97 @@ class Transport(ApplicationObject):
         }
 
     def _tick_callback(self, clock_context):
-        self.application.pubsub.publish(TransportTicked(clock_context.desired_moment))
-        return 1 / clock_context.desired_moment.time_signature[1] / 4
+        if not self._tick_resolution:
+            self._tick_event_id = None
+            return None
+        # publish once the clock yields, so subscribers never delay the events
+        # after this one; a tick still pending is replaced by the newer one
+        if self._tick_moment is None:
+            asyncio.get_running_loop().call_soon(self._publish_tick)
+        self._tick_moment = clock_context.desired_moment
+        return (
+            1 / clock_context.desired_moment.time_signature[1] / self._tick_resolution
+        )
+
+    def _update_ticks(self, event_class=None):
+        # tick at the finest resolution requested, in ticks per beat, and not
+        # at all without subscribers
+        pubsub = self._tick_pubsub
+        self._tick_resolution = max(
+            (
+                pubsub.options.get((TransportTicked, procedure), {}).get(
+                    "resolution", 4
+                )
+                for procedure in pubsub.subscriptions.get(TransportTicked, [])
+            )
+            if pubsub is not None
+            else (),
+            default=0,
+        )
+        if self._tick_resolution and self._tick_event_id is None:
+            offset = 0.0
+            if self.is_running:
+                offset = self._resolve_offset(self._current_time(), TimeUnit.SECONDS)
+            self._tick_event_id = next(self._event_counter)
+            self._enqueue(
+                self.ScheduledEvent(
+                    self._tick_event_id,
+                    self.EventType.SCHEDULE,
+                    offset,
+                    self._tick_callback,
+                    None,
+                    None,
+                )
+            )
+        elif not self._tick_resolution and self._tick_event_id is not None:
+            self._dequeue(self._tick_event_id)
+            self._tick_event_id = None
+
+    def _watch_ticks(self, pubsub: Optional[PubSub]):
+        if self._tick_pubsub is not None:
+            self._tick_pubsub.unwatch(self._update_ticks, TransportTicked)
+        self._tick_pubsub = pubsub
+        if pubsub is not None:
+            pubsub.watch(self._update_ticks, TransportTicked)
+        self._update_ticks()
 
     ### PUBLIC METHODS ###
 
-    async def cue(self, *args, **kwargs) -> int:
-        return self._clock.cue(*args, **kwargs)
+    async def cue(
+        self,
+        procedure,
+        *,
+        args=None,
+        event_type: int = EventType.SCHEDULE,
+        kwargs=None,
+        quantization: Optional[str] = None,
+    ) -> int:
+        if event_type <= 0:
+            raise ValueError(f"Invalid event type {event_type}")
+        elif (
+            quantization is not None
+            and quantization not in self._clock._valid_quantizations
+        ):
+            raise ValueError(f"Invalid quantization: {quantization}")
+        offset = 0.0
+        if self.is_running:
+            _, offset, _ = self._clock._get_cue_point(
+                self._current_time(), quantization
+            )
+        event_id = next(self._event_counter)
+        self._enqueue(
+            self.ScheduledEvent(event_id, event_type, offset, procedure, args, kwargs)
+        )
+        return event_id
+
+    async def cancel(self, event_id) -> Optional[Tuple]:
+        return self._dequeue(event_id)
+
+    def offset_to_moment(self, offset: float) -> Moment:
+        return self._clock._offset_to_moment(offset)
 
-    async def cancel(self, *args, **kwargs) -> Optional[Tuple]:
-        return self._clock.cancel(*args, **kwargs)
+    def seconds_to_moment(self, seconds: float) -> Moment:
+        return self._clock._seconds_to_moment(seconds)
 
     async def perform(self, midi_messages):
         if (
@@ -77,15 +373,43 @@ class Transport(ApplicationObject):
         self._debug_tree(
             self, "Perform", suffix=repr([type(_).__name__ for _ in midi_messages])
         )
-        await self.schedule(self._application_perform_callback, args=midi_messages)
+        await self.schedule(
+            self._application_perform_callback,
+            args=midi_messages,
+            event_type=self.EventType.MIDI_PERFORM,
+        )
         if not self.is_running:
             await self.start()
 
-    async def reschedule(self, *args, **kwargs) -> Optional[int]:
-        return self._clock.reschedule(*args, **kwargs)
-
-    async def schedule(self, *args, **kwargs) -> int:
-        return self._clock.schedule(*args, **kwargs)
+    async def reschedule(
+        self, event_id, *, schedule_at=0.0, time_unit=TimeUnit.BEATS
+    ) -> Optional[int]:
+        event = self._dequeue(event_id)
+        if event is None:
+            return None
+        self._enqueue(
+            event._replace(offset=self._resolve_offset(schedule_at, time_unit))
+        )
+        return event_id
+
+    async def schedule(
+        self,
+        procedure,
+        *,
+        event_type: int = EventType.SCHEDULE,
+        schedule_at: float = 0.0,
+        time_unit: TimeUnit = TimeUnit.BEATS,
+        args=None,
+        kwargs=None,
+    ) -> int:
+        if event_type <= 0:
+            raise ValueError(f"Invalid event type {event_type}")
+        event_id = next(self._event_counter)
+        offset = self._resolve_offset(schedule_at, time_unit)
+        self._enqueue(
+            self.ScheduledEvent(event_id, event_type, offset, procedure, args, kwargs)
+        )
+        return event_id
 
     async def set_tempo(self, beats_per_minute: float):
         self._clock.change(beats_per_minute=beats_per_minute)
@@ -95,7 +419,7 @@ class Transport(ApplicationObject):
 
     async def start(self):
         async with self.lock([self]):
-            self._tick_event_id = await self.cue(self._tick_callback)
+            self._watch_ticks(self.application.pubsub)
             await asyncio.gather(*[_._start() for _ in self._dependencies])
             await self._clock.start()
         self.application.pubsub.publish(TransportStarted())
@@ -105,7 +429,8 @@ class Transport(ApplicationObject):
         async with self.lock([self]):
             await asyncio.gather(*[_._stop() for _ in self._dependencies])
             await self.application.flush()
-            await self.cancel(self._tick_event_id)
+            self._watch_ticks(None)
+            self._tick_moment = None
         self.application.pubsub.publish(TransportStopped())
 
     ### PUBLIC PROPERTIES ###
@@ -114,6 +439,10 @@ class Transport(ApplicationObject):
     def clock(self):
         return self._clock
 
+    @property
+    def current_moment(self) -> Moment:
+        return self.seconds_to_moment(self._current_time())
+
     @property
     def is_running(self):
         return self._clock.is_running
@@ -122,6 +451,133 @@ class Transport(ApplicationObject):
     def parameters(self):
         return self._parameters
 
+    @property
+    def statistics(self) -> "TransportStatistics":
+        return self._statistics
+
+
+class RingBuffer:
+    """
+    A fixed-size buffer of floats, overwriting its oldest value once full.
+
+    ::
+
+        >>> from tloen.domain.transports import RingBuffer
+        >>> ring_buffer = RingBuffer(3)
+        >>> for value in range(5):
+        ...     ring_buffer.append(value)
+        ...
+        >>> list(ring_buffer)
+        [2.0, 3.0, 4.0]
+
+    """
+
+    __slots__ = ("_count", "_values")
+
+    def __init__(self, size: int):
+        self._count = 0
+        self._values = array.array("d", bytes(8 * size))
+
+    def __iter__(self):
+        size = len(self._values)
+        if self._count <= size:
+            return iter(self._values[: self._count])
+        index = self._count % size
+        return iter(self._values[index:] + self._values[:index])
+
+    def __len__(self):
+        return min(self._count, len(self._values))
+
+    def append(self, value: float):
+        self._values[self._count % len(self._values)] = value
+        self._count += 1
+
+    def clear(self):
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+
+class TransportStatistics:
+    """
+    Recent callback lateness and execution times per event type, and queue
+    depths per dispatched moment, kept in preallocated ring buffers.
+    """
+
+    ### CLASS VARIABLES ###
+
+    # upper bounds, in seconds, of all but the last lateness histogram bin
+    lateness_bins = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1)
+
+    ### INITIALIZER ###
+
+    def __init__(self, size: int = 1024):
+        self._execution_times = {
+            event_type: RingBuffer(size) for event_type in Transport.EventType
+        }
+        self._latenesses = {
+            event_type: RingBuffer(size) for event_type in Transport.EventType
+        }
+        self._queue_depths = RingBuffer(size)
+
+    ### PRIVATE METHODS ###
+
+    @staticmethod
+    def _summarize(ring_buffer: RingBuffer) -> Dict[str, float]:
+        values = list(ring_buffer)
+        return {
+            "count": ring_buffer.count,
+            "max": max(values, default=0.0),
+            "mean": sum(values) / len(values) if values else 0.0,
+        }
+
+    ### PUBLIC METHODS ###
+
+    def clear(self):
+        for ring_buffer in (
+            *self._execution_times.values(),
+            *self._latenesses.values(),
+            self._queue_depths,
+        ):
+            ring_buffer.clear()
+
+    def histogram(self, event_type) -> List[int]:
+        counts = [0] * (len(self.lateness_bins) + 1)
+        for lateness in self._latenesses[Transport.EventType(event_type)]:
+            counts[bisect.bisect_left(self.lateness_bins, lateness)] += 1
+        return counts
+
+    def record_callback(self, event_type, lateness: float, execution_time: float):
+        self._latenesses[event_type].append(lateness)
+        self._execution_times[event_type].append(execution_time)
+
+    def record_queue_depth(self, depth: int):
+        self._queue_depths.append(depth)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarizes the retained samples as plain data, for publishing or
+        serving as JSON.
+        """
+        event_types = {}
+        for event_type in Transport.EventType:
+            if not self._latenesses[event_type].count:
+                continue
+            event_types[event_type.name] = {
+                "execution_time": self._summarize(self._execution_times[event_type]),
+                "lateness": dict(
+                    self._summarize(self._latenesses[event_type]),
+                    histogram=self.histogram(event_type),
+                ),
+            }
+        return {
+            "event_types": event_types,
+            "lateness_bins": list(self.lateness_bins),
+            "queue_depth": self._summarize(self._queue_depths),
+        }
+
 
 @dataclasses.dataclass
 class TransportStarted(Event):
@@ -133,6 +589,11 @@ class TransportStopped(Event):
     pass
 
 
+@dataclasses.dataclass
+class TransportStatisticsRefreshed(Event):
+    statistics: Dict[str, Any]
+
+
 @dataclasses.dataclass
 class TransportTicked(Event):  # TODO: ClipView needs to know start delta
     moment: Moment
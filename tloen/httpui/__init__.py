@@ -22,6 +22,7 @@ class Application:
                 aiohttp.web.get("/application", self.get_application),
                 aiohttp.web.post("/application/add-context", self.add_context),
                 aiohttp.web.post("/application/boot", self.boot_application),
+                aiohttp.web.get("/transport/statistics", self.get_transport_statistics),
             ]
         )
 
@@ -55,3 +56,6 @@ class Application:
 
     async def get_application(self, request):
         return aiohttp.web.json_response(self.registry.application.serialize())
+
+    async def get_transport_statistics(self, request):
+        return aiohttp.web.json_response(self.registry.transport.statistics.snapshot())
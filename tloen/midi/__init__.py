@@ -1,3 +1,9 @@
+from .files import (
+    MidiFileBatch,
+    MidiFileTrack,
+    read_midi_file,
+    write_midi_file,
+)
 from .messages import (
     ControllerChangeMessage,
     MidiMessage,
@@ -7,7 +13,11 @@ from .messages import (
 
 __all__ = [
     "ControllerChangeMessage",
+    "MidiFileBatch",
+    "MidiFileTrack",
     "MidiMessage",
     "NoteOffMessage",
     "NoteOnMessage",
+    "read_midi_file",
+    "write_midi_file",
 ]
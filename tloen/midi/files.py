@@ -0,0 +1,233 @@
+import pathlib
+import struct
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+NoteRow = Tuple[float, float, float, float]
+
+
+class MidiFileBatch(NamedTuple):
+    track_index: int
+    rows: List[NoteRow]
+    stop_offset: Optional[float] = None  # set on each track's last batch
+
+
+class MidiFileTrack(NamedTuple):
+    rows: Iterable[NoteRow]
+    stop_offset: Optional[float] = None
+
+
+def _read_chunk(stream: BinaryIO) -> Tuple[Optional[bytes], bytes]:
+    header = stream.read(8)
+    if not header:
+        return None, b""
+    if len(header) < 8:
+        raise ValueError("Truncated chunk header")
+    chunk_type, length = struct.unpack(">4sI", header)
+    data = stream.read(length)
+    if len(data) < length:
+        raise ValueError("Truncated chunk")
+    return chunk_type, data
+
+
+def _read_track(
+    track_index: int, data: bytes, ticks_per_offset: float, batch_size: int
+) -> Iterator[MidiFileBatch]:
+    # note-ons awaiting their note-off, by (channel, pitch), oldest first
+    pending: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+    # finished notes awaiting notes of the same pitch that started with them,
+    # by (pitch, start tick), as simultaneous notes only merge within a batch
+    held: Dict[Tuple[int, int], List[NoteRow]] = {}
+    rows: List[NoteRow] = []
+    index, tick, status, length = 0, 0, 0, len(data)
+    while index < length:
+        delta = 0
+        while True:
+            byte = data[index]
+            index += 1
+            delta = (delta << 7) | (byte & 0x7F)
+            if byte < 0x80:
+                break
+        tick += delta
+        if data[index] >= 0x80:
+            status = data[index]
+            index += 1
+        elif not status:
+            raise ValueError("Running status without a status byte")
+        if status == 0xFF:  # meta event
+            meta_type = data[index]
+            index += 1
+            size = 0
+            while True:
+                byte = data[index]
+                index += 1
+                size = (size << 7) | (byte & 0x7F)
+                if byte < 0x80:
+                    break
+            index += size
+            status = 0
+            if meta_type == 0x2F:  # end of track
+                break
+            continue
+        if status in (0xF0, 0xF7):  # sysex
+            size = 0
+            while True:
+                byte = data[index]
+                index += 1
+                size = (size << 7) | (byte & 0x7F)
+                if byte < 0x80:
+                    break
+            index += size
+            status = 0
+            continue
+        kind = status & 0xF0
+        if kind in (0xC0, 0xD0):
+            index += 1
+            continue
+        if kind not in (0x80, 0x90):
+            index += 2
+            continue
+        pitch, velocity = data[index], data[index + 1]
+        index += 2
+        key = (status & 0x0F, pitch)
+        if kind == 0x90 and velocity:
+            pending.setdefault(key, []).append((tick, velocity))
+            continue
+        starts = pending.get(key)
+        if not starts:
+            continue
+        start_tick, start_velocity = starts.pop(0)
+        held_rows = held.setdefault((pitch, start_tick), [])
+        if start_tick != tick:
+            held_rows.append(
+                (
+                    start_tick / ticks_per_offset,
+                    tick / ticks_per_offset,
+                    float(pitch),
+                    float(start_velocity),
+                )
+            )
+        if any(
+            other_start_tick == start_tick
+            for (_, other_pitch), other_starts in pending.items()
+            if other_pitch == pitch
+            for other_start_tick, _ in other_starts
+        ):
+            continue
+        rows.extend(held.pop((pitch, start_tick)))
+        if len(rows) >= batch_size:
+            yield MidiFileBatch(track_index, rows)
+            rows = []
+    # close notes left hanging at the end of the track, alongside any notes
+    # held for them
+    for held_rows in held.values():
+        rows.extend(held_rows)
+    for (_, pitch), starts in sorted(pending.items()):
+        for start_tick, start_velocity in starts:
+            if start_tick < tick:
+                rows.append(
+                    (
+                        start_tick / ticks_per_offset,
+                        tick / ticks_per_offset,
+                        float(pitch),
+                        float(start_velocity),
+                    )
+                )
+    yield MidiFileBatch(track_index, rows, tick / ticks_per_offset)
+
+
+def _write_variable_length(value: int, buffer: bytearray):
+    chunk = [value & 0x7F]
+    value >>= 7
+    while value:
+        chunk.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.extend(reversed(chunk))
+
+
+def _write_track(track: MidiFileTrack, ticks_per_offset: float) -> bytes:
+    # note-offs sort before note-ons at the same tick, so every note lasts at
+    # least one tick
+    events: List[Tuple[int, int, int, int]] = []
+    for start_offset, stop_offset, pitch, velocity in track.rows:
+        pitch = int(pitch)
+        start_tick = round(start_offset * ticks_per_offset)
+        stop_tick = max(start_tick + 1, round(stop_offset * ticks_per_offset))
+        events.append((start_tick, 1, pitch, int(velocity)))
+        events.append((stop_tick, 0, pitch, 0))
+    events.sort()
+    buffer = bytearray()
+    tick = 0
+    for event_tick, is_note_on, pitch, velocity in events:
+        _write_variable_length(event_tick - tick, buffer)
+        buffer.extend((0x90 if is_note_on else 0x80, pitch, velocity))
+        tick = event_tick
+    stop_tick = tick
+    if track.stop_offset is not None:
+        stop_tick = max(tick, round(track.stop_offset * ticks_per_offset))
+    _write_variable_length(stop_tick - tick, buffer)
+    buffer.extend((0xFF, 0x2F, 0x00))
+    return b"MTrk" + struct.pack(">I", len(buffer)) + bytes(buffer)
+
+
+def read_midi_file(
+    file_path: Union[str, pathlib.Path], *, batch_size: int = 4096
+) -> Iterator[MidiFileBatch]:
+    """
+    Reads notes from a Standard MIDI File, one track chunk at a time.
+
+    Notes are decoded straight from each chunk's bytes into
+    ``(start_offset, stop_offset, pitch, velocity)`` rows, with offsets in
+    whole notes, and yielded in batches of up to `batch_size`. Notes of one
+    pitch starting together share a batch, so they merge as they would if
+    added at once. Each track's last batch, possibly empty, carries the
+    track's end offset.
+    """
+    with open(file_path, "rb") as stream:
+        chunk_type, data = _read_chunk(stream)
+        if chunk_type != b"MThd" or len(data) < 6:
+            raise ValueError("Not a Standard MIDI File")
+        _, _, division = struct.unpack(">HHH", data[:6])
+        if division & 0x8000:
+            raise ValueError("SMPTE time division is not supported")
+        ticks_per_offset = division * 4
+        track_index = 0
+        while True:
+            chunk_type, data = _read_chunk(stream)
+            if chunk_type is None:
+                break
+            if chunk_type != b"MTrk":
+                continue
+            try:
+                yield from _read_track(track_index, data, ticks_per_offset, batch_size)
+            except IndexError:
+                raise ValueError("Truncated track event") from None
+            track_index += 1
+
+
+def write_midi_file(
+    file_path: Union[str, pathlib.Path],
+    tracks: Sequence[MidiFileTrack],
+    *,
+    division: int = 480,
+):
+    """
+    Writes ``(start_offset, stop_offset, pitch, velocity)`` rows to a format 1
+    Standard MIDI File, one track chunk per track, with `division` ticks per
+    quarter note.
+    """
+    ticks_per_offset = division * 4
+    with open(file_path, "wb") as stream:
+        stream.write(b"MThd" + struct.pack(">IHHH", 6, 1, len(tracks), division))
+        for track in tracks:
+            stream.write(_write_track(track, ticks_per_offset))
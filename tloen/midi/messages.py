@@ -2,11 +2,26 @@ import dataclasses
 from typing import Optional
 
 
+def _slotted(cls):
+    # rebuilds a dataclass with __slots__, which dataclasses can't do before 3.10
+    inherited = {
+        name for base in cls.__mro__[1:] for name in getattr(base, "__slots__", ())
+    }
+    names = [field.name for field in dataclasses.fields(cls)]
+    namespace = dict(cls.__dict__)
+    for name in names + ["__dict__", "__weakref__"]:
+        namespace.pop(name, None)
+    namespace["__slots__"] = tuple(name for name in names if name not in inherited)
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_slotted
 @dataclasses.dataclass
 class MidiMessage:
     channel_number: Optional[int] = None
 
 
+@_slotted
 @dataclasses.dataclass
 class ControllerChangeMessage(MidiMessage):
     channel_number: Optional[int] = None
@@ -15,6 +30,7 @@ class ControllerChangeMessage(MidiMessage):
     timestamp: Optional[float] = None
 
 
+@_slotted
 @dataclasses.dataclass
 class NoteOffMessage(MidiMessage):
     channel_number: Optional[int] = None
@@ -23,6 +39,7 @@ class NoteOffMessage(MidiMessage):
     timestamp: Optional[float] = None
 
 
+@_slotted
 @dataclasses.dataclass
 class NoteOnMessage(MidiMessage):
     channel_number: Optional[int] = None
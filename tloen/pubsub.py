@@ -1,4 +1,4 @@
-from typing import Callable, Dict, List, Type
+from typing import Any, Callable, Dict, List, Tuple, Type
 
 from .bases import Event
 
@@ -6,6 +6,13 @@ from .bases import Event
 class PubSub:
     def __init__(self):
         self.subscriptions: Dict[Type[Event], List[Callable[Event]]] = {}
+        self.options: Dict[Tuple[Type[Event], Callable], Dict[str, Any]] = {}
+        self.watchers: Dict[Type[Event], List[Callable]] = {}
+
+    def _notify(self, event_classes):
+        for event_class in event_classes:
+            for procedure in tuple(self.watchers.get(event_class, [])):
+                procedure(event_class)
 
     def publish(self, event: Event):
         callables = self.subscriptions.get(type(event), [])
@@ -13,13 +20,33 @@ class PubSub:
         for procedure in callables:
             procedure(event)
 
-    def subscribe(self, procedure: Callable, *event_classes: Type[Event]):
+    def subscribe(self, procedure: Callable, *event_classes: Type[Event], **options):
         for event_class in event_classes:
             self.subscriptions.setdefault(event_class, []).append(procedure)
+            self.options[event_class, procedure] = options
+        self._notify(event_classes)
 
     def unsubscribe(self, procedure: Callable, *event_classes: Type[Event]):
         for event_class in event_classes:
             callables = self.subscriptions.get(event_class, [])
             callables.remove(procedure)
+            if procedure not in callables:
+                self.options.pop((event_class, procedure), None)
             if not callables:
                 self.subscriptions.pop(event_class, None)
+        self._notify(event_classes)
+
+    def unwatch(self, procedure: Callable, *event_classes: Type[Event]):
+        for event_class in event_classes:
+            watchers = self.watchers.get(event_class, [])
+            watchers.remove(procedure)
+            if not watchers:
+                self.watchers.pop(event_class, None)
+
+    def watch(self, procedure: Callable, *event_classes: Type[Event]):
+        """
+        Calls `procedure` with the event class whenever the subscriptions to
+        any of `event_classes` change.
+        """
+        for event_class in event_classes:
+            self.watchers.setdefault(event_class, []).append(procedure)